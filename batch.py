@@ -0,0 +1,270 @@
+"""
+Author: Caleb Cordsen
+Date: 10/17/2026
+
+Description: This file contains the functions that run the jobs of batchBuffer and batchClip! The jobs can be
+spread over several processes, and every job reports back how it went (its status, how long it took, how
+many features went in and came out and what went wrong) instead of just an S or an F.
+"""
+# Import necessary things
+import concurrent.futures
+import time
+import featureio
+
+def featureCount(path):
+    '''
+    Parameters
+    ----------
+    path : This should be a string representing a file path.
+        This should be a string representing a file path that points to a dataset.
+
+    Returns
+    -------
+    int or None
+        The number of features in the dataset, or None when it cannot be read (like an output that was never
+        made).
+    '''
+    try:
+        return featureio.describe(path)['featureCount']
+    except Exception:
+        return None
+
+def failedReport(job, error, elapsed = 0.0):
+    '''
+    Parameters
+    ----------
+    job : This should be a tuple.
+        This should be the job that failed (see runJob).
+    error : This should be a string.
+        This should be a string saying what went wrong.
+    elapsed : This should be a number, optional
+        This should be how many seconds the job ran for. The default is 0.
+
+    Returns
+    -------
+    dict
+        The report of a job that failed (see runJobs).
+    '''
+    return {'status':"F",'message':None,'error':error,'elapsed':elapsed,
+            'inputFile':job[2],'outputFile':job[3],'featuresIn':None,'featuresOut':None,
+            'group':None,'fileReads':None,'sharedReads':None}
+
+def runJob(job):
+    '''
+    Parameters
+    ----------
+    job : This should be a tuple.
+        This should be a (function, args, inputFile, outputFile, successMessage) tuple where function is the
+        tool to run (like buffer.bufferMain), args are the arguments it is called with and successMessage is
+        how the tool's message starts when it worked.
+
+    Returns
+    -------
+    dict
+        The report of the job (see runJobs).
+
+    Description
+    -----------
+    The runJob function is what the worker processes run. It has to sit at the top of the file so it can be
+    handed to another process. Anything the tool raises is caught and written in the report so one bad job
+    cannot stop the rest of the batch.
+    '''
+    function, args, inputFile, outputFile, successMessage = job
+    start = time.perf_counter()
+    report = failedReport(job,None)
+    reads = featureio.readCounts.copy()
+    try:
+        report['featuresIn'] = featureCount(inputFile)
+        report['message'] = function(*args)
+        if(isinstance(report['message'],str) and report['message'].startswith(successMessage)):
+            report['status'] = "S"
+            report['featuresOut'] = featureCount(outputFile)
+        else:
+            # The tools catch their own errors and hand back a message saying so
+            report['error'] = report['message']
+    except Exception as error:
+        report['error'] = type(error).__name__+": "+str(error)
+    report['elapsed'] = time.perf_counter()-start
+    # How many of the job's reads went to the file and how many were handed out from a shared read
+    report['fileReads'] = featureio.readCounts['file']-reads['file']
+    report['sharedReads'] = featureio.readCounts['shared']-reads['shared']
+    return report
+
+def runGroup(jobs, share = True):
+    '''
+    Parameters
+    ----------
+    jobs : This should be a list of tuples.
+        This should be a list of jobs (see runJob) that read the same input.
+    share : This should be a boolean, optional
+        This should be False to run the jobs one after another without sharing their reads, for groups whose
+        jobs only have part of their work in common (like clips of different inputs by the same clip file).
+        The default is True.
+
+    Returns
+    -------
+    list
+        The report of every job in the same order as jobs.
+
+    Description
+    -----------
+    The runGroup function runs the jobs one after another inside featureio.shareReads, so the first job reads
+    and decodes the input and the jobs after it get the same chunks and coordinates from memory. The describe
+    cache (and so the input's spatial reference used for unit conversion) is shared the same way. It sits at
+    the top of the file so it can be handed to another process. A job on its own runs without shareReads so
+    its input is streamed a chunk at a time as usual instead of being kept in memory.
+    '''
+    if(len(jobs)==1 or not share):
+        return [runJob(job) for job in jobs]
+    with featureio.shareReads():
+        return [runJob(job) for job in jobs]
+
+def planGroups(keys, workers = 1):
+    '''
+    Parameters
+    ----------
+    keys : This should be a list.
+        This should hold what every job is grouped by, like its input file.
+    workers : This should be an integer, optional
+        This should be an integer representing how many processes the groups will be spread over. The default
+        is 1.
+
+    Returns
+    -------
+    list
+        A list of lists of job indexes, one per group, in the order the groups first appear in keys.
+
+    Description
+    -----------
+    The planGroups function puts the jobs with the same key in one group so their input is only read once.
+    When there are fewer groups than workers, the biggest groups are cut in half until every worker has a group
+    (or no group has more than one job left), since reading an input twice on two cores is faster than
+    leaving cores with nothing to do.
+    '''
+    groups = {}
+    for index, key in enumerate(keys):
+        groups.setdefault(key,[]).append(index)
+    groups = list(groups.values())
+    while(len(groups)<workers):
+        biggest = max(range(len(groups)),key=lambda group: len(groups[group]),default=None)
+        if(biggest is None or len(groups[biggest])<2):
+            break
+        group = groups.pop(biggest)
+        groups[biggest:biggest] = [group[:len(group)//2],group[len(group)//2:]]
+    return groups
+
+def runIsolated(jobs, share = True):
+    '''
+    Parameters
+    ----------
+    jobs : This should be a list of tuples.
+        This should be the jobs of one group (see runGroup).
+    share : This should be a boolean, optional
+        This should be False to run the jobs without sharing their reads (see runGroup). The default is True.
+
+    Returns
+    -------
+    list
+        The report of every job in the same order as jobs.
+
+    Description
+    -----------
+    The runIsolated function runs one group in a process pool of its own, so if the group kills its worker
+    (like an ArcPy crash or the process running out of memory) only its own jobs fail. Every job of the group
+    then gets a failed report holding the error.
+    '''
+    start = time.perf_counter()
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+            return executor.submit(runGroup,jobs,share).result()
+    except Exception as error:
+        return [failedReport(job,type(error).__name__+": "+str(error),time.perf_counter()-start) for job in jobs]
+
+def runJobs(jobs, workers = 1, groups = None, share = True):
+    '''
+    Parameters
+    ----------
+    jobs : This should be a list of tuples.
+        This should be a list of (function, args, inputFile, outputFile, successMessage) jobs (see runJob).
+    workers : This should be an integer, optional
+        This should be an integer representing how many jobs run at the same time, each in its own process.
+        The default is 1 which runs them one after another in this process.
+    groups : This should be a list of lists of integers, optional
+        This should be a list of groups of job indexes (see planGroups). The jobs of a group run one after
+        another in the same process and share their reads (see runGroup). The default of None runs every job
+        on its own.
+    share : This should be a boolean, optional
+        This should be False to run the jobs of a group in the same process without sharing their reads (see
+        runGroup). The default is True.
+
+    Returns
+    -------
+    list
+        A list holding the report of every job in the same order as jobs. Every report is a dictionary holding
+        the status (S or F), the tool's message, the error (None when it worked), the elapsed seconds, the
+        inputFile and outputFile, the featuresIn and featuresOut counts (None when they are not known), the
+        group the job ran in and how many of its reads went to the file (fileReads) or came from the reads of
+        the jobs before it in its group (sharedReads).
+
+    Description
+    -----------
+    The runJobs function hands the groups of jobs to a process pool and collects the reports as the groups
+    finish with concurrent.futures.as_completed, so a slow group only holds up its own worker. Errors inside a
+    job are caught by runJob. A worker process that dies (like an ArcPy crash or an out of memory kill) breaks
+    the whole pool, and every group that had not finished by then gets a BrokenProcessPool error without it
+    being known which one was to blame. Those groups are run once more, each in a pool of its own (see
+    runIsolated) with up to workers of them at a time, so only the group that really kills its worker fails
+    and every other job still gets its real report.
+    '''
+    workers = max(int(workers),1)
+    if(groups is None):
+        groups = [[index] for index in range(len(jobs))]
+    reports = [None]*len(jobs)
+    if(workers==1 or len(groups)<2):
+        groupReports = (runGroup([jobs[index] for index in group],share) for group in groups)
+        for group, results in zip(groups,groupReports):
+            for index, report in zip(group,results):
+                reports[index] = report
+    else:
+        start = time.perf_counter()
+        broken = []
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers,len(groups))) as executor:
+            futures = {executor.submit(runGroup,[jobs[index] for index in group],share):group for group in groups}
+            for future in concurrent.futures.as_completed(futures):
+                group = futures[future]
+                try:
+                    results = future.result()
+                except concurrent.futures.process.BrokenProcessPool:
+                    # Run it again once the pool is done with, since the worker that died may have been another group's
+                    broken.append(group)
+                    continue
+                except Exception as error:
+                    results = [failedReport(jobs[index],type(error).__name__+": "+str(error),time.perf_counter()-start) for index in group]
+                for index, report in zip(group,results):
+                    reports[index] = report
+        if(len(broken)>0):
+            # Give every group that was cut short one more try in a pool of its own
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(workers,len(broken))) as executor:
+                retries = executor.map(lambda group: runIsolated([jobs[index] for index in group],share),broken)
+                for group, results in zip(broken,retries):
+                    for index, report in zip(group,results):
+                        reports[index] = report
+    for groupIndex, group in enumerate(groups):
+        for index in group:
+            reports[index]['group'] = groupIndex
+    return reports
+
+def statusList(reports):
+    '''
+    Parameters
+    ----------
+    reports : This should be a list of dictionaries.
+        This should be the reports runJobs gave back.
+
+    Returns
+    -------
+    list
+        A list of strings where each entry is S if that job succeeded and F if it failed, like batchBuffer and
+        batchClip have always given back.
+    '''
+    return [report['status'] for report in reports]
@@ -0,0 +1,189 @@
+"""
+Author: Caleb Cordsen
+Date: 10/17/2026
+
+Description: This file contains benchmarks that compare the buffer engines against each other! It only
+uses the NumPy functions in geometry.py so it can be ran on a machine without an ArcPy environment by
+running python benchmark.py. Since arcpy's dissolve is not available there, geometry.windingUnion stands
+in for it wherever the old approach dissolved its intermediate file, and dissolve.py's engine is timed
+against a single merge.
+"""
+# Import necessary things
+import time
+import numpy as np
+import geometry
+import dissolve
+
+def randomLines(lineCount, vertexCount, stepSize = 10.0, seed = 0):
+    '''
+    Parameters
+    ----------
+    lineCount : This should be an integer.
+        This should be an integer representing how many lines to make.
+    vertexCount : This should be an integer.
+        This should be an integer representing how many points every line has.
+    stepSize : This should be a number, optional
+        This should be a number representing the typical distance between neighbouring points. The default is 10.
+    seed : This should be an integer, optional
+        This should be an integer used to seed the random number generator so runs can be repeated.
+
+    Returns
+    -------
+    list
+        A list of (vertexCount, 2) numpy arrays, one random walk per line, spread out over a square area.
+    '''
+    generator = np.random.default_rng(seed)
+    side = stepSize*np.sqrt(lineCount)*np.sqrt(vertexCount)*2
+    lines = []
+    for lineIndex in range(lineCount):
+        start = generator.random(2)*side
+        steps = generator.normal(scale=stepSize,size=(vertexCount-1,2))
+        lines.append(np.vstack((start,start+np.cumsum(steps,axis=0))))
+    return lines
+
+def legacyLinePieces(line, radius, pointsForBuff = 87):
+    '''
+    Parameters
+    ----------
+    line : This should be a numpy array.
+        This should be a (n, 2) array holding the points of a line.
+    radius : This should be a number.
+        This should be a number representing the buffer distance.
+    pointsForBuff : This should be an integer, optional
+        This should be an integer representing how many points every circle is made of. The default is 87.
+
+    Returns
+    -------
+    list
+        A list of rings made the way lineBuffer used to: one circle around every point and one rectangle
+        around every segment. Every ring is turned clockwise so they all add up the same way when merged.
+    '''
+    pieces = list(geometry.circleBlock(line,radius,pointsForBuff)[:,::-1])
+    vectors = np.diff(line,axis=0)
+    lengths = np.hypot(vectors[:,0],vectors[:,1])
+    vectors = radius*vectors[lengths>0]/lengths[lengths>0][:,np.newaxis]
+    starts = line[:-1][lengths>0]
+    ends = line[1:][lengths>0]
+    for start, end, (dx, dy) in zip(starts,ends,vectors):
+        pieces.append(np.array([[start[0]-dy,start[1]+dx],[end[0]-dy,end[1]+dx],
+                                [end[0]+dy,end[1]-dx],[start[0]+dy,start[1]-dx]]))
+    return pieces
+
+def totalArea(rings):
+    '''
+    Parameters
+    ----------
+    rings : This should be a list of numpy arrays.
+        This should be a list of rings like the ones windingUnion gives back.
+
+    Returns
+    -------
+    float
+        The area covered by the rings (outer rings count as positive area and holes take area away).
+    '''
+    return -sum(geometry.ringArea(ring) for ring in rings)
+
+def benchmarkLineBuffer(lineCount = 50, vertexCount = 50, radius = 15.0, pointsForBuff = 87):
+    '''
+    Parameters
+    ----------
+    lineCount : This should be an integer, optional
+        This should be an integer representing how many random lines to buffer. The default is 50.
+    vertexCount : This should be an integer, optional
+        This should be an integer representing how many points every line has. The default is 50.
+    radius : This should be a number, optional
+        This should be a number representing the buffer distance. The default is 15.
+    pointsForBuff : This should be an integer, optional
+        This should be an integer representing how many points a full circle is made of. The default is 87.
+
+    Returns
+    -------
+    dict
+        A dictionary holding the seconds taken, the number of intermediate polygons and vertices and the
+        output area of both the old circles and rectangles approach and the new offset curve approach.
+
+    Description
+    -----------
+    The benchmarkLineBuffer function buffers the same random lines both ways. The old way makes a circle per
+    point and a rectangle per segment for every line and then merges all of them at once, like lineBuffer
+    used to write them all to intermediate.shp and dissolve it. The new way strokes every line once with
+    geometry.strokeLine, resolves each line's own overlaps with geometry.windingUnion and then merges the
+    per line buffers, like lineBuffer now does. Both final merges use geometry.windingUnion so the timing
+    compares the geometry work rather than arcpy. The areas should agree closely.
+    '''
+    lines = randomLines(lineCount,vertexCount)
+    results = {}
+    # The old way: every circle and rectangle goes into one big merge
+    start = time.perf_counter()
+    pieces = []
+    for line in lines:
+        pieces.extend(legacyLinePieces(line,radius,pointsForBuff))
+    merged = geometry.windingUnion(pieces)
+    results['legacySeconds'] = time.perf_counter()-start
+    results['legacyPieces'] = len(pieces)
+    results['legacyVertices'] = int(sum(len(piece) for piece in pieces))
+    results['legacyArea'] = totalArea(merged)
+    # The new way: one outline per line, resolved on its own, then merged across lines
+    start = time.perf_counter()
+    pieces = []
+    for line in lines:
+        pieces.extend(geometry.windingUnion([geometry.strokeLine(line,radius,pointsForBuff)]))
+    merged = geometry.windingUnion(pieces)
+    results['strokeSeconds'] = time.perf_counter()-start
+    results['strokePieces'] = len(pieces)
+    results['strokeVertices'] = int(sum(len(piece) for piece in pieces))
+    results['strokeArea'] = totalArea(merged)
+    return results
+
+def benchmarkDissolve(pointCount = 4000, radius = 20.0, pointsForBuff = 64, workers = 2, seed = 1):
+    '''
+    Parameters
+    ----------
+    pointCount : This should be an integer, optional
+        This should be an integer representing how many random points to buffer and dissolve. The default is 4000.
+    radius : This should be a number, optional
+        This should be a number representing the buffer distance. The default is 20.
+    pointsForBuff : This should be an integer, optional
+        This should be an integer representing how many points every circle is made of. The default is 64.
+    workers : This should be an integer, optional
+        This should be an integer representing how many processes the parallel dissolve uses. The default is 2.
+    seed : This should be an integer, optional
+        This should be an integer used to seed the random number generator so runs can be repeated.
+
+    Returns
+    -------
+    dict
+        A dictionary holding the seconds taken and the output area of merging the same overlapping circles
+        all at once, with dissolve.cascadedUnion in one process and with dissolve.dissolvePieces using workers
+        processes.
+
+    Description
+    -----------
+    The benchmarkDissolve function scatters overlapping circles over a square (about 20 per circle's area)
+    and merges them three ways. The first is a single geometry.windingUnion over every circle, which is the
+    closest stand in for handing everything to one dissolve. The second is dissolve.cascadedUnion, which
+    should be a little faster since it merges the groups of circles that cannot touch on their own, and the
+    third is dissolve.dissolvePieces, which is what the line and polygon buffers use. The areas should agree.
+    '''
+    generator = np.random.default_rng(seed)
+    side = radius*np.sqrt(pointCount)*2
+    points = generator.random((pointCount,2))*side
+    pieces = [[circle] for circle in geometry.circleBlock(points,radius,pointsForBuff)[:,::-1]]
+    results = {}
+    start = time.perf_counter()
+    results['singleArea'] = totalArea(geometry.windingUnion([piece[0] for piece in pieces]))
+    results['singleSeconds'] = time.perf_counter()-start
+    start = time.perf_counter()
+    results['cascadedArea'] = totalArea(dissolve.cascadedUnion(pieces))
+    results['cascadedSeconds'] = time.perf_counter()-start
+    start = time.perf_counter()
+    results['parallelArea'] = totalArea(dissolve.dissolvePieces(pieces,workers))
+    results['parallelSeconds'] = time.perf_counter()-start
+    return results
+
+if __name__ == "__main__":
+    # Run every benchmark and print its results
+    for name, value in benchmarkLineBuffer().items():
+        print(name,":",value)
+    for name, value in benchmarkDissolve().items():
+        print(name,":",value)
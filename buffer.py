@@ -7,11 +7,19 @@ Description: This file contains the functions that help make the buffer function
 # Import necessary things
 import arcpy
 from arcpy import env
-import math
+import concurrent.futures
 import numpy as np
 import os
+import shutil
+import tempfile
+import uuid
+import geometry
+import dissolve
+import featureio
+import batch
+import cache
 
-def unitConversion(inputFile,size,unit):
+def unitConversion(inputFile,size,unit,geodesic = False):
     '''
     Parameters
     ----------
@@ -24,28 +32,34 @@ def unitConversion(inputFile,size,unit):
     unit: This should be a string,
         This should be a string representing the unit associated with the desired buffered size.
         Restricted to the units available in the unit conversion function.
+    geodesic : This should be a boolean, optional
+        This should be True when the buffer is geodesic, in which case the size is wanted in meters rather
+        than in the inputFile's units (which are degrees). The default is False.
 
     Returns
     -------
     float
-        A float representing the float number that represents the inputFile units that is equivalent
-        to the inputed size and unit. For example, if your inputFile is in feet but you input 50 as
-        your size and meters as your unit, then this function outputs the number of feet that is
-        equivalent to 50 meters.
+        A float representing the float number that represents the inputFile units that is equivalent to the
+        inputed size and unit (or the number of meters for a geodesic buffer). For example, if your inputFile
+        is in feet but you input 50 as your size and meters as your unit, then this function outputs the
+        number of feet that is equivalent to 50 meters.
         
     Description
     -----------
-    This function takes in a inputFile and using arcpy spatial reference methods gets the metersPerUnit
-    of the inputtedShape file. It then looks at the inputted size and unit. It converts the measurement of 
-    size and unit into meters. For example, if you input 1 centimeter it will convert it to 0.01 meters.
-    Then it takes this number and divides by the metersPerUnit measurement. The result of this is 
-    the equivalent number representing the same measurement of the inputted size and unit but in the
-    units of the inputFile. For example consider a scenario where you have an inputFile that is in feet.
-    You input into the function a size of 750 and a unit of centimeters. First the function will
-    convert 750 centimeteres into 7.5 meters by matching the unit to a preset conversion to meters
-    using if statements. Then it will detect the metersPertUnit of feet which is about 0.3048.
+    This function takes in a inputFile and using arcpy spatial reference methods gets the metersPerUnit of the
+    inputtedShape file (through featureio.describe so it is only looked up once per file). It then looks at
+    the inputted size and unit. It converts the measurement of size and unit into meters. For example, if you
+    input 1 centimeter it will convert it to 0.01 meters. Then it takes this number and divides by the
+    metersPerUnit measurement. The result of this is the equivalent number representing the same measurement
+    of the inputted size and unit but in the units of the inputFile. For example consider a scenario where you
+    have an inputFile that is in feet. You input into the function a size of 750 and a unit of centimeters.
+    First the function will convert 750 centimeteres into 7.5 meters by matching the unit to a preset
+    conversion to meters using if statements. Then it will detect the metersPertUnit of feet which is about
+    0.3048.
     Then it will takes 7.5 meters and divide by 0.3048 which yields about 24.6063. This number will be
-    returned and ultimately is what 750 centimeters is in feet (the inputFile's unit). 
+    returned and ultimately is what 750 centimeters is in feet (the inputFile's unit). Dividing by the
+    metersPerUnit of a layer in latitude and longitude would give a meaningless number of degrees, so for
+    geodesic buffers the number of meters is returned as it is.
     '''
     # Enter a series of if statements that checks the unit type. It then converts the size of that unit
     # into meters. If no such unit is found, it says that unit is unsupported at this time
@@ -71,14 +85,663 @@ def unitConversion(inputFile,size,unit):
         meterVersion = size*1852
     else:
         return "Sorry that unit type is unsupported at this time!"
+    # Geodesic buffers are measured in meters along the ellipsoid
+    if(geodesic):
+        return meterVersion
     # Make a variable metersPerInputFileUnit that uses arcpy methods to get the metersPerUnit
     # of the inputFile's unit type
-    metersPerInputFileUnit = arcpy.Describe(inputFile).spatialReference.metersPerUnit
+    metersPerInputFileUnit = featureio.describe(inputFile)['spatialReference'].metersPerUnit
     # Return the size of the unit given to the function converted to meters divided by the number
     # calculated above
     return meterVersion/metersPerInputFileUnit
 
-def PointsBuffer(returnDir,inputFile, outputName, buffSize, buffUnit, pointsForBuff = 87):
+def isGeographic(inputFile):
+    '''
+    Parameters
+    ----------
+    inputFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to a valid shape file.
+
+    Returns
+    -------
+    bool
+        True when the inputFile's coordinate system is a geographic one (latitude and longitude in degrees).
+    '''
+    return featureio.describe(inputFile)['spatialReference'].type == "Geographic"
+
+def arcPointCount(inputFile, newBuffSize, buffUnit, pointsForBuff = 87, maxDeviation = None, geodesic = False):
+    '''
+    Parameters
+    ----------
+    inputFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to the shape file being buffered.
+    newBuffSize : This should be a number.
+        This should be a number representing the buffer size already converted to the inputFile's units.
+    buffUnit: This should be a string,
+        This should be a string representing the unit that maxDeviation is given in. It is the same
+        unit as the buffer size.
+    pointsForBuff : This should be an interger., optional
+        This should be an integer representing how many points you want the buffer circles to be composed of
+        when no maxDeviation is given. The default value is 87.
+    maxDeviation : This should be a number, optional
+        This should be a number representing the largest distance, in buffUnit, you will allow between the
+        true circle and the straight edges of the buffer. The default is None which means pointsForBuff is used.
+    geodesic : This should be a boolean, optional
+        This should be True when newBuffSize is in meters for a geodesic buffer. The default is False.
+
+    Returns
+    -------
+    int
+        An integer representing how many points every buffer circle (or full turn of a buffer arc) is made of.
+
+    Description
+    -----------
+    The arcPointCount function decides the vertex budget of a buffer. If no maxDeviation is given it just
+    hands back pointsForBuff. Otherwise it converts maxDeviation into the inputFile's units the same way the
+    buffer size is converted (to meters for a geodesic buffer) and uses geometry.segmentCount to pick the
+    number of points from the sagitta formula, so a 1 millimeter buffer is made of far fewer points than a 50
+    kilometer one.
+    '''
+    # If there is no maxDeviation just use the fixed number of points
+    if(maxDeviation == None):
+        return pointsForBuff
+    # Convert the maxDeviation to the inputFiles units, falling back to the inputted number like the buffer
+    # size does
+    newMaxDeviation = unitConversion(inputFile,maxDeviation,buffUnit,geodesic)
+    if(newMaxDeviation == "Sorry that unit type is unsupported at this time!"):
+        newMaxDeviation = maxDeviation
+    # Pick the number of points from the sagitta formula
+    return geometry.segmentCount(newBuffSize,newMaxDeviation)
+
+def successMessage(pointsForBuff, removed = None):
+    '''
+    Parameters
+    ----------
+    pointsForBuff : This should be an integer.
+        This should be an integer representing how many points the buffer circles were made of.
+    removed : This should be an integer, optional
+        This should be an integer representing how many vertices simplifying took out. The default of None
+        means nothing was simplified.
+
+    Returns
+    -------
+    str
+        The success message of a buffer that also reports the vertex budget it used.
+    '''
+    message = "The buffer was successful! Each buffer circle used "+str(pointsForBuff)+" points."
+    if(removed is not None):
+        message += " Simplifying removed "+str(removed)+" vertices."
+    return message
+
+def fieldSizes(inputFile, values, buffUnit, geodesic = False):
+    '''
+    Parameters
+    ----------
+    inputFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to the shape file being buffered.
+    values : This should be a numpy array.
+        This should be the values of the buffer size field for a chunk of features, in buffUnit.
+    buffUnit: This should be a string,
+        This should be a string representing the unit the field's values are in.
+    geodesic : This should be a boolean, optional
+        This should be True when the sizes are wanted in meters for a geodesic buffer. The default is False.
+
+    Returns
+    -------
+    tuple
+        A (sizes, keep) tuple where sizes holds the buffer size of every kept feature in the inputFile's units
+        (or meters) and keep is a boolean array saying which features have a buffer size above zero.
+
+    Description
+    -----------
+    The fieldSizes function converts a whole column of buffer sizes at once. Since the unit conversion is just
+    a multiplication, unitConversion is asked for the size of one buffUnit and every value is multiplied by
+    it, falling back to the inputFile's units like a single size does. Features with an empty (null) or zero
+    or negative size are dropped as they have no buffer.
+    '''
+    scale = unitConversion(inputFile,1.0,buffUnit,geodesic)
+    if(scale == "Sorry that unit type is unsupported at this time!"):
+        print("That unit type is not supported. Creating buffer of inputted size in input files unit type")
+        scale = 1.0
+    values = np.array(values,dtype=np.float64)
+    keep = values>0
+    return values[keep]*scale, keep
+
+def shapeParts(shapes):
+    '''
+    Parameters
+    ----------
+    shapes : This should be a list of bytes like objects.
+        This should be the well-known binary of a chunk of lines or polygons.
+
+    Returns
+    -------
+    list
+        A list holding the parts of every shape as given by geometry.wkbParts, ready for bufferParts.
+    '''
+    return [geometry.wkbParts(shape) for shape in shapes]
+
+# How long an edge of a geodesic line or polygon buffer can be, in degrees going into a metric frame and in
+# meters coming back out of it, and how many of those edges one frame covers at most (about 550 km)
+GEODESIC_STEP_DEGREES = 0.1
+GEODESIC_STEP_METERS = 10000.0
+GEODESIC_FRAME_STEPS = 50
+
+def bufferParts(parts, geoType, newBuffSize, pointsForBuff = 87, geodesic = False):
+    '''
+    Parameters
+    ----------
+    parts : This should be a list of numpy arrays.
+        This should be the parts of one line or the rings of one polygon, as given by geometry.wkbParts.
+    geoType : This should be a string.
+        This should be POLYLINE or POLYGON.
+    newBuffSize : This should be a number.
+        This should be the buffer size in the inputFile's units (or in meters when geodesic is True).
+    pointsForBuff : This should be an integer, optional
+        This should be an integer representing how many points a full circle of the buffer is made of.
+        The default is 87.
+    geodesic : This should be a boolean, optional
+        This should be True when the parts are in latitude and longitude and newBuffSize is in meters. The
+        default is False.
+
+    Returns
+    -------
+    list
+        A list of rings holding the buffer of the feature, outer rings clockwise and holes counterclockwise.
+
+    Description
+    -----------
+    The bufferParts function buffers one feature the way lineBuffer and polygonBuffer describe: lines are
+    stroked with geometry.strokeLine and their overlaps resolved with geometry.windingUnion, and polygons are
+    grown with geometry.bufferPolygonRings. A geodesic buffer is built in meters with
+    geometry.localMetricFrame, whose error grows with the distance from the middle of the frame. A feature
+    that fits in one frame is buffered in a frame around its middle. A bigger one has its parts cut into runs
+    of GEODESIC_FRAME_STEPS edges, every run is stroked in a frame around its own middle, and the strokes (and
+    for a polygon, its own rings) are merged in degrees, so the width is right all along the feature. Edges are
+    cut up with geometry.densifyParts on the way into a frame and on the way back, since a straight edge in one
+    is curved in the other, and the result is cut along the antimeridian with geometry.wrapRings.
+    '''
+    if(len(parts)==0):
+        return []
+    if(not geodesic):
+        if(geoType=="POLYGON"):
+            return geometry.bufferPolygonRings(parts,newBuffSize,pointsForBuff)
+        return geometry.windingUnion([geometry.strokeLine(part,newBuffSize,pointsForBuff) for part in parts])
+    closed = geoType=="POLYGON"
+    parts = geometry.densifyParts(parts,GEODESIC_STEP_DEGREES,closed)
+    points = np.concatenate(parts)
+    if(np.max(points.max(axis=0)-points.min(axis=0))<=GEODESIC_STEP_DEGREES*GEODESIC_FRAME_STEPS):
+        toMeters, toDegrees = geometry.localMetricFrame(parts)
+        parts = [toMeters(part) for part in parts]
+        if(closed):
+            bufferRings = geometry.bufferPolygonRings(parts,newBuffSize,pointsForBuff)
+        else:
+            bufferRings = geometry.windingUnion([geometry.strokeLine(part,newBuffSize,pointsForBuff) for part in parts])
+        return geometry.wrapRings([toDegrees(ring) for ring in geometry.densifyParts(bufferRings,GEODESIC_STEP_METERS)])
+    # Rings are walked all the way around back to their first point, and neighbouring runs share a point
+    pieces = list(parts) if closed else []
+    for part in parts:
+        if(closed):
+            part = np.concatenate((part,part[:1]))
+        for start in range(0,max(len(part)-1,1),GEODESIC_FRAME_STEPS):
+            run = part[start:start+GEODESIC_FRAME_STEPS+1]
+            toMeters, toDegrees = geometry.localMetricFrame([run])
+            stroke = geometry.windingUnion([geometry.strokeLine(toMeters(run),newBuffSize,pointsForBuff)])
+            pieces += [toDegrees(ring) for ring in geometry.densifyParts(stroke,GEODESIC_STEP_METERS)]
+    return geometry.wrapRings(geometry.windingUnion(pieces))
+
+def simplifyTolerance(inputFile, tolerance, buffUnit, geodesic = False):
+    '''
+    Parameters
+    ----------
+    inputFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to the shape file being buffered.
+    tolerance : This should be a number or None.
+        This should be the simplify tolerance in buffUnit, or None when nothing is simplified.
+    buffUnit: This should be a string,
+        This should be a string representing the unit the tolerance is in.
+    geodesic : This should be a boolean, optional
+        This should be True when the tolerance is wanted in meters for a geodesic buffer. The default is False.
+
+    Returns
+    -------
+    float or None
+        The tolerance in the inputFile's units (or meters), or None when tolerance is None. Like the buffer
+        size, an unsupported unit falls back to the inputFile's units.
+    '''
+    if(tolerance is None):
+        return None
+    newTolerance = unitConversion(inputFile,tolerance,buffUnit,geodesic)
+    if(newTolerance == "Sorry that unit type is unsupported at this time!"):
+        print("That unit type is not supported. Simplifying with inputted tolerance in input files unit type")
+        newTolerance = tolerance
+    return float(newTolerance)
+
+def simplifyRings(rings, tolerance, closed = True, geodesic = False):
+    '''
+    Parameters
+    ----------
+    rings : This should be a list of numpy arrays.
+        This should be the parts of a line or the rings of a polygon (or of every polygon of a chunk).
+    tolerance : This should be a number.
+        This should be the simplify tolerance in the units of the rings (or meters when geodesic is True).
+    closed : This should be a boolean, optional
+        This should be True for polygon rings and False for line parts. The default is True.
+    geodesic : This should be a boolean, optional
+        This should be True when the rings are in latitude and longitude and the tolerance is in meters. The
+        default is False.
+
+    Returns
+    -------
+    tuple
+        A (rings, removed) tuple holding the simplified rings and how many vertices were taken out (see
+        geometry.simplifyParts).
+    '''
+    if(len(rings)==0):
+        return [], 0
+    if(not geodesic):
+        simplified, removed = geometry.simplifyParts(rings,tolerance,closed)
+        return [ring for ring in simplified if len(ring)>0], removed
+    # Simplify in meters around the middle of the rings the same way bufferParts buffers them
+    toMeters, toDegrees = geometry.localMetricFrame(rings)
+    simplified, removed = geometry.simplifyParts([toMeters(ring) for ring in rings],tolerance,closed)
+    return [toDegrees(ring) for ring in simplified if len(ring)>0], removed
+
+def simplifyPieces(pieces, tolerance, geodesic = False):
+    '''
+    Parameters
+    ----------
+    pieces : This should be a list of lists of numpy arrays.
+        This should be a list of buffers where every buffer is a list of rings.
+    tolerance : This should be a number.
+        This should be the simplify tolerance in the units of the rings (or meters when geodesic is True).
+    geodesic : This should be a boolean, optional
+        This should be True when the rings are in latitude and longitude. The default is False.
+
+    Returns
+    -------
+    tuple
+        A (pieces, kept, removed) tuple holding the simplified buffers that still have a ring left, the
+        indexes of those buffers in pieces (so their attributes can be picked out) and how many vertices were
+        taken out.
+
+    Description
+    -----------
+    The simplifyPieces function simplifies the rings of every buffer at once with one call to
+    geometry.simplifyParts and puts them back into their buffers. A geodesic buffer is simplified in meters
+    around its own middle, one buffer at a time.
+    '''
+    if(geodesic):
+        results = [simplifyRings(rings,tolerance,True,True) for rings in pieces]
+        simplified = [rings for rings, removed in results]
+        removed = sum(removed for rings, removed in results)
+    else:
+        # Every ring comes back in its place (empty when it collapsed) so they can be handed back to their buffers
+        owners = np.repeat(np.arange(len(pieces)),[len(rings) for rings in pieces]).tolist()
+        simplifiedRings, removed = geometry.simplifyParts([ring for rings in pieces for ring in rings],tolerance,True)
+        simplified = [[] for rings in pieces]
+        for owner, ring in zip(owners,simplifiedRings):
+            if(len(ring)>0):
+                simplified[owner].append(ring)
+    kept = [index for index, rings in enumerate(simplified) if len(rings)>0]
+    return [simplified[index] for index in kept], np.array(kept,dtype=np.int64), removed
+
+def simplifiedCount(simplified, simplifyInput = None, simplifyOutput = None):
+    '''
+    Parameters
+    ----------
+    simplified : This should be a dictionary.
+        This should hold how many vertices simplifying took out of the 'input' and the 'output'.
+    simplifyInput : This should be a number, optional
+        This should be the input tolerance the buffer was asked for. The default is None.
+    simplifyOutput : This should be a number, optional
+        This should be the output tolerance the buffer was asked for. The default is None.
+
+    Returns
+    -------
+    int or None
+        The total number of vertices taken out, or None when nothing was asked to be simplified (so
+        successMessage leaves it out).
+    '''
+    if(simplifyInput is None and simplifyOutput is None):
+        return None
+    return simplified['input']+simplified['output']
+
+# Intermediate files estimated to be bigger than this many bytes are written to disk instead of memory
+INTERMEDIATE_SPILL_BYTES = 512*1024*1024
+
+def createIntermediate(estimatedBytes, inputCoordinateSystem, spillBytes = None):
+    '''
+    Parameters
+    ----------
+    estimatedBytes : This should be an integer.
+        This should be an integer representing about how many bytes of geometry will be written to the
+        intermediate feature class.
+    inputCoordinateSystem : This should be an arcpy spatial reference.
+        This should be the coordinate system of the inputted file.
+    spillBytes : This should be an integer, optional
+        This should be an integer representing the largest intermediate, in bytes, that is kept in memory.
+        The default of None uses INTERMEDIATE_SPILL_BYTES.
+
+    Returns
+    -------
+    tuple
+        A (path, scratchDir) tuple holding the path of the new empty polygon feature class and the scratch
+        folder made for it (None when it is in memory).
+
+    Description
+    -----------
+    The createIntermediate function makes the feature class that the buffers are written to before arcpy's
+    dissolve. Small ones go into arcpy's memory workspace so they never touch the disk. Ones bigger than
+    spillBytes go into a file geodatabase made in a new scratch folder from tempfile just for this run. A file
+    geodatabase is used rather than a shapefile since a shapefile cannot grow past 2 GB, and the intermediates
+    that spill are the big ones. Either way the name is unique (the memory workspace belongs to one process and
+    gets a random name, and the scratch folder is new) so buffers running at the same time, even into the same
+    returnDir, never share an intermediate file.
+    '''
+    if(spillBytes is None):
+        spillBytes = INTERMEDIATE_SPILL_BYTES
+    if(estimatedBytes<=spillBytes):
+        scratchDir = None
+        workspace = "memory"
+        name = "intermediate_"+uuid.uuid4().hex
+    else:
+        scratchDir = tempfile.mkdtemp(prefix="buffer_")
+        workspace = os.path.join(scratchDir,"scratch.gdb")
+        arcpy.management.CreateFileGDB(scratchDir,"scratch.gdb")
+        name = "intermediate"
+    arcpy.CreateFeatureclass_management(workspace, name,'POLYGON',spatial_reference=inputCoordinateSystem)
+    return os.path.join(workspace,name), scratchDir
+
+def removeIntermediate(path, scratchDir):
+    '''
+    Parameters
+    ----------
+    path : This should be a string.
+        This should be the path createIntermediate gave back.
+    scratchDir : This should be a string or None.
+        This should be the scratch folder createIntermediate gave back.
+
+    Returns
+    -------
+    None.
+
+    Description
+    -----------
+    The removeIntermediate function deletes an intermediate feature class and its scratch folder. It is
+    called even when the buffer fails so nothing is left behind.
+    '''
+    try:
+        arcpy.management.Delete(path)
+    except:
+        pass
+    if(scratchDir is not None):
+        shutil.rmtree(scratchDir,ignore_errors=True)
+
+def dissolveToOutput(returnDir, outputName, pieces, inputCoordinateSystem, dissolveWith = "native",
+                     workers = 1, spillBytes = None, attributes = None, fields = None, simplifyOutput = None,
+                     geodesic = False):
+    '''
+    Parameters
+    ----------
+    returnDir : This should be a string representing a file path.
+        This should be a string representing a file path to the directory/folder the output is saved to.
+    outputName : This should be a string representing a file name and extension.
+        This should be a string representing the name of the outputted buffer shape file.
+    pieces : This should be a list of lists of numpy arrays.
+        This should be a list holding the buffer of every feature as a list of rings (like the output of
+        geometry.windingUnion).
+    inputCoordinateSystem : This should be an arcpy spatial reference.
+        This should be the coordinate system of the inputted file.
+    dissolveWith : This should be a string, optional
+        This should be "native" to merge the buffers with the dissolve.py engine or "arcpy" to write them to
+        an intermediate feature class and merge them with arcpy's PairwiseDissolve. The default is "native".
+    workers : This should be an integer, optional
+        This should be an integer representing how many processes the native dissolve can use. The default is 1.
+    spillBytes : This should be an integer, optional
+        This should be an integer representing the largest intermediate, in bytes, that the arcpy way keeps in
+        memory (see createIntermediate). The default of None uses INTERMEDIATE_SPILL_BYTES.
+    attributes : This should be a dictionary, optional
+        This should hold the attributes of every piece, one array per field. When given the pieces are written
+        as they are, one feature per piece with its attributes, instead of being dissolved. The default is None.
+    fields : This should be a list of tuples, optional
+        This should be the (name, type, length, decimals) fields of the output (see featureio.outputFields).
+        The default of None gives the default Id field.
+    simplifyOutput : This should be a number, optional
+        This should be a number representing the tolerance, in the units of the pieces (or meters when
+        geodesic is True), the output is simplified with before it is written. The default of None does not
+        simplify it.
+    geodesic : This should be a boolean, optional
+        This should be True when the pieces are in latitude and longitude and simplifyOutput is in meters. The
+        default is False.
+
+    Returns
+    -------
+    int
+        How many vertices simplifying took out of the output (0 when it is not simplified).
+
+    Description
+    -----------
+    The dissolveToOutput function merges the buffers of different features where they overlap and writes the
+    result to the output file as one multipart polygon, which is what a dissolve with no fields gives. The
+    native way groups the buffers that can touch and merges each group with a cascaded union (see
+    dissolve.dissolvePieces) so it never has to write an intermediate file at all. The arcpy way is kept for
+    comparison. It used to write every buffer to intermediate.shp in returnDir, which meant a full disk write
+    and read back and two buffers into the same folder writing over each other's file. Now the intermediate
+    comes from createIntermediate, so it is kept in memory unless it is bigger than spillBytes (then it goes
+    to a scratch file geodatabase) and is never shared between runs. With a simplifyOutput tolerance the
+    merged rings are simplified with simplifyPieces right before they are written (the buffers themselves when
+    they are not merged here), which takes out the many nearly straight vertices of the round joins and caps.
+    '''
+    # Delete the output file if it exists
+    if (os.path.exists(os.path.join(returnDir,outputName))):
+        arcpy.management.Delete(os.path.join(returnDir,outputName))
+    removed = 0
+    if(attributes is not None):
+        if(simplifyOutput is not None):
+            pieces, kept, removed = simplifyPieces(pieces,simplifyOutput,geodesic)
+            attributes = featureio.selectAttributes(attributes,kept)
+        # Every buffer keeps the attributes of its feature so there is nothing to dissolve
+        columnChunks = [featureio.ringsToColumns(pieces)+(attributes,)] if len(pieces)>0 else []
+        featureio.writeColumns(os.path.join(returnDir,outputName),'POLYGON',columnChunks,inputCoordinateSystem,fields)
+    elif(dissolveWith=="arcpy"):
+        # Make an intermediate for this run only, sized by the well-known binary that will go into it
+        estimatedBytes = sum(16*(len(ring)+1)+4 for rings in pieces for ring in rings)+9*len(pieces)
+        intermediate, scratchDir = createIntermediate(estimatedBytes,inputCoordinateSystem,spillBytes)
+        # arcpy writes the merged output itself so the buffers are simplified before they go in
+        if(simplifyOutput is not None):
+            pieces, kept, removed = simplifyPieces(pieces,simplifyOutput,geodesic)
+        try:
+            # Insert every feature's buffer as one polygon and use arcpy's dissolve to create the output
+            with arcpy.da.InsertCursor(intermediate, ['SHAPE@WKB']) as iCursor:
+                for rings in pieces:
+                    iCursor.insertRow([geometry.ringsToWKB(rings)])
+            arcpy.analysis.PairwiseDissolve(intermediate,os.path.join(returnDir,outputName))
+        finally:
+            removeIntermediate(intermediate,scratchDir)
+    else:
+        # Merge the buffers and write the result as one multipart polygon
+        dissolvedRings = dissolve.dissolvePieces(pieces,workers)
+        if(simplifyOutput is not None and len(dissolvedRings)>0):
+            # A geodesic output is simplified a polygon at a time around its own middle
+            polygons, kept, removed = simplifyPieces(geometry.ringPolygons(dissolvedRings) if geodesic else [dissolvedRings],
+                                                     simplifyOutput,geodesic)
+            dissolvedRings = [ring for rings in polygons for ring in rings]
+        columnChunks = [featureio.ringsToColumns([dissolvedRings])] if len(dissolvedRings)>0 else []
+        featureio.writeColumns(os.path.join(returnDir,outputName),'POLYGON',columnChunks,inputCoordinateSystem,fields)
+    return removed
+
+def tileMargins(boxes, sizes, geodesic = False):
+    '''
+    Parameters
+    ----------
+    boxes : This should be a numpy array.
+        This should be a (N, 4) array holding the bounding box of every feature.
+    sizes : This should be a numpy array.
+        This should be the buffer size of every feature, in the units of the boxes (or meters when geodesic is
+        True).
+    geodesic : This should be a boolean, optional
+        This should be True when the boxes are in latitude and longitude and the sizes in meters. The default
+        is False.
+
+    Returns
+    -------
+    numpy array
+        A (N, 2) array holding how far in x and y every feature's buffer can reach past its box, with a little
+        to spare.
+    '''
+    sizes = np.asarray(sizes,dtype=np.float64)
+    if(not geodesic):
+        return np.column_stack((sizes,sizes))*(1+1e-6)
+    # A degree of latitude is shortest at the equator and a degree of longitude shortest at the latitude
+    # furthest from it that the buffer reaches
+    reachY = sizes/geometry.metersPerDegree(0.0)[1]
+    furthest = np.minimum(np.maximum(np.abs(boxes[:,1]),np.abs(boxes[:,3]))+reachY,89.9)
+    reachX = sizes/geometry.metersPerDegree(furthest)[0]
+    return np.column_stack((reachX,reachY))*1.01
+
+def tiledBufferToOutput(returnDir, outputName, inputFile, geoType, buffSize, buffUnit, origin, tileSize,
+                        inputCoordinateSystem, pointsForBuff = 87, maxDeviation = None,
+                        chunkSize = featureio.DEFAULT_CHUNK_SIZE, geodesic = False, workers = 1,
+                        pointCounts = None, simplifyInput = None, simplified = None, simplifyOutput = None):
+    '''
+    Parameters
+    ----------
+    returnDir : This should be a string representing a file path.
+        This should be a string representing a file path to the directory/folder the output is saved to.
+    outputName : This should be a string representing a file name and extension.
+        This should be a string representing the name of the outputted buffer shape file.
+    inputFile, geoType, buffSize, buffUnit : These should be the arguments of the same names handed to
+        bufferPieceChunks.
+    origin : This should be a tuple.
+        This should be the (x, y) corner the grid of tiles starts from, like the lower left of the inputFile's
+        extent.
+    tileSize : This should be a number.
+        This should be a number representing how wide and tall every tile is, in the inputFile's units.
+    inputCoordinateSystem : This should be an arcpy spatial reference.
+        This should be the coordinate system of the inputted file.
+    pointsForBuff, maxDeviation, chunkSize, geodesic, workers, pointCounts, simplifyInput, simplified :
+        These should be the arguments of the same names handed to bufferPieceChunks.
+    simplifyOutput : This should be a number, optional
+        This should be a number representing the tolerance, in the units of the inputFile (or meters when
+        geodesic is True), the dissolved buffers of every tile are simplified with. The default of None does not
+        simplify them.
+
+    Returns
+    -------
+    int
+        How many vertices simplifying took out of the output (0 when it is not simplified).
+
+    Description
+    -----------
+    The tiledBufferToOutput function buffers and dissolves an input a tile at a time so the memory it needs
+    depends on the size of the tiles rather than the size of the input. The input is split up before it is
+    buffered: every feature (simplified first with a simplifyInput tolerance) goes into every tile of a grid
+    of tileSize squares that its buffer can reach, cut to that tile grown by the feature's buffer size (see
+    tileMargins), lines with geometry.clipLinesToBoxes and polygons with geometry.clipRingsToBox. Whatever is
+    within the buffer size of a tile is in its grown box, and the cuts are further than the buffer size from
+    the tile, so the buffers of the cut features match the buffers of the whole features inside the tile.
+    Each tile's share of every chunk is spilled to a scratch folder as columns with np.savez. Then the tiles
+    are loaded one at a time, their features are buffered (see bufferRuns), dissolved with
+    dissolve.dissolvePieces, simplified with a simplifyOutput tolerance and cut to the tile with
+    geometry.clipRingsToBox. Every polygon of every tile is written as its own feature, so a buffer that
+    reaches across tiles is written as one piece per tile, split along the tile lines, and no piece is ever
+    bigger than its tile.
+    '''
+    output = os.path.join(returnDir,outputName)
+    # Delete the output file if it exists
+    if (os.path.exists(output)):
+        arcpy.management.Delete(output)
+    workers = max(int(workers),1)
+    if(simplified is None):
+        simplified = {}
+    simplified.setdefault('input',0)
+    inputTolerance = simplifyTolerance(inputFile,simplifyInput,buffUnit,geodesic)
+    origin = np.asarray(origin,dtype=np.float64)
+    def tileBox(tile):
+        return np.concatenate((origin+np.array(tile)*tileSize,origin+(np.array(tile)+1)*tileSize))
+    scratchDir = tempfile.mkdtemp(prefix="tiles_")
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers) if workers>1 else None
+    try:
+        # Cut every chunk of features to the grown tiles they reach and spill them
+        tileFiles = {}
+        featureChunks = sizedFeatureChunks(inputFile,buffSize,buffUnit,pointsForBuff,maxDeviation,chunkSize,geodesic,None,
+                                           pointCounts)
+        for chunkIndex, (features, sizes, points, indexes, columns) in enumerate(featureChunks):
+            if(inputTolerance is not None):
+                for index, parts in enumerate(features):
+                    features[index], removed = simplifyRings(parts,inputTolerance,geoType=="POLYGON",geodesic)
+                    simplified['input'] += removed
+                kept = [index for index, parts in enumerate(features) if len(parts)>0]
+                features, sizes, points = [features[index] for index in kept], sizes[kept], points[kept]
+            if(len(features)==0):
+                continue
+            boxes = dissolve.pieceBoxes(features)
+            reach = tileMargins(boxes,sizes,geodesic)
+            first = np.floor((boxes[:,:2]-reach-origin)/tileSize).astype(np.int64)
+            last = np.floor((boxes[:,2:]+reach-origin)/tileSize).astype(np.int64)
+            tileMembers = {}
+            for index in range(len(features)):
+                for column in range(first[index,0],last[index,0]+1):
+                    for row in range(first[index,1],last[index,1]+1):
+                        tileMembers.setdefault((column,row),[]).append(index)
+            for tile, members in tileMembers.items():
+                members = np.array(members,dtype=np.int64)
+                grownBoxes = tileBox(tile)+np.concatenate((-reach[members],reach[members]),axis=1)
+                if(geoType=="POLYLINE"):
+                    memberFeatures = [features[index] for index in members.tolist()]
+                    coords, partOffsets, featureOffsets = featureio.ringsToColumns(memberFeatures,close=False)
+                    partFeature = np.repeat(np.arange(len(members)),np.diff(featureOffsets))
+                    coords, partOffsets, owners = geometry.clipLinesToBoxes(coords,partOffsets,grownBoxes[partFeature])
+                    # The pieces come out in the order of their parts so the ones of a feature are together
+                    pieceCounts = np.bincount(partFeature[owners],minlength=len(members))
+                    reached = np.flatnonzero(pieceCounts>0)
+                    featureOffsets = np.concatenate(([0],np.cumsum(pieceCounts[reached])))
+                else:
+                    clipped = [geometry.clipRingsToBox(features[index],grownBox)
+                               for index, grownBox in zip(members.tolist(),grownBoxes)]
+                    reached = np.array([slot for slot, rings in enumerate(clipped) if len(rings)>0],dtype=np.int64)
+                    clipped = [clipped[slot] for slot in reached.tolist()]
+                    coords, partOffsets, featureOffsets = featureio.ringsToColumns(clipped,close=False)
+                if(len(reached)==0):
+                    continue
+                path = os.path.join(scratchDir,str(tile[0])+"_"+str(tile[1])+"_"+str(chunkIndex)+".npz")
+                np.savez(path,coords=coords,partOffsets=partOffsets,featureOffsets=featureOffsets,
+                         sizes=sizes[members[reached]],points=points[members[reached]])
+                tileFiles.setdefault(tile,[]).append(path)
+        removed = [0]
+        def columnChunks():
+            for tile in sorted(tileFiles,key=lambda tile: (tile[1],tile[0])):
+                features = []
+                tileSizes = []
+                tilePoints = []
+                for path in tileFiles[tile]:
+                    with np.load(path) as spilled:
+                        features.extend(featureio.columnsToFeatures(spilled['coords'],spilled['partOffsets'],
+                                                                    spilled['featureOffsets']))
+                        tileSizes.append(spilled['sizes'])
+                        tilePoints.append(spilled['points'])
+                    os.remove(path)
+                pieces, made, buffered = bufferRuns(features,np.concatenate(tileSizes),
+                                                    np.concatenate(tilePoints),geoType,geodesic,None,workers,
+                                                    executor)
+                polygons = geometry.ringPolygons(dissolve.dissolvePieces(pieces,workers))
+                if(simplifyOutput is not None):
+                    # Simplified before the cut so the tile lines stay straight
+                    polygons, kept, polygonsRemoved = simplifyPieces(polygons,simplifyOutput,geodesic)
+                    removed[0] += polygonsRemoved
+                rings = geometry.clipRingsToBox([ring for polygon in polygons for ring in polygon],tuple(tileBox(tile)))
+                if(len(rings)>0):
+                    yield featureio.ringsToColumns(geometry.ringPolygons(rings))
+        featureio.writeColumns(output,'POLYGON',columnChunks(),inputCoordinateSystem)
+        return removed[0]
+    finally:
+        if(executor is not None):
+            executor.shutdown()
+        shutil.rmtree(scratchDir,ignore_errors=True)
+
+def PointsBuffer(returnDir,inputFile, outputName, buffSize, buffUnit, pointsForBuff = 87, maxDeviation = None,
+                 chunkSize = featureio.DEFAULT_CHUNK_SIZE, geodesic = False, carryFields = None):
     '''
     Parameters
     ----------
@@ -91,8 +754,9 @@ def PointsBuffer(returnDir,inputFile, outputName, buffSize, buffUnit, pointsForB
     outputName : This should be a string representing a file name and extension.
         This should be a string representing a file name and extension. This will be 
         the name of the outputted buffer shape file.
-    buffSize : This should be a number.
-        This should be a number representing how big you want the buffer to be.
+    buffSize : This should be a number or a string.
+        This should be a number representing how big you want the buffer to be, or the name of a numeric
+        field holding how big every feature's buffer should be (in buffUnit).
     buffUnit: This should be a string,
         This should be a string representing the unit associated with the desired buffered size.
         Restricted to the units available in the unit conversion function.
@@ -101,115 +765,115 @@ def PointsBuffer(returnDir,inputFile, outputName, buffSize, buffUnit, pointsForB
         to be composed of. Beware the less number of points you make the buffer of the less circular
         the buffer will be I.E inputting 4 here will result in a square/rhombus buffer. The default
         value is 87 since this is around the number of points Arc uses to make their buffers.
+    maxDeviation : This should be a number, optional
+        This should be a number representing the largest distance, in buffUnit, you will allow between the
+        true buffer circle and the straight edges it is made of. When given, the number of points is picked
+        from this instead of pointsForBuff (see arcPointCount). The default is None.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing how many features are read, buffered and written at a time.
+        The default is featureio.DEFAULT_CHUNK_SIZE.
+    geodesic : This should be a boolean, optional
+        This should be True to measure the buffer in meters along the Earth for a layer in latitude and
+        longitude. The default is False.
+    carryFields : This should be a list of strings, optional
+        This should be a list of the inputFile's fields to copy onto every buffer. The default is None.
 
     Returns
     -------
     str
-        A message as a string saying whether or not the buffer was successful or errored out.
+        A message as a string saying whether or not the buffer was successful or errored out. A successful
+        message also reports how many points each buffer circle was made of.
     
     Description
     -----------
-    The PointsBuffer function first call the unitConversion function to convert the inputted buffSize
-    and buffUnit to a number workable with the inputShapeFile. If the unit was invalid
-    it will simply create the buffer of buffSize in the inputFile's unit type. Then it 
-    will first create an empty list called centerCoordLst.  This list will
-    consist of tuples of (x,y) pairs representing all the points in the inputFile. Then it will
-    get the input files coordinate system and store it in inputCoordinateSystem. Then it briefly
-    checks to make sure that the output name and directory that you have inputted does not already exist.
-    If it does this function deletes it to make room for a new file. Then it opens a search cursor
-    on the inputfile, extracting the x and y coordinates using SHAPE@X and SHAPE@Y. It goes through
-    each point in the inputFile and appends their (x,y) pair to centerCoordLst. Then it makes
-    a new shape file based on inputted returnDir and outputName, making it of type polygon and giving
-    it the same coordinate system as the input file. Then it opens an insert cursor on the newly
-    made shape file accessing its geometry property. Then with that insert cursor open, the function
-    enters a loop iterating through the previously made centerCoordLst. For each (x,y) pair in this list,
-    we declare a new list, circleCoordPoints that will contain all the arc points that make up the buffer.
-    To determine the points we enter another loop using np.linspace. np.linspace takes in a start value,
-    a stop value, and how many divisions you want. In this functions case, it goes from 0 to 360 since
-    this represents the range of angular values that make up a circle. Then it takes in the inputted
-    number of points to construct the buffer, subsequently dividing 0 to 360 up into even intervals, where
-    the number of intervals is the number of points. The function includes the optional keyword in
-    np.linspace endpoint=False since we do not want to include 360 as one of the points np.linspace
-    generates since 0 and 360 are the same in a circle. Np.linspace returns an array of the
-    point that divide up 0,360 aka angles. Our function
-    loops directly through this. Now it calculates newX and newY values to begin building the circle.
-    To do this it exploits the unit circle in the following way: A unit circle is a circle of radius 
-    one and center point at (0,0). The points that make up the unit circle can be generated by
-    doing (cos(radianMeasure),sin(radianMeasure)) aka the (x,y) points that make up the unit circle
-    can be found by doing x = cos(radianMeasure) and y = sin(radianMeasure) So for example,
-    one of the points on the unit circle is (0,1) and this can be generated by doing (cos(pi/2),sin(pi/2))
-    math.cos and math.sin operate in radians so we will convert our degrees from np.linspace
-    to radians by doing math.radians(angle). Then we can feed that number to math.cos() and
-    math.sin() to get our X and Y respectively. However, this X and Y is that on a unit circle which
-    has a radius of 1 and center point of (0,0). To transform this to a buffer where radius = newBuffSize
-    and center point of (xCenterCoord,yCenterCoord) we multiple the math.cos() and math.sin()
-    operations by newBuffSize then add xCenterCoord to x and yCenterCoord to y. This will transform our
-    points to properly build our buffer. Consider why this works: Our right most point in a unit circle
-    is (1,0). If we want a cirlce with radius = 4 and center point (5,7) our right most point should
-    be at (9,7) aka 4 units to the right of the center. If (1,0) is determined via (cos(0),sin(0)) 
-    then to transform it to (9,7) just adding 5 to the x and 7 to the y is insufficient since then we
-    get (6,7). To replicate both the center point and radius we need to multiple the cos and sin values
-    by the radius before adding the center point. This results in (9,7). So we apply this transformation
-    generally to form all the buffer points.
-    Then we add this newly generated point to our CircleCoordPoints. Once
-    all the points have been generated stuff them into an arcpy array, and then put that arcpy array
-    into an arcpy polygon and then insert that arcpy polygon as a new row in the outputfile. This
-    process repeats for every point in the inputed shape file. This will try the above and if an error
-    occurs will return a string saying so. This is for functionality with the GUI.
+    The PointsBuffer function first call the unitConversion function to convert the inputted buffSize and
+    buffUnit to a number workable with the inputShapeFile. If the unit was invalid it will simply create the
+    buffer of buffSize in the inputFile's unit type. Then it will get the input files coordinate system and
+    store it in inputCoordinateSystem. Then it briefly checks to make sure that the output name and directory
+    that you have inputted does not already exist. If it does this function deletes it to make room for a new
+    file. The rest of the work is a pipeline of generators so only chunkSize points (and their circles) are in
+    memory at a time no matter how big the inputFile is, and writing starts as soon as the first chunk is
+    read. featureio.readPointChunks reads the SHAPE@XY of chunkSize points at a time, skipping null shapes, as
+    a (n, 2) numpy array of center points. The circles of each chunk are then built with the
+    geometry.circleBlock function. It exploits the unit circle in the following way: A unit circle is a circle
+    of radius one and center point at (0,0). The points that make up the unit circle can be generated by doing
+    (cos(radianMeasure),sin(radianMeasure)) aka the (x,y) points that make up the unit circle can be found by
+    doing x = cos(radianMeasure) and y = sin(radianMeasure) So for example, one of the points on the unit
+    circle is (0,1) and this can be generated by doing (cos(pi/2),sin(pi/2)) The angles come from np.linspace
+    which takes in a start value, a stop value, and how many divisions you want. It goes from 0 to 2 pi since
+    this represents the range of angular values that make up a circle, divided into pointsForBuff even
+    intervals with endpoint=False since 0 and 2 pi are the same in a circle. The resulting table of (cos, sin)
+    pairs only depends on pointsForBuff so it is cached by geometry.unitCircle and computed once. To transform
+    the unit circle to a buffer where radius = newBuffSize and center point of (xCenterCoord,yCenterCoord) we
+    multiple the cos and sin values by newBuffSize then add xCenterCoord to x and yCenterCoord to y. Consider
+    why this works: Our right most point in a unit circle is (1,0). If we want a cirlce with radius = 4 and
+    center point (5,7) our right most point should be at (9,7) aka 4 units to the right of the center. If
+    (1,0) is determined via (cos(0),sin(0)) then to transform it to (9,7) just adding 5 to the x and 7 to the
+    y is insufficient since then we get (6,7). To replicate both the center point and radius we need to
+    multiple the cos and sin values by the radius before adding the center point. This results in (9,7).
+    Rather than looping, numpy broadcasting applies this transformation to every center at once which yields
+    one (N, pointsForBuff, 2) block of buffer points for the chunk. The output is a new shape file made based
+    on inputted returnDir and outputName, of type polygon and with the same coordinate system as the input
+    file. Each block is turned clockwise, closed and laid out as one array of coordinates plus ring and
+    feature offsets by featureio.blockToColumns and written in bulk by featureio.writeColumns, so no
+    arcpy.Point, arcpy.Array or per feature insert is needed. When geodesic is True (bufferMain turns it on
+    for layers in latitude and longitude) buffSize is taken in meters and the circles come from
+    geometry.geodesicCircleBlock instead, which walks buffSize meters along the ellipsoid from every center in
+    every direction of the unit circle table at once. The carryFields are read in the same search cursor pass
+    as the points and written next to the circles, so no spatial join is needed to get them back. When
+    buffSize is the name of a field the buffer is handed to fieldCircleBuffer, which reads every point's size
+    in the same pass as the point and builds circles of different sizes the same way.
+    This will try the above and if an error occurs will return a string saying so. This is for functionality
+    with the GUI.
     '''
     # Try the following buffer methods
     try:
+        # A field name means every point has its own buffer size
+        if(isinstance(buffSize,str)):
+            return fieldCircleBuffer(returnDir,inputFile,outputName,buffSize,buffUnit,pointsForBuff,
+                                     maxDeviation,chunkSize,geodesic,carryFields=carryFields)
         # Convert the inputted units to the inputFiles units
-        newBuffSize = unitConversion(inputFile,buffSize,buffUnit)
+        newBuffSize = unitConversion(inputFile,buffSize,buffUnit,geodesic)
         # If not valid input unit, then just proceed to make the buffer in the inputFile's units
         # with the original size
         if(newBuffSize == "Sorry that unit type is unsupported at this time!"):
             print("That unit type is not supported. Creating buffer of inputted size in input files unit type")
             newBuffSize = buffSize
-        # Create an empty list of center coordinates for the inputted points
-        centerCoordLst = []
+        # Decide how many points make up each buffer circle, either fixed or from the maxDeviation
+        pointsForBuff = arcPointCount(inputFile,newBuffSize,buffUnit,pointsForBuff,maxDeviation,geodesic)
         # Get the coordinate system of the inputted file
-        inputCoordinateSystem = arcpy.Describe(inputFile).spatialReference
+        inputCoordinateSystem = featureio.describe(inputFile)['spatialReference']
         
         # Make sure to delete the output file if it already exists
         if (os.path.exists(os.path.join(returnDir,outputName))):
             arcpy.management.Delete(os.path.join(returnDir,outputName))
         
-        # Use a search cursor to get the x and y coordinates of each point in the point file
-        with arcpy.da.SearchCursor(inputFile,['SHAPE@X','SHAPE@Y']) as sCursor:
-            for row in sCursor:
-                if(row[0]!=None):
-                    centerCoordLst.append((row[0],row[1]))
-        
-        # Create a new shapefile based on the input to the function
-        arcpy.CreateFeatureclass_management(returnDir, outputName,'POLYGON',spatial_reference=inputCoordinateSystem)
-        
-        # Open a insert cursor on the new shapefile
-        with arcpy.da.InsertCursor(os.path.join(returnDir,outputName), ['SHAPE@']) as iCursor:
-            # Loop through the list of coordinates of the point
-            for xCenterCoord,yCenterCoord in centerCoordLst:
-                # Create an empty list that will store the buffer points
-                circleCoordPoints = []
-                # Get angles equal width apart from one another from 0 to 360 
-                for angle in np.linspace(0,360,pointsForBuff,endpoint=False):
-                    # For each angle calculate the new X and Y by constructing unit circle points
-                    # (cos for x and sin for y) and then multiply by newBuffSize and add to center points
-                    newX = newBuffSize*math.cos(math.radians(angle))+xCenterCoord
-                    newY = newBuffSize*math.sin(math.radians(angle))+yCenterCoord
-                    # Add that point to the buffer points list
-                    circleCoordPoints.append(arcpy.Point(newX,newY))
-                # Create an arcpy array from the buffer poitns and then a polygon from the array.
-                # Insert the polygon
-                circlePointArray = arcpy.Array(circleCoordPoints)
-                bufferPolygon = arcpy.Polygon(circlePointArray)
-                iCursor.insertRow([bufferPolygon])
+        # Read the x and y coordinates of the points a chunk at a time, along with the fields that are
+        # carried over as columns of values
+        centerChunks = featureio.readFieldChunks(inputFile,'SHAPE@XY',carryFields or [],chunkSize)
+        # Geodesic circles are found along the ellipsoid and planar ones by scaling the unit circle
+        circleFunction = geometry.geodesicCircleBlock if geodesic else geometry.circleBlock
+        # Build every circle of a chunk at once from the cached unit circle table, turned clockwise like
+        # outer rings are stored, and lay them out as columns of coordinates next to the attributes
+        columnChunks = (featureio.blockToColumns(circleFunction(featureio.decodeShapes(centers,featureio.pointCoords),
+                                                                newBuffSize,pointsForBuff)[:,::-1])+(columns,)
+                        for centers, columns in centerChunks if len(centers)>0)
+        # Geodesic circles that cross the antimeridian are cut along it
+        if(geodesic):
+            columnChunks = featureio.wrapChunks(columnChunks)
+        # Create the output and write each chunk of circles in bulk as soon as it is made
+        featureio.writeColumns(os.path.join(returnDir,outputName),'POLYGON',columnChunks,
+                               inputCoordinateSystem,featureio.outputFields(inputFile,carryFields))
         # If this all occurs then the buffer was successful and a success message should be returned.
-        return "The buffer was successful!"
+        return successMessage(pointsForBuff)
     # If an error occured, the buffer was unsuccessful.
     except:
         return "The buffer was unsuccessful. Sorry!"
             
-def lineBuffer(returnDir,inputFile, outputName, buffSize, buffUnit):
+def lineBuffer(returnDir,inputFile, outputName, buffSize, buffUnit, pointsForBuff = 87, maxDeviation = None,
+               dissolveWith = "native", workers = 1, chunkSize = featureio.DEFAULT_CHUNK_SIZE,
+               geodesic = False, carryFields = None, tileSize = None, simplifyInput = None,
+               simplifyOutput = None):
     '''
     Parameters
     ----------
@@ -221,114 +885,123 @@ def lineBuffer(returnDir,inputFile, outputName, buffSize, buffUnit):
     outputName : This should be a string representing a file name and extension.
         This should be a string representing a file name and extension. This will be 
         the name of the outputted buffer shape file.
-    buffSize : This should be a number.
-        This should be a number representing how big you want the buffer to be.
+    buffSize : This should be a number or a string.
+        This should be a number representing how big you want the buffer to be, or the name of a numeric
+        field holding how big every feature's buffer should be (in buffUnit).
     buffUnit: This should be a string,
         This should be a string representing the unit associated with the desired buffered size.
         Restricted to the units available in the unit conversion function.
+    pointsForBuff : This should be an interger., optional
+        This should be an integer representing how many points you want the buffer circles to be composed of.
+        The default value is 87 since this is around the number of points Arc uses to make their buffers.
+    maxDeviation : This should be a number, optional
+        This should be a number representing the largest distance, in buffUnit, you will allow between the
+        true buffer circle and the straight edges it is made of. When given, the number of points is picked
+        from this instead of pointsForBuff (see arcPointCount). The default is None.
+    dissolveWith : This should be a string, optional
+        This should be "native" to merge the buffers of different features with the dissolve.py engine or
+        "arcpy" to use arcpy's PairwiseDissolve on an intermediate feature class. The default is "native".
+    workers : This should be an integer, optional
+        This should be an integer representing how many processes the buffering and the native dissolve can
+        use. The default is 1.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing how many features are read, buffered and written at a time.
+        The default is featureio.DEFAULT_CHUNK_SIZE.
+    geodesic : This should be a boolean, optional
+        This should be True to measure the buffer in meters along the Earth for a layer in latitude and
+        longitude. The default is False.
+    carryFields : This should be a list of strings, optional
+        This should be a list of the inputFile's fields to copy onto every line's buffer. Giving any writes one
+        buffer per line instead of dissolving them. The default is None.
+    tileSize : This should be a number, optional
+        This should be a number representing the width of the square tiles, in the inputFile's units, to
+        buffer and dissolve a tile at a time for inputs too big to dissolve at once (see
+        tiledBufferToOutput). The output then holds one polygon per tile and connected area, split along the
+        tile lines, instead of one multipart polygon. The default of None dissolves everything at once.
+    simplifyInput : This should be a number, optional
+        This should be a number representing the tolerance, in buffUnit, every line is simplified with
+        (Douglas-Peucker) before it is buffered. The default of None does not simplify them.
+    simplifyOutput : This should be a number, optional
+        This should be a number representing the tolerance, in buffUnit, the merged buffers are simplified
+        with before they are written. The default of None does not simplify them.
+
     Returns
     -------
     str
-        This function returns a string representing a success or failure message.
+        This function returns a string representing a success or failure message. A successful
+        message also reports how many points each buffer circle was made of, and how many vertices
+        simplifying removed when a tolerance was given.
         
     Description
     -----------
-    The lineBuffer function utilizes a crude methodology to build a line buffer.First it 
+    The lineBuffer function builds a true offset curve buffer around every line. First it 
     calls the unitConversion function to convert the inputted buffSize
     and buffUnit to a number workable with the inputShapeFile. If the unit was invalid
-    it will simply create the buffer of buffSize in the inputFile's unit type. Then it sets up
-    intermediate and output shape files in the same coordinate system as the inputted file.
-    This function loops through each line in a POLYLINE geometry. It looks at each point in the line
-    and creates a circle buffer around each point using the same methods as the cirlce buffer funciton.
-    It then goes to the next point while saving the previous point. It then creates a rectangle of 
-    width 2*BufferSize around the line that connects the current point and the previous point. 
-    This is done by creating a unit vector in the direction of the line and then multiplying this by 
-    the buffer size. The vector is constructed by doing <dx,dy> where dx = currentPointX - prevPointX
-    and dy = currentPointY - prevPointY. It is then converted to a unit vector by dividing by the 
-    distance which is the square root of (dx squared + dy squared). Finally it is multiplied by the 
-    buffer size. Then it builds the rectangle by starting at each endpoint of the line and adding 
-    to it the perpendicular vector which is <-dy,dx>. It adds to each endpoint both <-dy,dx> and
-    <dy,-dx> so get the four endpoints of the rectangle. It then makes these into a polygon and adds
-    it to the intermediate file. Finally, at the end it calls arcpy's dissolve function to create
-    one polygon at the output file name from the many polygons created in the intermediate file.
+    it will simply create the buffer of buffSize in the inputFile's unit type.
+    It reads the lines chunkSize at a time with featureio.readChunks as well-known binary (SHAPE@WKB) and
+    turns each part of every line into a numpy array of points with geometry.wkbParts. Each part is then
+    walked once by geometry.strokeLine. It moves every segment of the line the buffer size to its left using
+    the perpendicular vector <-dy,dx>, where <dx,dy> is the unit vector in the direction of the segment (dx =
+    currentPointX - prevPointX and dy = currentPointY - prevPointY divided by the distance between the
+    points). Where the line bends away from that side the moved segments are joined with a round arc made of
+    points from the same cached unit circle that the point buffer uses, and where it bends towards that side
+    the outline goes back through the line's point. Then it does the same along the other side of the line on
+    the way back and closes the outline with a half circle cap at each end. This gives one ring per part that
+    can cross itself where the line loops back on itself, so geometry.windingUnion resolves those overlaps for
+    each feature on its own and gives back simple outer rings and holes. Finally, dissolveToOutput merges the
+    buffers of different features that overlap into one polygon at the output file name. Since there is only
+    one buffer per line rather than a circle per point and a rectangle per segment, this dissolve only has to
+    deal with real overlaps between features. By default it is done by dissolve.py's cascaded union without
+    writing an intermediate file, and dissolveWith="arcpy" goes back to arcpy's dissolve. benchmark.py
+    compares this against the old circles and rectangles approach. The reading and buffering of every line is
+    done by bufferFeaturePieces, which also buffers every line by its own size when buffSize is the name of a
+    field. With more than one worker the lines are buffered in a process pool (see bufferFeaturePieces) before
+    the dissolve merges the buffers across all of them. When carryFields are given the buffers are not
+    dissolved, every line's buffer is written as its own feature with the line's attributes instead (like a
+    buffer with no dissolve in ArcGIS). With a tileSize the lines are cut up by tile before they are buffered
+    and every tile is buffered and dissolved on its own by tiledBufferToOutput. A simplifyInput tolerance
+    thins out lines digitized far more finely than the buffer needs before they are buffered, and a
+    simplifyOutput tolerance takes the nearly straight vertices of the round joins and caps out of the merged
+    buffers before they are written (see geometry.simplifyParts).
 
     '''
     # Try the following buffer methods
     try:
-        # Convert the inputted units to the inputFiles units
-        newBuffSize = unitConversion(inputFile,buffSize,buffUnit)
-        # If not valid input unit, then just proceed to make the buffer in the inputFile's units
-        # with the original size
-        if(newBuffSize == "Sorry that unit type is unsupported at this time!"):
-            print("That unit type is not supported. Creating buffer of inputted size in input files unit type")
-            newBuffSize = buffSize
         # Get the inputFile's coordinate system
-        inputCoordinateSystem = arcpy.Describe(inputFile).spatialReference
-        # Delete intermediate and output files if they exist
-        if (os.path.exists(os.path.join(returnDir,outputName))):
-            arcpy.management.Delete(os.path.join(returnDir,outputName))
-        if (os.path.exists(os.path.join(returnDir,'intermediate.shp'))):
-            arcpy.management.Delete(os.path.join(returnDir,'intermediate.shp'))
-        # Create an intermediate shape file
-        arcpy.CreateFeatureclass_management(returnDir, 'intermediate.shp','POLYGON',spatial_reference=inputCoordinateSystem)
-        
-        # Open an insert cursor on the intermediate shape file
-        with arcpy.da.InsertCursor(os.path.join(returnDir,'intermediate.shp'), ['SHAPE@']) as iCursor:
-            # Open a search cursor on the input file
-            with arcpy.da.SearchCursor(inputFile,['SHAPE@']) as SearchCursor:
-                # Go through every line in the search cursor
-                for row in SearchCursor:
-                    if(row[0]!=None):
-                        # Grab the geometry of that line
-                        pLine = row[0]
-                        # Get the Array containing the lines points by doing .getPart(0)
-                        pLineArray = pLine.getPart(0)
-                        # Some lines may have more than two points. Since they are stored in an array
-                        # Just loop through the array accessing individual elt points each time
-                        # Set up a prevPoint that will initially be None
-                        prevPoint = None
-                        # Loop through the points
-                        for point in pLineArray:
-                            # Make a list for circular buffer points
-                            circleCoordPoints = []
-                            # Make a circle buffer around each point using methods described in
-                            # point buffer
-                            for angle in np.linspace(0,360,87,endpoint=False):
-                                newX = newBuffSize*math.cos(math.radians(angle))+point.X
-                                newY = newBuffSize*math.sin(math.radians(angle))+point.Y
-                                circleCoordPoints.append(arcpy.Point(newX,newY))
-                            circlePointArray = arcpy.Array(circleCoordPoints)
-                            bufferPolygon = arcpy.Polygon(circlePointArray)
-                            iCursor.insertRow([bufferPolygon])
-                            # If the prevPoint is not none, we can construct a rectangle Buffer
-                            if(prevPoint!=None):
-                                # Calculate a vector in the direction of the line of size newBuffSize
-                                dx = point.X - prevPoint.X
-                                dy = point.Y - prevPoint.Y
-                                D = math.sqrt(dx*dx + dy*dy)
-                                dx = newBuffSize * dx / D
-                                dy = newBuffSize*dy/D
-                                rectangleCoords = []
-                                # Add the four points of the buffer rectangle by using the 
-                                # perpendicular vector and then make a polygon out of them and add to 
-                                # intermediate shape file
-                                rectangleCoords.append(arcpy.Point(prevPoint.X-dy,prevPoint.Y+dx))
-                                rectangleCoords.append(arcpy.Point(prevPoint.X+dy,prevPoint.Y-dx))
-                                rectangleCoords.append(arcpy.Point(point.X+dy,point.Y-dx))
-                                rectangleCoords.append(arcpy.Point(point.X-dy,point.Y+dx))
-                                rectangleArray = arcpy.Array(rectangleCoords)
-                                rectanglePolygon = arcpy.Polygon(rectangleArray)
-                                iCursor.insertRow([rectanglePolygon])
-                            # set the previous point to the current point before moving on.
-                            prevPoint = point
-        # Use arcpy's dissolve to create the shape file for the output.
-        arcpy.analysis.PairwiseDissolve(os.path.join(returnDir,'intermediate.shp'),os.path.join(returnDir,outputName))
-        return "The buffer was successful!"
+        inputCoordinateSystem = featureio.describe(inputFile)['spatialReference']
+        # Count the vertices simplifying takes out of the input and the output
+        simplified = {'input':0,'output':0}
+        outputTolerance = simplifyTolerance(inputFile,simplifyOutput,buffUnit,geodesic)
+        # Buffer and dissolve a tile at a time when asked to
+        if(tileSize is not None and not carryFields):
+            pointCounts = {}
+            simplified['output'] = tiledBufferToOutput(returnDir,outputName,inputFile,"POLYLINE",buffSize,
+                                                       buffUnit,featureio.describe(inputFile)['extent'][:2],
+                                                       tileSize,inputCoordinateSystem,pointsForBuff,
+                                                       maxDeviation,chunkSize,geodesic,workers,pointCounts,
+                                                       simplifyInput,simplified,outputTolerance)
+            return successMessage(max(pointCounts.values()) if len(pointCounts)>0 else pointsForBuff,
+                                  simplifiedCount(simplified,simplifyInput,simplifyOutput))
+        # Buffer every line on its own (by buffSize or by its own size when buffSize is a field) along with
+        # the attributes that are carried over
+        pieces, pointsForBuff, attributes = bufferFeaturePieces(inputFile,"POLYLINE",buffSize,buffUnit,
+                                                                pointsForBuff,maxDeviation,chunkSize,geodesic,
+                                                                carryFields,workers,simplifyInput,simplified)
+        # Merge the buffers of different lines where they overlap into the output, or write every line's
+        # buffer with its attributes
+        simplified['output'] = dissolveToOutput(returnDir,outputName,pieces,inputCoordinateSystem,
+                                                dissolveWith,workers,attributes=attributes,
+                                                fields=featureio.outputFields(inputFile,carryFields),
+                                                simplifyOutput=outputTolerance,geodesic=geodesic)
+        return successMessage(pointsForBuff,simplifiedCount(simplified,simplifyInput,simplifyOutput))
     # If an error occured, the buffer was unsuccessful.
     except:
         return "The buffer was unsuccessful. Sorry!"
   
-def polygonBuffer(returnDir,inputFile, outputName, buffSize,buffUnit):
+def polygonBuffer(returnDir,inputFile, outputName, buffSize, buffUnit, pointsForBuff = 87,
+                  maxDeviation = None, dissolveWith = "native", workers = 1,
+                  chunkSize = featureio.DEFAULT_CHUNK_SIZE, geodesic = False, carryFields = None,
+                  tileSize = None, simplifyInput = None, simplifyOutput = None):
     '''
     Parameters
     ----------
@@ -340,109 +1013,571 @@ def polygonBuffer(returnDir,inputFile, outputName, buffSize,buffUnit):
     outputName : This should be a string representing a file name and extension.
         This should be a string representing a file name and extension. This will be 
         the name of the outputted buffer shape file.
-    buffSize : This should be a number.
-        This should be a number representing how big you want the buffer to be.
+    buffSize : This should be a number or a string.
+        This should be a number representing how big you want the buffer to be, or the name of a numeric
+        field holding how big every feature's buffer should be (in buffUnit).
     buffUnit: This should be a string,
         This should be a string representing the unit associated with the desired buffered size.
         Restricted to the units available in the unit conversion function.
-        
+    pointsForBuff : This should be an interger., optional
+        This should be an integer representing how many points you want the buffer circles to be composed of.
+        The default value is 87 since this is around the number of points Arc uses to make their buffers.
+    maxDeviation : This should be a number, optional
+        This should be a number representing the largest distance, in buffUnit, you will allow between the
+        true buffer circle and the straight edges it is made of. When given, the number of points is picked
+        from this instead of pointsForBuff (see arcPointCount). The default is None.
+    dissolveWith : This should be a string, optional
+        This should be "native" to merge the buffers of different features with the dissolve.py engine or
+        "arcpy" to use arcpy's PairwiseDissolve on an intermediate feature class. The default is "native".
+    workers : This should be an integer, optional
+        This should be an integer representing how many processes the buffering and the native dissolve can
+        use. The default is 1.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing how many features are read, buffered and written at a time.
+        The default is featureio.DEFAULT_CHUNK_SIZE.
+    geodesic : This should be a boolean, optional
+        This should be True to measure the buffer in meters along the Earth for a layer in latitude and
+        longitude. The default is False.
+    carryFields : This should be a list of strings, optional
+        This should be a list of the inputFile's fields to copy onto every polygon's buffer. Giving any writes
+        one buffer per polygon instead of dissolving them. The default is None.
+    tileSize : This should be a number, optional
+        This should be a number representing the width of the square tiles, in the inputFile's units, to
+        buffer and dissolve a tile at a time for inputs too big to dissolve at once (see
+        tiledBufferToOutput). The output then holds one polygon per tile and connected area, split along the
+        tile lines, instead of one multipart polygon. The default of None dissolves everything at once.
+    simplifyInput : This should be a number, optional
+        This should be a number representing the tolerance, in buffUnit, every polygon is simplified with
+        (Douglas-Peucker) before it is buffered. The default of None does not simplify them.
+    simplifyOutput : This should be a number, optional
+        This should be a number representing the tolerance, in buffUnit, the merged buffers are simplified
+        with before they are written. The default of None does not simplify them.
+
     Returns
     -------
     str
-        This function returns a string representing a success or failure message.
+        This function returns a string representing a success or failure message. A successful
+        message also reports how many points each buffer circle was made of, and how many vertices
+        simplifying removed when a tolerance was given.
         
     Description
     -----------
-    The polygonBuffer function uses a very crude methodology to create a polygon buffer. 
-    It should be warned that this is definitely not using the most effective algorithm to do so 
-    and creates many polygons in the process. Essentially, this function uses ArcPy methods to grab 
-    the POLYLINE boundary(s) of the inputted polygon shape file. It then performs essentially a 
-    line buffer on that POLYLINE boundary (adding circle buffers around each point and constructing 
-    rectangle buffers around each line). Further documentation on the line buffer methods can be 
-    found in the docstring for the line buffer function. It also adds the original polygon to the 
-    output layer. It should be warned that the outputted buffer shape file will have many polygons
-    to construct the buffer.
+    The polygonBuffer function grows every polygon outwards in a single pass over its rings. First it
+    calls the unitConversion function to convert the inputted buffSize and buffUnit to a number workable
+    with the inputShapeFile, falling back to the inputFile's unit type if the unit was invalid. Rather than
+    grabbing the POLYLINE boundary(s) of each polygon with boundary() and walking them one arcpy.Point at a
+    time, it reads the polygons chunkSize at a time with featureio.readChunks as well-known binary
+    (SHAPE@WKB) and turns the rings of each one (the same lines that make up its boundary, outer rings
+    clockwise and holes counterclockwise) into numpy arrays with geometry.wkbParts.
+    geometry.bufferPolygonRings then offsets every ring to both sides with round joins (the same offset curve
+    the line buffer uses, see the lineBuffer docstring, but closed so there are no caps) and merges those
+    outlines with the polygon itself using geometry.windingUnion. That gives the buffered polygon, holes
+    included, directly, so there is only one polygon per input feature to merge instead of the original
+    polygon plus a circle per vertex and a rectangle per edge. Finally dissolveToOutput merges the buffered
+    polygons of different features where they overlap each other into the output file, with dissolve.py's
+    cascaded union by default or with arcpy's dissolve when dissolveWith is "arcpy". The reading and buffering
+    of every polygon is done by bufferFeaturePieces, which also grows every polygon by its own size when
+    buffSize is the name of a field and spreads the buffering over workers processes. When carryFields are
+    given every polygon's buffer is written as its own feature with the polygon's attributes instead of being
+    dissolved. With a tileSize the polygons are cut up by tile and buffered a tile at a time by
+    tiledBufferToOutput. The polygons can be simplified before they are buffered with simplifyInput and the
+    merged buffers before they are written with simplifyOutput (see geometry.simplifyParts).
 
     '''
     # Try the following buffer methods
     try:
-        # Convert the inputted units to the inputFiles units
-        newBuffSize = unitConversion(inputFile,buffSize,buffUnit)
-        # If not valid input unit, then just proceed to make the buffer in the inputFile's units
-        # with the original size
-        if(newBuffSize == "Sorry that unit type is unsupported at this time!"):
-            print("That unit type is not supported. Creating buffer of inputted size in input files unit type")
-            newBuffSize = buffSize
         # Get the inputFile's coordinate system
-        inputCoordinateSystem = arcpy.Describe(inputFile).spatialReference
-        
-        # Delete intermediate and output files if they exist
+        inputCoordinateSystem = featureio.describe(inputFile)['spatialReference']
+        # Count the vertices simplifying takes out of the input and the output
+        simplified = {'input':0,'output':0}
+        outputTolerance = simplifyTolerance(inputFile,simplifyOutput,buffUnit,geodesic)
+        # Buffer and dissolve a tile at a time when asked to
+        if(tileSize is not None and not carryFields):
+            pointCounts = {}
+            simplified['output'] = tiledBufferToOutput(returnDir,outputName,inputFile,"POLYGON",buffSize,
+                                                       buffUnit,featureio.describe(inputFile)['extent'][:2],
+                                                       tileSize,inputCoordinateSystem,pointsForBuff,
+                                                       maxDeviation,chunkSize,geodesic,workers,pointCounts,
+                                                       simplifyInput,simplified,outputTolerance)
+            return successMessage(max(pointCounts.values()) if len(pointCounts)>0 else pointsForBuff,
+                                  simplifiedCount(simplified,simplifyInput,simplifyOutput))
+        # Grow every polygon on its own (by buffSize or by its own size when buffSize is a field) along with
+        # the attributes that are carried over
+        pieces, pointsForBuff, attributes = bufferFeaturePieces(inputFile,"POLYGON",buffSize,buffUnit,
+                                                                pointsForBuff,maxDeviation,chunkSize,geodesic,
+                                                                carryFields,workers,simplifyInput,simplified)
+        # Merge the buffered polygons where they overlap into the output, or write every polygon's buffer
+        # with its attributes
+        simplified['output'] = dissolveToOutput(returnDir,outputName,pieces,inputCoordinateSystem,
+                                                dissolveWith,workers,attributes=attributes,
+                                                fields=featureio.outputFields(inputFile,carryFields),
+                                                simplifyOutput=outputTolerance,geodesic=geodesic)
+        return successMessage(pointsForBuff,simplifiedCount(simplified,simplifyInput,simplifyOutput))
+    # If an error occured, the buffer was unsuccessful.
+    except:
+        return "The buffer was unsuccessful. Sorry!"
+    
+def multipointCircleColumns(circles, featureOffsets, mergePoints = False):
+    '''
+    Parameters
+    ----------
+    circles : This should be a numpy array.
+        This should be a (N, K, 2) array holding the clockwise circle around every point of a chunk of
+        multipoints.
+    featureOffsets : This should be a numpy array.
+        This should be an array saying which circles belong to which multipoint, the circles of multipoint k
+        being circles[featureOffsets[k]:featureOffsets[k+1]] (see geometry.multipointColumns).
+    mergePoints : This should be a boolean, optional
+        This should be True to make one multipart polygon per multipoint. The default of False makes one
+        polygon per point.
+
+    Returns
+    -------
+    tuple
+        A (coords, partOffsets, featureOffsets) tuple ready for featureio.writeColumns.
+
+    Description
+    -----------
+    The multipointCircleColumns function lays the circles out with featureio.blockToColumns. Without
+    mergePoints every circle is its own feature. With mergePoints the multipoint offsets become the feature
+    offsets so the circles of a multipoint are the parts of one polygon, which keeps one output feature per
+    input feature. A polygon's parts are not allowed to overlap, so the bounding boxes of the circles are
+    paired with geometry.bboxPairs and only the multipoints with two circles that can touch are merged with
+    dissolve.dissolvePieces. Multipoints with no points at all have no buffer and are left out.
+    '''
+    coords, partOffsets, pointOffsets = featureio.blockToColumns(circles)
+    if(not mergePoints):
+        return coords, partOffsets, pointOffsets
+    featureOffsets = np.asarray(featureOffsets,dtype=np.int64)
+    featureOffsets = np.concatenate((featureOffsets[:1],featureOffsets[1:][np.diff(featureOffsets)>0]))
+    owners = np.repeat(np.arange(len(featureOffsets)-1),np.diff(featureOffsets))
+    # Find the multipoints with circles that may overlap each other
+    boxes = np.concatenate((circles.min(axis=1),circles.max(axis=1)),axis=1)
+    first, second = geometry.bboxPairs(boxes)
+    overlapping = np.unique(owners[first][owners[first]==owners[second]])
+    if(len(overlapping)==0):
+        return coords, partOffsets, featureOffsets
+    features = [list(circles[featureOffsets[index]:featureOffsets[index+1]]) for index in range(len(featureOffsets)-1)]
+    for index in overlapping.tolist():
+        features[index] = dissolve.dissolvePieces([[circle] for circle in features[index]])
+    return featureio.ringsToColumns(features)
+
+def multipointAttributes(attributes, featureOffsets, mergePoints = False):
+    '''
+    Parameters
+    ----------
+    attributes : This should be a dictionary or None.
+        This should map field names to arrays holding the values of every multipoint of a chunk.
+    featureOffsets : This should be a numpy array.
+        This should be an array saying which circles belong to which multipoint (see multipointCircleColumns).
+    mergePoints : This should be a boolean, optional
+        This should be the same mergePoints the circles were laid out with. The default is False.
+
+    Returns
+    -------
+    dict or None
+        The attributes lined up with the features multipointCircleColumns makes, or None if attributes is None.
+
+    Description
+    -----------
+    Without mergePoints every circle is a feature, so every multipoint's values are repeated once per point
+    with np.repeat. With mergePoints the multipoints with no points are left out just like their (missing)
+    polygons are.
+    '''
+    counts = np.diff(np.asarray(featureOffsets,dtype=np.int64))
+    if(mergePoints):
+        return featureio.selectAttributes(attributes,counts>0)
+    return featureio.selectAttributes(attributes,np.repeat(np.arange(len(counts)),counts))
+
+def fieldCircleBuffer(returnDir,inputFile, outputName, buffField, buffUnit, pointsForBuff = 87,
+                      maxDeviation = None, chunkSize = featureio.DEFAULT_CHUNK_SIZE, geodesic = False,
+                      mergePoints = False, carryFields = None):
+    '''
+    Parameters
+    ----------
+    returnDir : This should be a string representing a file path.
+        This should be a string representing a file path to the directory/folder you wish to save
+        your created buffer file to.
+    inputFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to a valid point or multipoint shape file.
+    outputName : This should be a string representing a file name and extension.
+        This should be a string representing a file name and extension. This will be 
+        the name of the outputted buffer shape file.
+    buffField : This should be a string.
+        This should be the name of a numeric field holding how big every feature's buffer should be.
+    buffUnit: This should be a string,
+        This should be a string representing the unit the buffer sizes in buffField are in.
+        Restricted to the units available in the unit conversion function.
+    pointsForBuff : This should be an interger., optional
+        This should be an integer representing how many points you want the buffer circles
+        to be composed of. The default value is 87.
+    maxDeviation : This should be a number, optional
+        This should be a number representing the largest distance, in buffUnit, you will allow between the
+        true buffer circle and the straight edges it is made of. The default is None.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing how many features are read, buffered and written at a time.
+        The default is featureio.DEFAULT_CHUNK_SIZE.
+    geodesic : This should be a boolean, optional
+        This should be True to measure the buffers in meters along the Earth for a layer in latitude and
+        longitude. The default is False.
+    mergePoints : This should be a boolean, optional
+        This should be True to make one multipart polygon per multipoint (see multipointCircleColumns). The
+        default is False.
+    carryFields : This should be a list of strings, optional
+        This should be a list of the inputFile's fields to copy onto every buffer. The default is None.
+
+    Returns
+    -------
+    str
+        This function returns a string representing a success or failure message. A successful
+        message also reports the most points any buffer circle was made of.
+
+    Description
+    -----------
+    The fieldCircleBuffer function is the point and multipoint buffer for when every feature has its own
+    buffer size. The sizes are read with featureio.readFieldChunks in the same search cursor pass as the
+    shapes, so a chunk comes back as the centers plus a column of sizes lined up with them, and fieldSizes
+    converts the whole column to the inputFile's units at once. Multipoints are flattened with
+    geometry.multipointColumns and the points of a multipoint all take the size of their multipoint with
+    np.repeat. geometry.circleBlock (or geometry.geodesicCircleBlock) takes the
+    column of sizes as well as a single size, so the unit circle table is broadcast against a (N, 1, 1) array
+    of radii and thousands of different sizes still cost one array operation per chunk. Every circle of a
+    chunk has the same number of points, so with a maxDeviation the count is picked for the biggest size in
+    the chunk which keeps every circle in the chunk within the maxDeviation. The carryFields are read in the
+    same pass and go along with the circles (see multipointAttributes).
+    '''
+    # Try the following buffer methods
+    try:
+        geoType = featureio.describe(inputFile)['shapeType']
+        inputCoordinateSystem = featureio.describe(inputFile)['spatialReference']
+        # Delete the output file if it exists
         if (os.path.exists(os.path.join(returnDir,outputName))):
             arcpy.management.Delete(os.path.join(returnDir,outputName))
-        if (os.path.exists(os.path.join(returnDir,'intermediate.shp'))):
-            arcpy.management.Delete(os.path.join(returnDir,'intermediate.shp'))
-        # Create an intermediate shape file
-        arcpy.CreateFeatureclass_management(returnDir, 'intermediate.shp','POLYGON',spatial_reference=inputCoordinateSystem)
-        
-        # Open an insert cursor on the intermediate shape file
-        with arcpy.da.InsertCursor(os.path.join(returnDir,'intermediate.shp'), ['SHAPE@']) as iCursor:
-            # Open a search cursor on the input shape file
-            with arcpy.da.SearchCursor(inputFile,['SHAPE@']) as SearchCursor:
-                for row in SearchCursor:
-                    if(row[0]!=None):
-                        # Access the row containing the polygons geometry and access its POLYLINE boundary
-                        # and store in the pLines
-                        pLines = row[0].boundary()
-                        # Insert the original polygon geometry into the intermediate
-                        iCursor.insertRow([row[0]])
-                        # Get the Array containing the POLYLINEs from the boundary
-                        pLineArray = pLines.getPart()
-                        # The polygon boundary may be composed of multiple POLYLINEs so loop through
-                        # each line
-                        for line in pLineArray:
-                            # Set the prevPoint to None to start for each line
-                            prevPoint = None
-                            # Loop through each point in the line
-                            for point in line:
-                                # Make a list for circular buffer points
-                                circleCoordPoints = []
-                                # Make a circle buffer around each point using methods described in
-                                # point buffer
-                                for angle in np.linspace(0,360,87,endpoint=False):
-                                    newX = newBuffSize*math.cos(math.radians(angle))+point.X
-                                    newY = newBuffSize*math.sin(math.radians(angle))+point.Y
-                                    circleCoordPoints.append(arcpy.Point(newX,newY))
-                                circlePointArray = arcpy.Array(circleCoordPoints)
-                                bufferPolygon = arcpy.Polygon(circlePointArray)
-                                iCursor.insertRow([bufferPolygon])
-                                # If the prevPoint is not none, we can construct a rectangle Buffer
-                                if(prevPoint!=None):
-                                    # Calculate a vector in the direction of the line of size newBuffSize
-                                    dx = point.X - prevPoint.X
-                                    dy = point.Y - prevPoint.Y
-                                    D = math.sqrt(dx*dx + dy*dy)
-                                    dx = newBuffSize * dx / D
-                                    dy = newBuffSize*dy/D
-                                    rectangleCoords = []
-                                    # Add the four points of the buffer rectangle by using the 
-                                    # perpendicular vector and then make a polygon out of them and add to 
-                                    # intermediate shape file
-                                    rectangleCoords.append(arcpy.Point(prevPoint.X-dy,prevPoint.Y+dx))
-                                    rectangleCoords.append(arcpy.Point(prevPoint.X+dy,prevPoint.Y-dx))
-                                    rectangleCoords.append(arcpy.Point(point.X+dy,point.Y-dx))
-                                    rectangleCoords.append(arcpy.Point(point.X-dy,point.Y+dx))
-                                    rectangleArray = arcpy.Array(rectangleCoords)
-                                    rectanglePolygon = arcpy.Polygon(rectangleArray)
-                                    iCursor.insertRow([rectanglePolygon])
-                                # set the previous point to the current point before moving on.
-                                prevPoint = point
-        arcpy.analysis.PairwiseDissolve(os.path.join(returnDir,'intermediate.shp'),os.path.join(returnDir,outputName))
-        return "The buffer was successful!"
+        circleFunction = geometry.geodesicCircleBlock if geodesic else geometry.circleBlock
+        # Keep track of the most points any circle was made of for the success message
+        usedPoints = [0]
+        carryFields = list(carryFields or [])
+        def columnChunks():
+            shapeToken = 'SHAPE@XY' if geoType=="POINT" else 'SHAPE@WKB'
+            readFields = [buffField]+[field for field in carryFields if field!=buffField]
+            for shapes, columns in featureio.readFieldChunks(inputFile,shapeToken,readFields,chunkSize):
+                if(geoType=="POINT"):
+                    centerCoords = featureio.decodeShapes(shapes,featureio.pointCoords)
+                    featureOffsets = np.arange(len(centerCoords)+1)
+                else:
+                    centerCoords, featureOffsets = featureio.decodeShapes(shapes,geometry.multipointColumns)
+                newBuffSizes, keep = fieldSizes(inputFile,columns[buffField],buffUnit,geodesic)
+                # Every point of a multipoint gets the size of its multipoint
+                counts = np.diff(featureOffsets)[keep]
+                centerCoords = centerCoords[np.repeat(keep,np.diff(featureOffsets))]
+                if(len(centerCoords)==0):
+                    continue
+                points = arcPointCount(inputFile,newBuffSizes.max(),buffUnit,pointsForBuff,maxDeviation,geodesic)
+                usedPoints[0] = max(usedPoints[0],points)
+                circles = circleFunction(centerCoords,np.repeat(newBuffSizes,counts),points)[:,::-1]
+                circleOffsets = np.concatenate(([0],np.cumsum(counts)))
+                attributes = None
+                if(len(carryFields)>0):
+                    attributes = featureio.selectAttributes({field:columns[field] for field in carryFields},keep)
+                yield multipointCircleColumns(circles,circleOffsets,
+                                              mergePoints)+(multipointAttributes(attributes,circleOffsets,mergePoints),)
+        # Geodesic circles that cross the antimeridian are cut along it
+        chunks = featureio.wrapChunks(columnChunks()) if geodesic else columnChunks()
+        featureio.writeColumns(os.path.join(returnDir,outputName),'POLYGON',chunks,inputCoordinateSystem,
+                               featureio.outputFields(inputFile,carryFields))
+        return successMessage(usedPoints[0] or pointsForBuff)
     # If an error occured, the buffer was unsuccessful.
     except:
         return "The buffer was unsuccessful. Sorry!"
-    
-def multiPointBuffer(returnDir,inputFile, outputName, buffSize,buffUnit):
+
+def bufferTask(task):
+    '''
+    Parameters
+    ----------
+    task : This should be a tuple.
+        This should be a (coords, partOffsets, featureOffsets, sizes, points, geoType, geodesic, tolerance)
+        tuple holding a run of lines or polygons as columns (see featureio.ringsToColumns with close=False)
+        along with the buffer size and number of circle points of every feature and the tolerance the features
+        are simplified with before they are buffered (None to not simplify them).
+
+    Returns
+    -------
+    tuple
+        A (coords, partOffsets, featureOffsets, made, removed) tuple holding the buffer rings of the features
+        that got a buffer as columns, made, the indexes of those features in the run, and removed, how many
+        vertices simplifying took out of the features.
+
+    Description
+    -----------
+    The bufferTask function is what the worker processes of bufferFeaturePieces run. It has to sit at the top
+    of the file so it can be handed to another process. The features come in and go out as a few flat numpy
+    arrays, which are sent between processes as plain blocks of bytes, rather than as lists of Python objects.
+    '''
+    coords, partOffsets, featureOffsets, sizes, points, geoType, geodesic, tolerance = task
+    features = featureio.columnsToFeatures(coords,partOffsets,featureOffsets)
+    buffers = []
+    made = []
+    removed = 0
+    for index, (parts, size, count) in enumerate(zip(features,sizes.tolist(),points.tolist())):
+        if(tolerance is not None):
+            # Take out the vertices the buffer does not need before buffering
+            parts, partRemoved = simplifyRings(parts,tolerance,geoType=="POLYGON",geodesic)
+            removed += partRemoved
+        bufferRings = bufferParts(parts,geoType,size,count,geodesic)
+        if(len(bufferRings)>0):
+            buffers.append(bufferRings)
+            made.append(index)
+    return featureio.ringsToColumns(buffers,close=False)+(np.array(made,dtype=np.int64),removed)
+
+def sizedFeatureChunks(inputFile, buffSize, buffUnit, pointsForBuff = 87, maxDeviation = None,
+                       chunkSize = featureio.DEFAULT_CHUNK_SIZE, geodesic = False, carryFields = None,
+                       pointCounts = None):
+    '''
+    Parameters
+    ----------
+    inputFile, buffSize, buffUnit, pointsForBuff, maxDeviation, chunkSize, geodesic, carryFields, pointCounts :
+        These should be the arguments of the same names handed to bufferPieceChunks.
+
+    Yields
+    ------
+    tuple
+        A (features, sizes, points, indexes, columns) tuple for every chunk that has a feature to buffer, where
+        features holds the parts of every such feature (see geometry.wkbParts), sizes and points hold its
+        buffer size and number of circle points, indexes holds where the features are in the chunk and columns
+        holds the chunk's field values.
+
+    Description
+    -----------
+    The sizedFeatureChunks function reads the lines or polygons, along with the buffer size field and the
+    carryFields, in one search cursor pass with featureio.readFieldChunks. A single buffSize is converted once
+    with unitConversion. A field of sizes is converted a chunk at a time with fieldSizes so every feature is
+    buffered by its own size, and with a maxDeviation every size gets its own number of points (saved in
+    pointCounts so a size is only worked out once).
+    '''
+    carryFields = list(carryFields or [])
+    sizeFields = [buffSize] if isinstance(buffSize,str) else []
+    if(pointCounts is None):
+        pointCounts = {}
+    if(len(sizeFields)==0):
+        # Convert the inputted units to the inputFiles units
+        newBuffSize = unitConversion(inputFile,buffSize,buffUnit,geodesic)
+        # If not valid input unit, then just proceed to make the buffer in the inputFile's units
+        # with the original size
+        if(newBuffSize == "Sorry that unit type is unsupported at this time!"):
+            print("That unit type is not supported. Creating buffer of inputted size in input files unit type")
+            newBuffSize = buffSize
+        # Decide how many points make up each buffer circle, either fixed or from the maxDeviation
+        pointCounts[newBuffSize] = arcPointCount(inputFile,newBuffSize,buffUnit,pointsForBuff,maxDeviation,geodesic)
+    readFields = sizeFields+[field for field in carryFields if field not in sizeFields]
+    for shapes, columns in featureio.readFieldChunks(inputFile,'SHAPE@WKB',readFields,chunkSize):
+        if(len(sizeFields)>0):
+            newBuffSizes, keep = fieldSizes(inputFile,columns[buffSize],buffUnit,geodesic)
+        else:
+            keep = np.ones(len(shapes),dtype=bool)
+            newBuffSizes = np.full(len(shapes),newBuffSize)
+        indexes = np.flatnonzero(keep)
+        if(len(indexes)==0):
+            continue
+        for size in np.unique(newBuffSizes).tolist():
+            if(size not in pointCounts):
+                pointCounts[size] = arcPointCount(inputFile,size,buffUnit,pointsForBuff,maxDeviation,geodesic)
+        newPoints = np.array([pointCounts[size] for size in newBuffSizes.tolist()],dtype=np.int64)
+        allParts = featureio.decodeShapes(shapes,shapeParts)
+        yield [allParts[index] for index in indexes.tolist()], newBuffSizes, newPoints, indexes, columns
+
+def bufferRuns(features, sizes, points, geoType, geodesic = False, tolerance = None, workers = 1, executor = None):
+    '''
+    Parameters
+    ----------
+    features : This should be a list of lists of numpy arrays.
+        This should be the parts of every feature to buffer.
+    sizes, points : These should be numpy arrays.
+        These should be the buffer size and number of circle points of every feature.
+    geoType : This should be a string.
+        This should be POLYLINE or POLYGON.
+    geodesic : This should be a boolean, optional
+        This should be True when the features are in latitude and longitude. The default is False.
+    tolerance : This should be a number, optional
+        This should be the tolerance the features are simplified with before they are buffered. The default of
+        None does not simplify them.
+    workers : This should be an integer, optional
+        This should be an integer representing how many runs to cut the features into. The default is 1.
+    executor : This should be a concurrent.futures executor, optional
+        This should be the process pool the runs are buffered in. The default of None buffers them here.
+
+    Returns
+    -------
+    tuple
+        A (pieces, made, removed) tuple holding the buffer rings of every feature that got a buffer, the
+        indexes of those features and how many vertices simplifying took out.
+
+    Description
+    -----------
+    The bufferRuns function cuts the features into workers runs of neighbouring features that are laid out as
+    columns and handed to bufferTask, and puts the results back together in the order of the runs so the
+    pieces come out in the same order for any number of workers.
+    '''
+    runs = np.array_split(np.arange(len(features)),max(min(workers,len(features)),1))
+    tasks = [featureio.ringsToColumns([features[index] for index in run.tolist()],close=False)
+             +(sizes[run],points[run],geoType,geodesic,tolerance) for run in runs]
+    results = executor.map(bufferTask,tasks) if executor is not None else map(bufferTask,tasks)
+    pieces = []
+    made = []
+    removed = 0
+    for run, (coords, partOffsets, featureOffsets, runMade, runRemoved) in zip(runs,results):
+        pieces.extend(featureio.columnsToFeatures(coords,partOffsets,featureOffsets))
+        made.append(run[runMade])
+        removed += runRemoved
+    return pieces, np.concatenate(made+[np.zeros(0,dtype=np.int64)]), removed
+
+def bufferPieceChunks(inputFile, geoType, buffSize, buffUnit, pointsForBuff = 87, maxDeviation = None,
+                      chunkSize = featureio.DEFAULT_CHUNK_SIZE, geodesic = False, carryFields = None,
+                      workers = 1, pointCounts = None, simplifyInput = None, simplified = None):
+    '''
+    Parameters
+    ----------
+    inputFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to a valid polyline or polygon shape file.
+    geoType : This should be a string.
+        This should be POLYLINE or POLYGON.
+    buffSize : This should be a number or a string.
+        This should be a number representing how big you want the buffers to be, or the name of a numeric
+        field holding how big every feature's buffer should be.
+    buffUnit: This should be a string,
+        This should be a string representing the unit of buffSize (or of the values in the buffSize field).
+    pointsForBuff : This should be an interger., optional
+        This should be an integer representing how many points a full circle of the buffers is made of.
+        The default value is 87.
+    maxDeviation : This should be a number, optional
+        This should be a number representing the largest distance, in buffUnit, you will allow between the
+        true buffer circle and the straight edges it is made of. The default is None.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing how many features are read at a time.
+        The default is featureio.DEFAULT_CHUNK_SIZE.
+    geodesic : This should be a boolean, optional
+        This should be True to measure the buffers in meters along the Earth. The default is False.
+    carryFields : This should be a list of strings, optional
+        This should be a list of the fields to read along with every feature. The default is None.
+    workers : This should be an integer, optional
+        This should be an integer representing how many processes buffer the features. The default is 1 which
+        does all of the work in this process.
+    pointCounts : This should be a dictionary, optional
+        This should be a dictionary that the number of circle points of every buffer size is saved in, so the
+        caller can see how many points were used. The default of None uses a dictionary of its own.
+    simplifyInput : This should be a number, optional
+        This should be a number representing the tolerance, in buffUnit, the features are simplified with
+        before they are buffered. The default of None does not simplify them.
+    simplified : This should be a dictionary, optional
+        This should be a dictionary that the number of vertices simplifying took out is added up in under
+        'input'. The default of None uses a dictionary of its own.
+
+    Yields
+    ------
+    tuple
+        A (pieces, attributes) tuple for every chunk where pieces holds the buffer rings of every feature of
+        the chunk that got a buffer and attributes holds their carryFields (None when there are no carryFields).
+
+    Description
+    -----------
+    The bufferPieceChunks function reads the lines or polygons with sizedFeatureChunks and buffers every
+    chunk with bufferRuns. With more than one worker the runs are buffered at the same time in a process pool
+    that is kept for the whole read. Only one chunk of buffers is held at a time. With a simplifyInput
+    tolerance every feature is simplified by bufferTask (see simplifyRings) right before it is buffered, so
+    input digitized far more finely than the buffer needs costs less to buffer.
+    '''
+    workers = max(int(workers),1)
+    carryFields = list(carryFields or [])
+    if(simplified is None):
+        simplified = {}
+    simplified.setdefault('input',0)
+    inputTolerance = simplifyTolerance(inputFile,simplifyInput,buffUnit,geodesic)
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers) if workers>1 else None
+    try:
+        featureChunks = sizedFeatureChunks(inputFile,buffSize,buffUnit,pointsForBuff,maxDeviation,chunkSize,geodesic,
+                                           carryFields,pointCounts)
+        for features, newBuffSizes, newPoints, indexes, columns in featureChunks:
+            pieces, made, removed = bufferRuns(features,newBuffSizes,newPoints,geoType,geodesic,
+                                               inputTolerance,workers,executor)
+            simplified['input'] += removed
+            attributes = None
+            if(len(carryFields)>0):
+                attributes = featureio.selectAttributes({field:columns[field] for field in carryFields},indexes[made])
+            yield pieces, attributes
+    finally:
+        if(executor is not None):
+            executor.shutdown()
+
+def bufferFeaturePieces(inputFile, geoType, buffSize, buffUnit, pointsForBuff = 87, maxDeviation = None,
+                        chunkSize = featureio.DEFAULT_CHUNK_SIZE, geodesic = False, carryFields = None,
+                        workers = 1, simplifyInput = None, simplified = None):
+    '''
+    Parameters
+    ----------
+    inputFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to a valid polyline or polygon shape file.
+    geoType : This should be a string.
+        This should be POLYLINE or POLYGON.
+    buffSize : This should be a number or a string.
+        This should be a number representing how big you want the buffers to be, or the name of a numeric
+        field holding how big every feature's buffer should be.
+    buffUnit: This should be a string,
+        This should be a string representing the unit of buffSize (or of the values in the buffSize field).
+    pointsForBuff : This should be an interger., optional
+        This should be an integer representing how many points a full circle of the buffers is made of.
+        The default value is 87.
+    maxDeviation : This should be a number, optional
+        This should be a number representing the largest distance, in buffUnit, you will allow between the
+        true buffer circle and the straight edges it is made of. The default is None.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing how many features are read at a time.
+        The default is featureio.DEFAULT_CHUNK_SIZE.
+    geodesic : This should be a boolean, optional
+        This should be True to measure the buffers in meters along the Earth. The default is False.
+    carryFields : This should be a list of strings, optional
+        This should be a list of the fields to read along with every feature. The default is None.
+    workers : This should be an integer, optional
+        This should be an integer representing how many processes buffer the features. The default is 1 which
+        does all of the work in this process.
+    simplifyInput : This should be a number, optional
+        This should be a number representing the tolerance, in buffUnit, the features are simplified with
+        before they are buffered. The default of None does not simplify them.
+    simplified : This should be a dictionary, optional
+        This should be a dictionary that the number of vertices simplifying took out is added up in (see
+        bufferPieceChunks). The default is None.
+
+    Returns
+    -------
+    tuple
+        A (pieces, pointsForBuff, attributes) tuple where pieces holds the buffer rings of every feature, ready
+        for dissolveToOutput, pointsForBuff is the most points a full circle of any of them was made of and
+        attributes holds the carryFields of the features in pieces (None when there are no carryFields).
+
+    Description
+    -----------
+    The bufferFeaturePieces function collects every chunk of buffers from bufferPieceChunks (see it for how
+    the features are read and buffered) so they can be dissolved together. The attributes of the features
+    that ended up with a buffer are kept as one numpy array per field. The buffers of different runs and
+    chunks are merged afterwards by dissolveToOutput.
+    '''
+    carryFields = list(carryFields or [])
+    pointCounts = {}
+    pieces = []
+    attributeChunks = []
+    for chunkPieces, chunkAttributes in bufferPieceChunks(inputFile,geoType,buffSize,buffUnit,pointsForBuff,
+                                                          maxDeviation,chunkSize,geodesic,carryFields,workers,
+                                                          pointCounts,simplifyInput,simplified):
+        pieces.extend(chunkPieces)
+        if(chunkAttributes is not None):
+            attributeChunks.append(chunkAttributes)
+    attributes = None
+    if(len(carryFields)>0):
+        attributes = {field:np.concatenate([chunk[field] for chunk in attributeChunks]+[np.zeros(0,dtype=object)])
+                      for field in carryFields}
+    return pieces, max(pointCounts.values()) if len(pointCounts)>0 else pointsForBuff, attributes
+
+def multiPointBuffer(returnDir,inputFile, outputName, buffSize, buffUnit, pointsForBuff = 87,
+                     maxDeviation = None, chunkSize = featureio.DEFAULT_CHUNK_SIZE, geodesic = False,
+                     mergePoints = False, carryFields = None):
     '''
     Parameters
     ----------
@@ -454,71 +1589,256 @@ def multiPointBuffer(returnDir,inputFile, outputName, buffSize,buffUnit):
     outputName : This should be a string representing a file name and extension.
         This should be a string representing a file name and extension. This will be 
         the name of the outputted buffer shape file.
-    buffSize : This should be a number.
-        This should be a number representing how big you want the buffer to be.
+    buffSize : This should be a number or a string.
+        This should be a number representing how big you want the buffer to be, or the name of a numeric
+        field holding how big every feature's buffer should be (in buffUnit).
     buffUnit: This should be a string,
         This should be a string representing the unit associated with the desired buffered size.
         Restricted to the units available in the unit conversion function.
+    pointsForBuff : This should be an interger., optional
+        This should be an integer representing how many points you want the buffer circles to be composed of.
+        The default value is 87 since this is around the number of points Arc uses to make their buffers.
+    maxDeviation : This should be a number, optional
+        This should be a number representing the largest distance, in buffUnit, you will allow between the
+        true buffer circle and the straight edges it is made of. When given, the number of points is picked
+        from this instead of pointsForBuff (see arcPointCount). The default is None.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing how many features are read, buffered and written at a time.
+        The default is featureio.DEFAULT_CHUNK_SIZE.
+    geodesic : This should be a boolean, optional
+        This should be True to measure the buffer in meters along the Earth for a layer in latitude and
+        longitude. The default is False.
+    mergePoints : This should be a boolean, optional
+        This should be True to make one multipart polygon out of the circles of every multipoint so the output
+        has a feature for every input feature. The default of False makes a polygon for every point.
+    carryFields : This should be a list of strings, optional
+        This should be a list of the inputFile's fields to copy onto every buffer. The default is None.
 
     Returns
     -------
     str
-        This function returns a string representing a success or failure message.
+        This function returns a string representing a success or failure message. A successful
+        message also reports how many points each buffer circle was made of.
         
     Description
     -----------
-    The multiPointBuffer function accesses all the points included in the multipoint feature and
-    applies the same methodology as the point buffer to each point in the multipoint feature. It creates
-    circular buffers around each point of the buffSize and buffUnit. For more documentation on how 
-    the circular buffer works, see the PointsBuffer docstring.
+    The multiPointBuffer function accesses all the points included in the multipoint feature and applies the
+    same methodology as the point buffer to each point in the multipoint feature. It creates circular buffers
+    around each point of the buffSize and buffUnit. For more documentation on how the circular buffer works,
+    see the PointsBuffer docstring. The multipoints are read chunkSize at a time as well-known binary and
+    geometry.multipointColumns flattens the points of the whole chunk into one array of coordinates plus
+    offsets saying which multipoint every point came from, without a Python loop per point. All of the points
+    of a chunk are then buffered at once with geometry.circleBlock and every chunk of circles is written in
+    bulk by featureio.writeColumns. With mergePoints the offsets are kept so the circles of every multipoint
+    are written as one multipart polygon (see multipointCircleColumns). When buffSize is the name of a field
+    the buffer is handed to fieldCircleBuffer so every multipoint's points get that multipoint's size. The
+    carryFields are read in the same pass as the multipoints and every circle (or merged polygon) gets the
+    values of its multipoint (see multipointAttributes).
     '''
     # Try the following buffer methods
     try:
+        # A field name means every multipoint has its own buffer size
+        if(isinstance(buffSize,str)):
+            return fieldCircleBuffer(returnDir,inputFile,outputName,buffSize,buffUnit,pointsForBuff,
+                                     maxDeviation,chunkSize,geodesic,mergePoints,carryFields)
         # Convert the inputted units to the inputFiles units
-        newBuffSize = unitConversion(inputFile,buffSize,buffUnit)
+        newBuffSize = unitConversion(inputFile,buffSize,buffUnit,geodesic)
         # If not valid input unit, then just proceed to make the buffer in the inputFile's units
         # with the original size
         if(newBuffSize == "Sorry that unit type is unsupported at this time!"):
             print("That unit type is not supported. Creating buffer of inputted size in input files unit type")
             newBuffSize = buffSize
+        # Decide how many points make up each buffer circle, either fixed or from the maxDeviation
+        pointsForBuff = arcPointCount(inputFile,newBuffSize,buffUnit,pointsForBuff,maxDeviation,geodesic)
         # Get the inputFile's coordinate system
-        inputCoordinateSystem = arcpy.Describe(inputFile).spatialReference
+        inputCoordinateSystem = featureio.describe(inputFile)['spatialReference']
         
         # Delete output files if they exist
         if (os.path.exists(os.path.join(returnDir,outputName))):
             arcpy.management.Delete(os.path.join(returnDir,outputName))
-        # Create the output shape file
-        arcpy.CreateFeatureclass_management(returnDir, outputName,'POLYGON',spatial_reference=inputCoordinateSystem)
         
-        # Open an insert cursor on the intermediate shape file
-        with arcpy.da.InsertCursor(os.path.join(returnDir,outputName), ['SHAPE@']) as iCursor:
-            # Open a search cursor on the input shape file
-            with arcpy.da.SearchCursor(inputFile,['SHAPE@']) as SearchCursor:
-                for row in SearchCursor:
-                    if(row[0]!=None):
-                        # Get the points from the multipoint feature by accessing the geometry
-                        # and getting part
-                        lstOfPoints = row[0].getPart()
-                        # Loop through the points
-                        for point in lstOfPoints:
-                            # Make an empty list to store the buffer points
-                            circleCoordPoints = []
-                            # Make a circle buffer around each point using methods described in
-                            # point buffer
-                            for angle in np.linspace(0,360,87,endpoint=False):
-                                newX = newBuffSize*math.cos(math.radians(angle))+point.X
-                                newY = newBuffSize*math.sin(math.radians(angle))+point.Y
-                                circleCoordPoints.append(arcpy.Point(newX,newY))
-                            circlePointArray = arcpy.Array(circleCoordPoints)
-                            bufferPolygon = arcpy.Polygon(circlePointArray)
-                            iCursor.insertRow([bufferPolygon])
+        # Read the multipoints a chunk at a time, along with the fields that are carried over, and flatten
+        # every point of every multipoint in the chunk into one (n, 2) array of centers plus the offsets of
+        # each multipoint's points
+        centerChunks = (featureio.decodeShapes(shapes,geometry.multipointColumns)+(columns,)
+                        for shapes, columns in featureio.readFieldChunks(inputFile,'SHAPE@WKB',carryFields or [],chunkSize))
+        # Make a circle buffer around each point using methods described in point buffer and write
+        # each chunk of circles in bulk with the attributes of the multipoint every circle came from
+        circleFunction = geometry.geodesicCircleBlock if geodesic else geometry.circleBlock
+        columnChunks = (multipointCircleColumns(circleFunction(centerCoords,newBuffSize,pointsForBuff)[:,::-1],
+                                                featureOffsets,mergePoints)
+                        +(multipointAttributes(columns,featureOffsets,mergePoints),)
+                        for centerCoords, featureOffsets, columns in centerChunks if len(centerCoords)>0)
+        # Geodesic circles that cross the antimeridian are cut along it
+        if(geodesic):
+            columnChunks = featureio.wrapChunks(columnChunks)
+        featureio.writeColumns(os.path.join(returnDir,outputName),'POLYGON',columnChunks,
+                               inputCoordinateSystem,featureio.outputFields(inputFile,carryFields))
         # If this all happens return a success message
-        return "The buffer was successful!"
+        return successMessage(pointsForBuff)
     # If an error occured, the buffer was unsuccessful
     except:
         return "The buffer was unsuccessful. Sorry!"
 
-def bufferMain(returnDir,inputFile, outputName, buffSize, buffUnit):
+def multiRingBuffer(returnDir,inputFile, outputName, buffSizes, buffUnit, pointsForBuff = 87,
+                    maxDeviation = None, donuts = False, workers = 1,
+                    chunkSize = featureio.DEFAULT_CHUNK_SIZE, geodesic = False):
+    '''
+    Parameters
+    ----------
+    returnDir : This should be a string representing a file path.
+        This should be a string representing a file path to the directory/folder you wish to save
+        your created buffer file to.
+    inputFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to a valid shape file.
+    outputName : This should be a string representing a file name and extension.
+        This should be a string representing a file name and extension. This will be 
+        the name of the outputted buffer shape file.
+    buffSizes : This should be a list of numbers.
+        This should be a list of numbers representing every buffer distance you want, like [100,250,500,1000].
+    buffUnit: This should be a string,
+        This should be a string representing the unit associated with the desired buffered sizes.
+        Restricted to the units available in the unit conversion function.
+    pointsForBuff : This should be an interger., optional
+        This should be an integer representing how many points you want the buffer circles
+        to be composed of. The default value is 87.
+    maxDeviation : This should be a number, optional
+        This should be a number representing the largest distance, in buffUnit, you will allow between the
+        true buffer circle and the straight edges it is made of. When given, the number of points is picked
+        for every distance on its own (see arcPointCount). The default is None.
+    donuts : This should be a boolean, optional
+        This should be True to take the next smaller buffer out of every buffer so the rings do not overlap.
+        The default is False.
+    workers : This should be an integer, optional
+        This should be an integer representing how many processes the buffering of lines and polygons and the
+        native dissolve can use. The default is 1.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing how many features are read and buffered at a time.
+        The default is featureio.DEFAULT_CHUNK_SIZE.
+    geodesic : This should be a boolean, optional
+        This should be True to measure the buffers in meters along the Earth for a layer in latitude and
+        longitude. The default is False.
+
+    Returns
+    -------
+    str
+        This function returns a string representing a success or failure message. A successful
+        message also reports how many points the largest buffer circle was made of.
+
+    Description
+    -----------
+    The multiRingBuffer function makes buffers of several distances around the same features in one run,
+    rather than running bufferMain once per distance and reading the input and building geometry from scratch
+    every time. The input is read once, chunkSize features at a time. Without donuts points (and the points
+    of multipoints) get all of their circles, one distance after another, from the same cached unit circle
+    table, so one circle per point per distance is written like PointsBuffer does. Lines and polygons are
+    buffered at every distance a chunk at a time (see bufferRuns, which uses workers processes) and the
+    buffers of each distance are dissolved together with dissolve.dissolvePieces, which gives one polygon per
+    distance like lineBuffer and polygonBuffer do. The dissolve is done chunk by chunk and only the merged
+    polygons of every chunk are kept until the chunks are merged at the end. Every output polygon gets a
+    distance field holding its distance in buffUnit. With donuts the circles of points are dissolved across
+    points the same way and the next smaller buffer is taken out of every buffer with
+    geometry.ringsDifference, so for every geometry type the rings of different distances sit next to each
+    other instead of on top of each other and the buffers of neighbouring features do not overlap.
+    '''
+    # Try the following buffer methods
+    try:
+        workers = max(int(workers),1)
+        # Work from the smallest distance to the biggest so every ring knows the one inside it
+        buffSizes = sorted(set(buffSizes))
+        newBuffSizes = []
+        for buffSize in buffSizes:
+            # Convert the inputted units to the inputFiles units (or meters for a geodesic buffer)
+            newBuffSize = unitConversion(inputFile,buffSize,buffUnit,geodesic)
+            if(newBuffSize == "Sorry that unit type is unsupported at this time!"):
+                print("That unit type is not supported. Creating buffer of inputted size in input files unit type")
+                newBuffSize = buffSize
+            newBuffSizes.append(newBuffSize)
+        # Decide how many points make up each distance's buffer circle
+        ringPoints = [arcPointCount(inputFile,newBuffSize,buffUnit,pointsForBuff,maxDeviation,
+                                    geodesic) for newBuffSize in newBuffSizes]
+        geoType = featureio.describe(inputFile)['shapeType']
+        inputCoordinateSystem = featureio.describe(inputFile)['spatialReference']
+        # Delete the output file if it exists
+        if (os.path.exists(os.path.join(returnDir,outputName))):
+            arcpy.management.Delete(os.path.join(returnDir,outputName))
+        fields = featureio.DEFAULT_FIELDS+[('distance','N',19,6)]
+        if(geoType=="POINT" or geoType=="MULTIPOINT"):
+            # Read the centers a chunk at a time, every point of a multipoint is its own center
+            if(geoType=="POINT"):
+                centerChunks = featureio.readPointChunks(inputFile,chunkSize)
+            else:
+                centerChunks = (geometry.multipointColumns([row[0] for row in rows if row[0]!=None])[0]
+                                for rows in featureio.readChunks(inputFile,['SHAPE@WKB'],chunkSize))
+            circleFunction = geometry.geodesicCircleBlock if geodesic else geometry.circleBlock
+        if((geoType=="POINT" or geoType=="MULTIPOINT") and not donuts):
+            def columnChunks():
+                for centerCoords in centerChunks:
+                    if(len(centerCoords)==0):
+                        continue
+                    for buffSize, newBuffSize, points in zip(buffSizes,newBuffSizes,ringPoints):
+                        # Circles come out counterclockwise so they are turned around to be outer rings
+                        circles = circleFunction(centerCoords,newBuffSize,points)
+                        coords, partOffsets, featureOffsets = featureio.blockToColumns(circles[:,::-1])
+                        yield coords, partOffsets, featureOffsets, {'distance':np.full(len(centerCoords),buffSize)}
+            # Geodesic circles that cross the antimeridian are cut along it
+            chunks = featureio.wrapChunks(columnChunks()) if geodesic else columnChunks()
+            featureio.writeColumns(os.path.join(returnDir,outputName),'POLYGON',chunks,inputCoordinateSystem,fields)
+        elif(geoType in ("POINT","MULTIPOINT","POLYLINE","POLYGON")):
+            # The buffers of every distance are dissolved a chunk at a time so only the merged polygons of the
+            # chunks read so far are held, never every buffer of every feature
+            merged = [[] for buffSize in buffSizes]
+            executor = None
+            if(workers>1 and geoType in ("POLYLINE","POLYGON")):
+                executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+            try:
+                if(geoType in ("POLYLINE","POLYGON")):
+                    featureChunks = (featureio.decodeShapes(shapes,shapeParts)
+                                     for shapes, columns in featureio.readFieldChunks(inputFile,'SHAPE@WKB',[],chunkSize))
+                else:
+                    featureChunks = centerChunks
+                for features in featureChunks:
+                    if(len(features)==0):
+                        continue
+                    for index in range(len(buffSizes)):
+                        if(geoType in ("POLYLINE","POLYGON")):
+                            # Buffer the chunk at this distance, in workers processes when asked
+                            pieces = bufferRuns(features,np.full(len(features),newBuffSizes[index]),
+                                                np.full(len(features),ringPoints[index]),geoType,geodesic,
+                                                None,workers,executor)[0]
+                        else:
+                            circles = circleFunction(features,newBuffSizes[index],ringPoints[index])[:,::-1]
+                            pieces = [[circle] for circle in circles]
+                            if(geodesic):
+                                # Circles that cross the antimeridian are cut along it before they are merged
+                                for crossing in np.flatnonzero(np.abs(circles[:,:,0]).max(axis=1)>180).tolist():
+                                    pieces[crossing] = geometry.wrapRings(pieces[crossing])
+                        merged[index].extend(geometry.ringPolygons(dissolve.dissolvePieces(pieces,workers)))
+            finally:
+                if(executor is not None):
+                    executor.shutdown()
+            # Merge the chunks of every distance and take the smaller one out for donuts
+            dissolved = [dissolve.dissolvePieces(polygons,workers) for polygons in merged]
+            if(donuts):
+                dissolved = [dissolved[0]]+[geometry.ringsDifference(dissolved[index],dissolved[index-1])
+                                            for index in range(1,len(dissolved))]
+            keep = [index for index in range(len(dissolved)) if len(dissolved[index])>0]
+            coords, partOffsets, featureOffsets = featureio.ringsToColumns([dissolved[index] for index in keep])
+            distances = {'distance':np.array([buffSizes[index] for index in keep],dtype=np.float64)}
+            featureio.writeColumns(os.path.join(returnDir,outputName),'POLYGON',
+                                   [(coords,partOffsets,featureOffsets,distances)],inputCoordinateSystem,
+                                   fields)
+        else:
+            return "Sorry that geometry type is not recognized and thus cannot be buffered!"
+        return successMessage(max(ringPoints))
+    # If an error occured, the buffer was unsuccessful.
+    except:
+        return "The buffer was unsuccessful. Sorry!"
+
+def bufferMain(returnDir,inputFile, outputName, buffSize, buffUnit, pointsForBuff = 87, maxDeviation = None,
+               dissolveWith = "native", workers = 1, chunkSize = featureio.DEFAULT_CHUNK_SIZE,
+               geodesic = None, donuts = False, mergePoints = False, carryFields = None, tileSize = None,
+               simplifyInput = None, simplifyOutput = None, useCache = False):
     '''
     Parameters
     ----------
@@ -530,45 +1850,134 @@ def bufferMain(returnDir,inputFile, outputName, buffSize, buffUnit):
     outputName : This should be a string representing a file name and extension.
         This should be a string representing a file name and extension. This will be 
         the name of the outputted buffer shape file.
-    buffSize : This should be a float.
-        This should be a float representing how big you want the buffer to be.
+    buffSize : This should be a float, a list of floats or a string.
+        This should be a float representing how big you want the buffer to be, a list of them to make
+        several buffers in one run (see multiRingBuffer) or the name of a numeric field holding how big
+        every feature's buffer should be.
     buffUnit: This should be a string,
         This should be a string representing the unit associated with the desired buffered size.
         Restricted to the units available in the unit conversion function.
+    pointsForBuff : This should be an interger., optional
+        This should be an integer representing how many points you want the buffer circles to be composed of.
+        The default value is 87 since this is around the number of points Arc uses to make their buffers.
+    maxDeviation : This should be a number, optional
+        This should be a number representing the largest distance, in buffUnit, you will allow between the
+        true buffer circle and the straight edges it is made of. When given, the number of points is picked
+        from this instead of pointsForBuff (see arcPointCount). The default is None.
+    dissolveWith : This should be a string, optional
+        This should be "native" to merge the buffers of different features with the dissolve.py engine or
+        "arcpy" to use arcpy's PairwiseDissolve on an intermediate feature class. The default is "native".
+    workers : This should be an integer, optional
+        This should be an integer representing how many processes the buffering and the native dissolve can
+        use. The default is 1.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing how many features are read, buffered and written at a time.
+        The default is featureio.DEFAULT_CHUNK_SIZE.
+    geodesic : This should be a boolean or None, optional
+        This should be True or False to turn geodesic buffering on or off. The default of None turns it on
+        when the inputFile's coordinate system is geographic (see isGeographic).
+    donuts : This should be a boolean, optional
+        This should be True to make the rings of a multiple distance buffer not overlap. The default is False.
+    mergePoints : This should be a boolean, optional
+        This should be True to buffer every multipoint into one multipart polygon instead of one polygon per
+        point. The default is False.
+    carryFields : This should be a list of strings, optional
+        This should be a list of the inputFile's fields to copy onto the buffers. Lines and polygons are then
+        buffered one feature at a time without a dissolve. The default of None carries no fields.
+    tileSize : This should be a number, optional
+        This should be a number representing the width of the tiles, in the inputFile's units, that lines and
+        polygons are buffered and dissolved in one at a time (see tiledBufferToOutput). Giving one changes the
+        shape of the output: it holds one polygon per tile and connected area of the dissolved buffers, split
+        along the tile lines, instead of one multipart polygon. The default is None.
+    simplifyInput : This should be a number, optional
+        This should be a number representing the tolerance, in buffUnit, lines and polygons are simplified
+        with before they are buffered. The default of None does not simplify them.
+    simplifyOutput : This should be a number, optional
+        This should be a number representing the tolerance, in buffUnit, the buffers of lines and polygons
+        are simplified with before they are written. The default of None does not simplify them.
+    useCache : This should be a boolean, optional
+        This should be True to hand back the output of the same run made before from the cache (see cache.py)
+        instead of making the buffer again. The default is False which always makes the buffer.
     
     Returns
     -------
     str
-        This function returns a string representing a success or failure message.
+        This function returns a string representing a success or failure message. A successful
+        message also reports how many points each buffer circle was made of.
         
     Description
     -----------
-    The bufferMain function is the driver function for the GUI that runs buffer requests. It
-    detects the inputFile geometry and then calls the appropiate buffer function for the matching
-    geometry. For example, if the inputted geometry is a POLYGON, this function will call the 
-    polygonBuffer function. This function will return a success or failure message depending
-    on the subsequent buffer call. If the geometry type that was inputted does not match
-    POINT, POLYLINE, POLYGON, or MULTIPOINT then it will send back a message saying that it does not
-    recognize the geometry type.
-    '''
-    # Detect geometry type using ArcPy describe
-    geoType = arcpy.Describe(inputFile).shapeType.upper()
+    The bufferMain function is the driver function for the GUI that runs buffer requests. It detects the
+    inputFile geometry and then calls the appropiate buffer function for the matching geometry. For example,
+    if the inputted geometry is a POLYGON, this function will call the polygonBuffer function. This function
+    will return a success or failure message depending on the subsequent buffer call. If the geometry type
+    that was inputted does not match POINT, POLYLINE, POLYGON, or MULTIPOINT then it will send back a message
+    saying that it does not recognize the geometry type. Layers in latitude and longitude are buffered
+    geodesically unless geodesic is set to False: the buffer size is taken in meters, points and multipoints
+    get true geodesic circles from geometry.geodesicCircleBlock, and lines and polygons are buffered in meters
+    in local frames from geometry.localMetricFrame (see bufferParts). Buffers that cross the antimeridian are
+    cut along it. When buffSize is a list of distances every distance is made in one pass by multiRingBuffer
+    instead. When buffSize is the name of a field every feature is buffered by the size in that field, read in
+    the same pass as the shapes. The carryFields are read in that same pass too and written with the buffers,
+    so no spatial join is needed afterwards. Multiple ring buffers only get their distance field since their
+    rings are dissolved across features, and a failure message naming the options they do not support
+    (carryFields, mergePoints, tileSize, simplifyInput, simplifyOutput and dissolveWith="arcpy") is returned
+    when any of them is given. Only line and polygon buffers are simplified, as the number of points of a
+    circle is already set by pointsForBuff or maxDeviation. With useCache a shapefile output is looked up in
+    the result cache first with cache.cachedRun, keyed by the contents of the inputFile and every other
+    parameter that changes the output (not workers or chunkSize), so running the same buffer again just copies
+    the output made last time into returnDir.
+    '''
+    # Hand back the output of the same run from the cache when there is one
+    if(useCache):
+        args = (returnDir,inputFile,outputName,buffSize,buffUnit,pointsForBuff,maxDeviation,dissolveWith,
+                workers,chunkSize,geodesic,donuts,mergePoints,carryFields,tileSize,simplifyInput,
+                simplifyOutput,False)
+        # workers and chunkSize only change how the buffer is made, not what comes out, so they are not part
+        # of the key
+        parameters = (buffSize,buffUnit,pointsForBuff,maxDeviation,dissolveWith,geodesic,donuts,mergePoints,
+                      carryFields,tileSize,simplifyInput,simplifyOutput)
+        return cache.cachedRun(bufferMain,args,[inputFile],parameters,os.path.join(returnDir,outputName),
+                               "The buffer was successful!")
+    # Detect geometry type using the cached ArcPy describe
+    geoType = featureio.describe(inputFile)['shapeType']
+    # Buffer geodesically when the layer is in latitude and longitude unless told otherwise
+    if(geodesic == None):
+        geodesic = isGeographic(inputFile)
+    # Several distances are all made in one pass
+    if(isinstance(buffSize,(list,tuple,np.ndarray))):
+        # Name the options a multiple ring buffer cannot make rather than leaving them out without a word
+        options = (('carryFields',carryFields),('mergePoints',mergePoints),('tileSize',tileSize is not None),
+                   ('simplifyInput',simplifyInput is not None),('simplifyOutput',simplifyOutput is not None),
+                   ('dissolveWith',dissolveWith!="native"))
+        unsupported = [name for name, given in options if given]
+        if(len(unsupported)>0):
+            return "Sorry multiple ring buffers do not support "+", ".join(unsupported)+" at this time!"
+        return multiRingBuffer(returnDir,inputFile,outputName,buffSize,buffUnit,pointsForBuff,maxDeviation,
+                               donuts,workers,chunkSize,geodesic)
     # Check if it is of a certain Geometry type. If it is call that matching geometries
     # specific buffer function
     if(geoType=="POINT"):
-        return PointsBuffer(returnDir,inputFile,outputName,buffSize,buffUnit)
+        return PointsBuffer(returnDir,inputFile,outputName,buffSize,buffUnit,pointsForBuff,maxDeviation,
+                            chunkSize=chunkSize,geodesic=geodesic,carryFields=carryFields)
     elif(geoType=="POLYLINE"):
-        return lineBuffer(returnDir,inputFile,outputName,buffSize,buffUnit)
+        return lineBuffer(returnDir,inputFile,outputName,buffSize,buffUnit,pointsForBuff,maxDeviation,
+                          dissolveWith,workers,chunkSize,geodesic,carryFields,tileSize,simplifyInput,
+                          simplifyOutput)
     elif(geoType=="POLYGON"):
-        return polygonBuffer(returnDir,inputFile,outputName,buffSize,buffUnit)
+        return polygonBuffer(returnDir,inputFile,outputName,buffSize,buffUnit,pointsForBuff,maxDeviation,
+                             dissolveWith,workers,chunkSize,geodesic,carryFields,tileSize,simplifyInput,
+                             simplifyOutput)
     elif(geoType=="MULTIPOINT"):
-        return multiPointBuffer(returnDir,inputFile,outputName,buffSize,buffUnit)
+        return multiPointBuffer(returnDir,inputFile,outputName,buffSize,buffUnit,pointsForBuff,maxDeviation,
+                                chunkSize=chunkSize,geodesic=geodesic,mergePoints=mergePoints,
+                                carryFields=carryFields)
     # If it did not match any of the above geometries, return a failure message about not recognizing
     # geometry type.
     else:
         return "Sorry that geometry type is not recognized and thus cannot be buffered!"
 
-def batchBuffer(returnDirs,inputFiles, outputNames, buffSizes, buffUnits):
+def batchBuffer(returnDirs,inputFiles, outputNames, buffSizes, buffUnits, workers = 1, report = False):
     '''
     Parameters
     ----------
@@ -585,10 +1994,16 @@ def batchBuffer(returnDirs,inputFiles, outputNames, buffSizes, buffUnits):
     buffUnits : This should be a list of strings,
         This should be a list of strings representing the unit associated with the desired buffered size for the series.
         Restricted to the units available in the unit conversion function.
+    workers : This should be an integer, optional
+        This should be an integer representing how many buffers run at the same time, each in its own process.
+        The default is 1.
+    report : This should be a boolean, optional
+        This should be True to get back the report of every buffer instead of just S or F. The default is False.
 
     Returns
     -------
-    A list of strings where each entry in the list represents whether the buffer at that index failed or succeeded
+    A list of strings where each entry in the list represents whether the buffer at that index failed or succeeded,
+    or a list of dictionaries holding the report of every buffer when report is True (see batch.runJobs)
     
     Description
     -----------
@@ -598,22 +2013,25 @@ def batchBuffer(returnDirs,inputFiles, outputNames, buffSizes, buffUnits):
     index 0 in the inputFiles list will have a buffer ran on it of the size and unit at index 0 in buffSizes and buffUnits and will
     be outputted to the file location made from index 0 of the returnDirs and outputNames. This will return a list of status's
     where S represents a successful buffer and F represents a failed buffer. Ultimately the logic of this function is to call
-    the bufferMain function on each list entry.
+    the bufferMain function on each list entry. The buffers are run by batch.runJobs, which spreads them over
+    workers processes and times every one of them, so a buffer that fails only fails its own entry. Every
+    report holds the status, bufferMain's message, the error, the elapsed seconds and how many features went
+    in and came out. The entries that share an inputFile are planned into one group by batch.planGroups and
+    run one after another in the same process, where the input is read and decoded by the first buffer and
+    handed to the others from memory (see featureio.shareReads). Their reports say which group they ran in
+    and how many of their reads came from the file or from memory, so the first buffer of a group carries the
+    reading time and the ones after it do not.
     '''
     # Check to make sure the input lists are all of same size. If they aren't return an error message
     if(len(returnDirs)!=len(inputFiles) or len(inputFiles)!=len(outputNames) or len(outputNames)!=len(buffSizes) or len(buffSizes)!=len(buffUnits)):
         return "Please input lists of all the same size!"
     else:
-        # If they are the same size create an empty return list
-        returnList = []
-        # Loop through the lists
-        for index in range(len(returnDirs)):
-            # Store in x the return message from running a buffer at each index
-            x = bufferMain(returnDirs[index],inputFiles[index],outputNames[index],buffSizes[index],buffUnits[index])
-            # If the return message was a success append a S, otherwise a F
-            if(x == "The buffer was successful!"):
-                returnList.append("S")
-            else:
-                returnList.append("F")
-        # Return the list of return messages
-        return returnList
\ No newline at end of file
+        # Make a bufferMain job for every index of the lists
+        jobs = [(bufferMain,(returnDirs[index],inputFiles[index],outputNames[index],buffSizes[index],buffUnits[index]),
+                 inputFiles[index],os.path.join(returnDirs[index],outputNames[index]),"The buffer was successful!")
+                for index in range(len(returnDirs))]
+        # Group the buffers of the same inputFile so it is read and decoded once for all of them
+        groups = batch.planGroups([os.path.normcase(os.path.abspath(inputFile)) for inputFile in inputFiles],workers)
+        # Run the buffers and return their reports, or a S for every success and a F for every failure
+        reports = batch.runJobs(jobs,workers,groups)
+        return reports if report else batch.statusList(reports)
\ No newline at end of file
@@ -0,0 +1,316 @@
+"""
+Author: Caleb Cordsen
+Date: 10/17/2026
+
+Description: This file contains the functions that keep a cache of buffer and clip results! A run is looked up
+by a hash of the contents of its input datasets, every parameter it was given and the code of the tools, so
+running the same buffer or clip on the same data again hands back a copy of the output made last time instead
+of making it all over again. The cache is kept under a size limit by throwing out the results used longest ago.
+"""
+# Import necessary things
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import featureio
+
+# The folder the cached results are kept in
+CACHE_DIR = os.path.join(os.path.expanduser("~"),".geoprocessing_cache")
+# The most bytes the cached results can take up before the ones used longest ago are thrown out
+CACHE_MAX_BYTES = 2*1024*1024*1024
+# True to hand back cached outputs as hard links (no copying, but the output then shares its files with the
+# cache so it should not be edited in place) instead of copies
+LINK_OUTPUTS = False
+# The extensions of the files with the code of the tools
+CODE_FILES = ['buffer.py','clip.py','geometry.py','dissolve.py','featureio.py']
+# How many bytes of a file are hashed at a time
+HASH_BLOCK_BYTES = 1024*1024
+
+def hashFile(digest, path):
+    '''
+    Parameters
+    ----------
+    digest : This should be a hashlib hash.
+        This should be the hash the bytes of the file are added to.
+    path : This should be a string representing a file path.
+        This should be a string representing a file path to the file to hash.
+
+    Returns
+    -------
+    None.
+    '''
+    with open(path,'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_BYTES),b''):
+            digest.update(block)
+
+def datasetHash(path):
+    '''
+    Parameters
+    ----------
+    path : This should be a string representing a file path.
+        This should be a string representing a file path that points to a dataset.
+
+    Returns
+    -------
+    str
+        A hash of what is in the dataset.
+
+    Description
+    -----------
+    The datasetHash function hashes the bytes of every file of a shapefile (its shapes, index, attributes,
+    projection and code page), so two copies of the same shapefile in different places give the same hash
+    and changing any of them gives a new one. Datasets that are not files of their own (like a feature class
+    in a file geodatabase) are hashed from their rows instead: the well-known binary of every shape and the
+    values of every field, read chunk by chunk with featureio.readChunks, along with the spatial reference.
+    '''
+    digest = hashlib.blake2b(digest_size=20)
+    if(path.lower().endswith('.shp') and os.path.isfile(path)):
+        for file in featureio.shapefileFiles(path):
+            digest.update(os.path.splitext(file)[1].lower().encode())
+            hashFile(digest,file)
+        return digest.hexdigest()
+    description = featureio.describe(path)
+    names = [field[0] for field in description['fields'] if field[1]!='Geometry']
+    spatialReference = featureio.projectionText(description['spatialReference'])
+    digest.update(repr((description['shapeType'],spatialReference,names)).encode())
+    for rows in featureio.readChunks(path,['SHAPE@WKB']+names):
+        for row in rows:
+            digest.update(bytes(row[0]) if row[0] is not None else b'')
+            digest.update(repr(row[1:]).encode())
+    return digest.hexdigest()
+
+def codeHash():
+    '''
+    Returns
+    -------
+    str
+        A hash of the code of the tools (see CODE_FILES), so a change to the tools does not hand back results
+        made by the old code.
+    '''
+    digest = hashlib.blake2b(digest_size=20)
+    folder = os.path.dirname(os.path.abspath(__file__))
+    for name in CODE_FILES:
+        path = os.path.join(folder,name)
+        if(os.path.isfile(path)):
+            digest.update(name.encode())
+            hashFile(digest,path)
+    return digest.hexdigest()
+
+def runKey(tool, datasets, parameters):
+    '''
+    Parameters
+    ----------
+    tool : This should be a string.
+        This should be the name of the tool being run, like buffer.bufferMain.
+    datasets : This should be a list of strings.
+        This should be the file paths of the datasets the tool reads, like the input and clip files.
+    parameters : This should be a tuple.
+        This should hold every other parameter the tool is given (not where the output goes).
+
+    Returns
+    -------
+    str
+        The key of the run in the cache.
+    '''
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(tool.encode())
+    digest.update(codeHash().encode())
+    for dataset in datasets:
+        digest.update(datasetHash(dataset).encode())
+    digest.update(repr(parameters).encode())
+    return digest.hexdigest()
+
+def entrySize(entry):
+    '''
+    Parameters
+    ----------
+    entry : This should be a string representing a file path.
+        This should be the folder of one cached result.
+
+    Returns
+    -------
+    int
+        How many bytes the files of the entry take up.
+    '''
+    return sum(os.path.getsize(os.path.join(entry,name)) for name in os.listdir(entry))
+
+def evict(cacheDir, maxBytes):
+    '''
+    Parameters
+    ----------
+    cacheDir : This should be a string representing a file path.
+        This should be the folder the cached results are kept in.
+    maxBytes : This should be an integer.
+        This should be the most bytes the cached results can take up.
+
+    Returns
+    -------
+    int
+        How many cached results were thrown out.
+
+    Description
+    -----------
+    The evict function throws out the cached results used longest ago (the ones whose entry.json was touched
+    longest ago, see lookup) until the rest fit in maxBytes.
+    '''
+    entries = []
+    for entry in glob.glob(os.path.join(cacheDir,"entries","*")):
+        try:
+            entries.append((os.path.getmtime(os.path.join(entry,"entry.json")),entrySize(entry),entry))
+        except OSError:
+            continue
+    entries.sort()
+    total = sum(size for used, size, entry in entries)
+    removed = 0
+    for used, size, entry in entries:
+        if(total<=maxBytes):
+            break
+        shutil.rmtree(entry,ignore_errors=True)
+        total -= size
+        removed += 1
+    return removed
+
+def lookup(key, outputFile, cacheDir = None):
+    '''
+    Parameters
+    ----------
+    key : This should be a string.
+        This should be the key of the run (see runKey).
+    outputFile : This should be a string representing a file path.
+        This should be a string representing the path of the .shp file the cached output is handed back as.
+    cacheDir : This should be a string representing a file path, optional
+        This should be the folder the cached results are kept in. The default of None uses CACHE_DIR.
+
+    Returns
+    -------
+    str or None
+        The message the tool gave back when the result was made, or None when it is not in the cache.
+
+    Description
+    -----------
+    The lookup function puts the cached files in place of the output (copies, or hard links with LINK_OUTPUTS)
+    under the output's own name and marks the result as just used so evict keeps it the longest.
+    '''
+    entry = os.path.join(cacheDir or CACHE_DIR,"entries",key)
+    try:
+        with open(os.path.join(entry,"entry.json")) as file:
+            metadata = json.load(file)
+    except (OSError,ValueError):
+        return None
+    stem = os.path.splitext(outputFile)[0]
+    for file in featureio.shapefileFiles(outputFile):
+        os.remove(file)
+    for extension in metadata['extensions']:
+        source = os.path.join(entry,"output"+extension)
+        if(LINK_OUTPUTS):
+            try:
+                os.link(source,stem+extension)
+                continue
+            except OSError:
+                pass
+        shutil.copyfile(source,stem+extension)
+    os.utime(os.path.join(entry,"entry.json"))
+    return metadata['message']
+
+def store(key, outputFile, message, cacheDir = None, maxBytes = None):
+    '''
+    Parameters
+    ----------
+    key : This should be a string.
+        This should be the key of the run (see runKey).
+    outputFile : This should be a string representing a file path.
+        This should be a string representing the path of the .shp file the tool made.
+    message : This should be a string.
+        This should be the message the tool gave back.
+    cacheDir : This should be a string representing a file path, optional
+        This should be the folder the cached results are kept in. The default of None uses CACHE_DIR.
+    maxBytes : This should be an integer, optional
+        This should be the most bytes the cached results can take up. The default of None uses CACHE_MAX_BYTES.
+
+    Returns
+    -------
+    bool
+        True if the output was put in the cache.
+
+    Description
+    -----------
+    The store function copies the files of the output into a scratch folder inside the cache and then renames
+    the folder to the run's key, so a result is either all there or not there at all even if two runs store
+    the same key at the same time. Outputs bigger than maxBytes are not kept. Afterwards evict makes room.
+    '''
+    cacheDir = cacheDir or CACHE_DIR
+    maxBytes = CACHE_MAX_BYTES if maxBytes is None else maxBytes
+    files = featureio.shapefileFiles(outputFile)
+    if(len(files)==0 or sum(os.path.getsize(file) for file in files)>maxBytes):
+        return False
+    os.makedirs(os.path.join(cacheDir,"entries"),exist_ok=True)
+    scratch = tempfile.mkdtemp(prefix="store_",dir=cacheDir)
+    try:
+        extensions = [os.path.splitext(file)[1].lower() for file in files]
+        for file, extension in zip(files,extensions):
+            shutil.copyfile(file,os.path.join(scratch,"output"+extension))
+        with open(os.path.join(scratch,"entry.json"),'w') as file:
+            json.dump({'message':message,'extensions':extensions,'created':time.time()},file)
+        try:
+            os.rename(scratch,os.path.join(cacheDir,"entries",key))
+        except OSError:
+            # Another run stored the same result first
+            return False
+    finally:
+        shutil.rmtree(scratch,ignore_errors=True)
+    evict(cacheDir,maxBytes)
+    return True
+
+def cachedRun(function, args, datasets, parameters, outputFile, successMessage, cacheDir = None, maxBytes = None):
+    '''
+    Parameters
+    ----------
+    function : This should be a function.
+        This should be the tool to run, like buffer.bufferMain, called with useCache turned off in args.
+    args : This should be a tuple.
+        This should be the arguments the tool is called with.
+    datasets : This should be a list of strings.
+        This should be the file paths of the datasets the tool reads.
+    parameters : This should be a tuple.
+        This should hold every parameter of the run other than where the output goes.
+    outputFile : This should be a string representing a file path.
+        This should be a string representing the path of the output the tool makes.
+    successMessage : This should be a string.
+        This should be how the tool's message starts when it worked. Only results that worked are cached.
+    cacheDir : This should be a string representing a file path, optional
+        This should be the folder the cached results are kept in. The default of None uses CACHE_DIR.
+    maxBytes : This should be an integer, optional
+        This should be the most bytes the cached results can take up. The default of None uses CACHE_MAX_BYTES.
+
+    Returns
+    -------
+    str
+        The tool's message, from the cache when the same run was made before.
+
+    Description
+    -----------
+    The cachedRun function works out the key of the run with runKey and hands back the cached output when
+    there is one (see lookup). Otherwise it runs the tool and stores the output (see store). Only shapefile
+    outputs can be cached since they are plain files, so other outputs always just run the tool. Anything that
+    goes wrong with the cache itself (like a dataset that cannot be hashed or a full disk) falls back to just
+    running the tool, so the cache can never make a run fail.
+    '''
+    if(not outputFile.lower().endswith('.shp')):
+        return function(*args)
+    try:
+        key = runKey(function.__module__+"."+function.__name__,datasets,parameters)
+        message = lookup(key,outputFile,cacheDir)
+        if(message is not None):
+            return message
+    except Exception:
+        key = None
+    message = function(*args)
+    if(key is not None and isinstance(message,str) and message.startswith(successMessage)):
+        try:
+            store(key,outputFile,message,cacheDir,maxBytes)
+        except Exception:
+            pass
+    return message
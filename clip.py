@@ -7,11 +7,131 @@ Description: This file contains the functions that help make the clip function w
 # Import necessary things
 import arcpy
 from arcpy import env
+import collections
 import math
 import numpy as np
 import os
+import threading
+import featureio
+import geometry
+import batch
+import cache
 
-def clip(returnDir,outputName, inputFile, clipFile):
+# Clip polygons with at least this many edges are prepared with geometry.preparePolygons instead of having
+# every point tested against the edges of the polygons whose boxes hold it
+PREPARED_MIN_EDGES = 1024
+# How many prepared clip files are remembered before the one used longest ago is forgotten
+PREPARED_CACHE_SIZE = 8
+# The cached (stamp, polygons, prepared) of every clip file by (path, tolerance), oldest first, and the lock
+# that keeps threads from changing it at the same time
+preparedCache = collections.OrderedDict()
+preparedLock = threading.Lock()
+
+def pointTolerance(inputFile, tolerance = None):
+    '''
+    Parameters
+    ----------
+    inputFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to a valid shape file.
+    tolerance : This should be a number, optional
+        This should be the tolerance asked for. The default of None looks it up.
+
+    Returns
+    -------
+    float
+        The tolerance asked for, or else the XY tolerance of the inputFile's coordinate system, which is the
+        distance ArcGIS treats two points as equal within. 0 (only exactly equal points match) when the
+        coordinate system does not have one.
+    '''
+    if(tolerance is not None):
+        return float(tolerance)
+    value = getattr(featureio.describe(inputFile)['spatialReference'],'XYTolerance',None)
+    try:
+        return max(float(value),0.0)
+    except (TypeError,ValueError):
+        return 0.0
+
+def clipShapes(clipFile):
+    '''
+    Parameters
+    ----------
+    clipFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to a valid shape file.
+
+    Returns
+    -------
+    list
+        A list holding the parts of every clip feature that is not null (one array per line part or polygon
+        ring), read as well-known binary and split up with geometry.wkbParts.
+    '''
+    shapes = []
+    for rows in featureio.readChunks(clipFile,['SHAPE@WKB']):
+        for row in rows:
+            if(row[0]!=None):
+                shapes.append(geometry.wkbParts(row[0]))
+    return shapes
+
+def lineSegments(clipFile):
+    '''
+    Parameters
+    ----------
+    clipFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to a valid polyline shape file.
+
+    Returns
+    -------
+    tuple
+        A (starts, ends) tuple of (n, 2) arrays holding the first and last point of every segment of every part
+        of every line (see clipShapes).
+    '''
+    parts = [part for shape in clipShapes(clipFile) for part in shape]
+    starts = [part[:-1] for part in parts]+[np.zeros((0,2))]
+    ends = [part[1:] for part in parts]+[np.zeros((0,2))]
+    return np.concatenate(starts), np.concatenate(ends)
+
+def clipPolygons(clipFile, tolerance):
+    '''
+    Parameters
+    ----------
+    clipFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to a valid polygon shape file.
+    tolerance : This should be a number.
+        This should be how far outside a clip polygon a point can be and still be kept (see pointTolerance).
+
+    Returns
+    -------
+    tuple
+        A (polygons, prepared) tuple holding the rings of every clip polygon (see clipShapes) and, when they
+        have at least PREPARED_MIN_EDGES edges, the polygons prepared with geometry.preparePolygons (None when
+        there are fewer).
+
+    Description
+    -----------
+    The clipPolygons function reads and prepares the clip polygons once per clipFile and tolerance and keeps
+    them the same way featureio.describe keeps its answers: by path and the dataset's stamp (see
+    featureio.datasetStamp), so a clip file that changed is read again and one with no stamp is never kept,
+    with at most PREPARED_CACHE_SIZE clip files remembered. Every clip in the same process by the same clip
+    file (like the clips batchClip runs in one group) gets the prepared grid back without building it again.
+    '''
+    key = (os.path.normcase(os.path.abspath(clipFile)),float(tolerance))
+    stamp = featureio.datasetStamp(clipFile)
+    with preparedLock:
+        if(stamp is not None and key in preparedCache and preparedCache[key][0]==stamp):
+            preparedCache.move_to_end(key)
+            return preparedCache[key][1:]
+    polygons = clipShapes(clipFile)
+    edges = sum(len(ring) for polygon in polygons for ring in polygon)
+    prepared = geometry.preparePolygons(polygons,tolerance) if edges>=PREPARED_MIN_EDGES else None
+    if(stamp is None):
+        return polygons, prepared
+    with preparedLock:
+        preparedCache[key] = (stamp,polygons,prepared)
+        preparedCache.move_to_end(key)
+        while(len(preparedCache)>PREPARED_CACHE_SIZE):
+            preparedCache.popitem(last=False)
+    return polygons, prepared
+
+def clip(returnDir,outputName, inputFile, clipFile, carryFields = None, xyTolerance = None, useCache = False):
     '''
     Parameters
     ----------
@@ -27,7 +147,16 @@ def clip(returnDir,outputName, inputFile, clipFile):
     clipFile: This should be a string representing a file path.
         This should be a string representing a file path that points to a valid shape file that
         you wish to use as your clip feature for the clip.
-    
+    carryFields : This should be a list of strings, optional
+        This should be a list of the inputFile's fields to copy onto the output features. The default is None.
+    xyTolerance : This should be a number, optional
+        This should be a number representing how far apart, in the inputFile's units, two points can be and
+        still be the same point in a POINT and POINT clip, or how far from a line a point can be and still be
+        on it in a POINT and POLYLINE clip (or on the boundary of a polygon in a POINT and POLYGON clip). The
+        default of None uses the XY tolerance of the inputFile's coordinate system (see pointTolerance).
+    useCache : This should be a boolean, optional
+        This should be True to hand back the output of the same clip made before from the cache (see cache.py)
+        instead of making the clip again. The default is False which always makes the clip.
     
     Returns
     -------
@@ -41,13 +170,40 @@ def clip(returnDir,outputName, inputFile, clipFile):
     POINTPOINT clip, POINTLINE clip, POINTPOLYGON clip, LINELINE clip, LINEPOLYGON clip, and POLYGONPOLYGON clip. 
     Though they all require different implementations to be done, the underlying idea is the same: extract
     from the input feature the geometry that exists within the clip feature. This function will detect the inputted
-    geometry and then proceed from there.
+    geometry and then proceed from there. The carryFields are read a chunk at a time with
+    featureio.readFieldChunks in the same search cursor pass as the input geometry, and the index of the input
+    feature every output comes from is kept so the attributes are picked out as whole columns and written in
+    bulk next to the output geometry.
+    Points are matched to clip points with geometry.pointMatches, which snaps them to a grid of xyTolerance
+    sized cells and searches the sorted cells, instead of checking every input point against a list of every
+    clip point's geometry, and the input points are read and written a chunk at a time. Points are clipped by
+    lines the same way, except the clip lines are broken into segments once and every point is only measured
+    against the segments near it (see geometry.pointsOnSegments). Points are clipped by polygons with
+    geometry.pointsInPolygons, which only tests a point against the polygons whose boxes hold it and tests
+    whole blocks of points against the ring arrays at once with a ray crossing count. Clip polygons with many
+    edges (like one state boundary) are prepared once into a grid of inside, outside and boundary cells instead
+    (see clipPolygons and geometry.preparePolygons), so most points are kept or dropped by a single cell lookup
+    and only the points in boundary cells are tested against the few edges of their cell. Lines are clipped by
+    lines with geometry.segmentOverlaps, which pairs every input segment with the clip segments near it and
+    keeps the exact stretch of it that lies on one (within the xyTolerance), so a segment that only partly
+    follows a clip line keeps that part instead of being dropped. The stretches are joined back into one line
+    per input line with geometry.overlapLines.
+    With useCache a shapefile output is looked up in the result cache first (see cache.cachedRun), keyed by
+    the contents of the inputFile and clipFile and the other parameters, so clipping the same data again just
+    copies the output made last time into returnDir.
     '''
+    # Hand back the output of the same clip from the cache when there is one
+    if(useCache):
+        return cache.cachedRun(clip,(returnDir,outputName,inputFile,clipFile,carryFields,xyTolerance,False),
+                               [inputFile,clipFile],(carryFields,xyTolerance),
+                               os.path.join(returnDir,outputName),"The clip was successful!")
     try:
-        # Get the input coordinate system and the two geometry types
-        inputGeo = arcpy.Describe(inputFile).shapeType.upper()
-        clipGEO = arcpy.Describe(clipFile).shapeType.upper()
-        inputCoordinateSystem = arcpy.Describe(inputFile).spatialReference
+        # Get the input coordinate system and the two geometry types from the cached describe
+        inputGeo = featureio.describe(inputFile)['shapeType']
+        clipGEO = featureio.describe(clipFile)['shapeType']
+        inputCoordinateSystem = featureio.describe(inputFile)['spatialReference']
+        carryFields = list(carryFields or [])
+        fields = featureio.outputFields(inputFile,carryFields)
         # Delete output file if they exist
         if (os.path.exists(os.path.join(returnDir,outputName))):
             arcpy.management.Delete(os.path.join(returnDir,outputName))
@@ -55,152 +211,87 @@ def clip(returnDir,outputName, inputFile, clipFile):
         #-------------------------------------------------------------------------------------------------------------
         # Check if both geometries are points
         if(inputGeo == "POINT" and clipGEO == "POINT"):
-            # Create an empty list to store point geometries in 
-            inputPoints = []
-            # Open search cursor on input features
-            with arcpy.da.SearchCursor(inputFile,['SHAPE@']) as SearchCursor:
-                for row in SearchCursor:
-                    if(row[0]!=None):
-                    # Add to list point geometries
-                        inputPoints.append(row[0])
-            # Do the same process on the clip feature
-            clipPoints = []
-            with arcpy.da.SearchCursor(clipFile,['SHAPE@']) as SearchCursor:
-                for row in SearchCursor:
-                    if(row[0]!=None):
-                        clipPoints.append(row[0])
-            # Create an empty list of output points
-            outputPoints = []
-            # Loop through input feature points
-            for point in inputPoints:
-                # If the current point exists in the clip feature append that point to outputPoints
-                if point in clipPoints:
-                    outputPoints.append(point)
-            # Create output file
-            arcpy.CreateFeatureclass_management(returnDir, outputName,'POINT',spatial_reference=inputCoordinateSystem)
-            # Open an insert cursor on the output shape file
-            with arcpy.da.InsertCursor(os.path.join(returnDir,outputName), ['SHAPE@']) as iCursor:
-                # Add to output the output points and then return success message
-                for point in outputPoints:
-                    iCursor.insertRow(point)
+            # Read the clip points' coordinates as one array
+            clipPoints = np.concatenate(list(featureio.readPointChunks(clipFile))+[np.zeros((0,2))])
+            tolerance = pointTolerance(inputFile,xyTolerance)
+            # Go through the input points a chunk at a time, keeping the ones that have a clip point within the
+            # tolerance of them along with their attributes
+            def columnChunks():
+                for shapes, columns in featureio.readFieldChunks(inputFile,'SHAPE@XY',carryFields):
+                    inputPoints = featureio.pointCoords(shapes)
+                    matched = geometry.pointMatches(inputPoints,clipPoints,tolerance)
+                    yield (inputPoints[matched],None,None,featureio.selectAttributes(columns,matched))
+            # Create output file and write the output points' coordinates and attributes in bulk, then return
+            # success message
+            featureio.writeColumns(os.path.join(returnDir,outputName),'POINT',columnChunks(),inputCoordinateSystem,fields)
             return "The clip was successful!"
         # ------------------------------------------------------------------------------------------------------------            
         elif(inputGeo == "POINT" and clipGEO == "POLYLINE"):
-            # Create an empty list to store point geometries in 
-            inputPoints = []
-            # Open search cursor on input features
-            with arcpy.da.SearchCursor(inputFile,['SHAPE@']) as SearchCursor:
-                for row in SearchCursor:
-                    if(row[0]!=None):
-                    # Add to list point geometries
-                        inputPoints.append(row[0])
-            # Do the same process on the clip feature, adding the clip lines
-            clipLines = []
-            with arcpy.da.SearchCursor(clipFile,['SHAPE@']) as SearchCursor:
-                for row in SearchCursor:
-                    if(row[0]!=None):
-                        clipLines.append(row[0])
-            # Create an empty list of output points
-            outputPoints = []
-            # Loop through input feature points
-            for point in inputPoints:
-               # Loop through the lines in the clip feature
-               for line in clipLines:
-                   # If the point is within the line, I.E. is on the line add it to the outputPoints
-                   if (point.within(line)):
-                       outputPoints.append(point)
-            # Create output file
-            arcpy.CreateFeatureclass_management(returnDir, outputName,'POINT',spatial_reference=inputCoordinateSystem)
-            # Open an insert cursor on the output shape file
-            with arcpy.da.InsertCursor(os.path.join(returnDir,outputName), ['SHAPE@']) as iCursor:
-                # Add to output the output points and then return success message
-                for point in outputPoints:
-                    iCursor.insertRow(point)
+            # Break the clip lines into segments once
+            segmentStarts, segmentEnds = lineSegments(clipFile)
+            tolerance = pointTolerance(inputFile,xyTolerance)
+            # Go through the input points a chunk at a time, keeping the ones within the tolerance of a clip
+            # line (only once even when they are on several lines) along with their attributes
+            def columnChunks():
+                for shapes, columns in featureio.readFieldChunks(inputFile,'SHAPE@XY',carryFields):
+                    inputPoints = featureio.pointCoords(shapes)
+                    matched = geometry.pointsOnSegments(inputPoints,segmentStarts,segmentEnds,tolerance)
+                    yield (inputPoints[matched],None,None,featureio.selectAttributes(columns,matched))
+            # Create output file and write the output points' coordinates and attributes in bulk, then return
+            # success message
+            featureio.writeColumns(os.path.join(returnDir,outputName),'POINT',columnChunks(),inputCoordinateSystem,fields)
             return "The clip was successful!"
         # --------------------------------------------------------------------------------------------------------------
         elif(inputGeo == "POINT" and clipGEO == "POLYGON"):
-            # Create an empty list to store point geometries in 
-            inputPoints = []
-            # Open search cursor on input features
-            with arcpy.da.SearchCursor(inputFile,['SHAPE@']) as SearchCursor:
-                for row in SearchCursor:
-                    if(row[0]!=None):
-                    # Add to list point geometries
-                        inputPoints.append(row[0])
-            # Do the same process on the clip feature, adding the clip polygons
-            clipPolygons = []
-            with arcpy.da.SearchCursor(clipFile,['SHAPE@']) as SearchCursor:
-                for row in SearchCursor:
-                    if(row[0]!=None):
-                        clipPolygons.append(row[0])
-            # Create an empty list of output points
-            outputPoints = []
-            # Loop through input feature points
-            for point in inputPoints:
-               # Loop through the polygons in the clip feature
-               for poly in clipPolygons:
-                   # If the point is within the polygon, I.E. its inside of the polygon or if its
-                   # within the polygon's polyline boundary I.E. its on the boundary add it to output Points
-                   if (point.within(poly) or point.within(poly.boundary())):
-                       outputPoints.append(point)
-            # Create output file
-            arcpy.CreateFeatureclass_management(returnDir, outputName,'POINT',spatial_reference=inputCoordinateSystem)
-            # Open an insert cursor on the output shape file
-            with arcpy.da.InsertCursor(os.path.join(returnDir,outputName), ['SHAPE@']) as iCursor:
-                # Add to output the output points and then return success message
-                for point in outputPoints:
-                    iCursor.insertRow(point)
+            # Read the rings of the clip polygons once, and prepare them when they have many edges
+            tolerance = pointTolerance(inputFile,xyTolerance)
+            polygons, prepared = clipPolygons(clipFile,tolerance)
+            # Go through the input points a chunk at a time, keeping the ones inside a clip polygon or within
+            # the tolerance of its boundary (only once even when they are in several polygons) along with their
+            # attributes
+            def columnChunks():
+                for shapes, columns in featureio.readFieldChunks(inputFile,'SHAPE@XY',carryFields):
+                    inputPoints = featureio.pointCoords(shapes)
+                    if(prepared is not None):
+                        matched = geometry.preparedContains(prepared,inputPoints)
+                    else:
+                        matched = geometry.pointsInPolygons(inputPoints,polygons,tolerance)
+                    yield (inputPoints[matched],None,None,featureio.selectAttributes(columns,matched))
+            # Create output file and write the output points' coordinates and attributes in bulk, then return
+            # success message
+            featureio.writeColumns(os.path.join(returnDir,outputName),'POINT',columnChunks(),inputCoordinateSystem,fields)
             return "The clip was successful!"
         #-------------------------------------------------------------------------------------------------------------------
         elif(inputGeo == "POLYLINE" and clipGEO == "POLYLINE"):
-            # Create an empty list that will store line geometries
-            inputLineGeo = []
-            # Open a search cursor on the inputFile
-            with arcpy.da.SearchCursor(inputFile,['SHAPE@']) as SearchCursor:
-                # Go through every line in the search cursor
-                for row in SearchCursor:
-                    if(row[0]!=None):
-                        # Grab the geometry of that line
-                        pLine = row[0]
-                        # Get the Array containing the lines points by doing .getPart(0)
-                        pLineArray = pLine.getPart(0)
-                        # Some lines may have more than two points. Since they are stored in an array
-                        # Just loop through the array accessing individual elt points each time
-                        # Set up a prevPoint that will initially be None
-                        prevPoint = None
-                        # Loop through the points
-                        for point in pLineArray:
-                            # If there is a prevPoint, create a polyLine out of the current point and the previous point
-                            # and append to the inputLineGeo list
-                            if(prevPoint!=None):
-                                inputLineGeo.append(arcpy.Polyline(arcpy.Array([prevPoint,point])))
-                            # set the previous point to the current point before moving on.
-                            prevPoint = point
-            # Set up a list that will store the polyline geometries from the clip objects
-            cliplineObjects = []
-            # Open a search cursor on the clip file
-            with arcpy.da.SearchCursor(clipFile,['SHAPE@']) as SearchCursor:
-                    # Go through every line in the search cursor
-                for row in SearchCursor:
-                    if(row[0]!=None):
-                        # Grab the geometry of that line and append to cliplineObjects
-                        cliplineObjects.append(row[0])
-            # Create an empty list that will have the output lines
-            outputLines = []
-            # Loop through both lists of lines
-            for line in inputLineGeo:
-                for line2 in cliplineObjects:
-                    # If the line from the input feature is within the line from the clip aka it is overlayed,
-                    # append it to the outputLines
-                    if(line.within(line2)):
-                        outputLines.append(line)
-            # Create output file
-            arcpy.CreateFeatureclass_management(returnDir, outputName,'POLYLINE',spatial_reference=inputCoordinateSystem)
-             # Open an insert cursor on the output shape file
-            with arcpy.da.InsertCursor(os.path.join(returnDir,outputName), ['SHAPE@']) as iCursor:
-                 # Add to output the output points and then return success message
-                 for line in outputLines:
-                     iCursor.insertRow([line])
+            # Break the clip lines into segments once
+            clipStarts, clipEnds = lineSegments(clipFile)
+            tolerance = pointTolerance(inputFile,xyTolerance)
+            # Go through the input lines a chunk at a time, keeping the stretches of them that lie on a clip line
+            # joined back into one (multipart) line per input line along with its attributes
+            def columnChunks():
+                for shapes, columns in featureio.readFieldChunks(inputFile,'SHAPE@WKB',carryFields):
+                    parts = [geometry.wkbParts(shape) for shape in shapes]
+                    coords, partOffsets, featureOffsets = featureio.ringsToColumns(parts,close=False)
+                    # Every segment runs from one point of a part to the next, and remembers its part and line
+                    partIds = np.repeat(np.arange(len(partOffsets)-1),np.diff(partOffsets))
+                    lastPoints = np.zeros(len(coords),dtype=bool)
+                    lastPoints[partOffsets[1:][np.diff(partOffsets)>0]-1] = True
+                    segmentStarts = np.flatnonzero(~lastPoints)
+                    segmentParts = partIds[segmentStarts]
+                    segmentLines = np.repeat(np.arange(len(featureOffsets)-1),np.diff(featureOffsets))[segmentParts]
+                    segmentEnds = coords[segmentStarts+1]
+                    segments, fromAlong, toAlong = geometry.segmentOverlaps(coords[segmentStarts],segmentEnds,clipStarts,
+                                                                            clipEnds,tolerance)
+                    outputCoords, outputOffsets, pieceSegments = geometry.overlapLines(coords[segmentStarts],segmentEnds,
+                                                                                       segmentParts,segments,fromAlong,
+                                                                                       toAlong)
+                    # The output lines of an input line are next to each other since the segments are in order
+                    lines, lineCounts = np.unique(segmentLines[pieceSegments],return_counts=True)
+                    yield (outputCoords,outputOffsets,np.concatenate(([0],np.cumsum(lineCounts))),
+                           featureio.selectAttributes(columns,lines))
+            # Create output file and write the output lines and their attributes in bulk, then return success
+            # message
+            featureio.writeColumns(os.path.join(returnDir,outputName),'POLYLINE',columnChunks(),inputCoordinateSystem,fields)
             return "The clip was successful!"
         #-----------------------------------------------------------------------------------------------------------------------
         elif(inputGeo == "POLYLINE" and clipGEO == "POLYGON"):
@@ -274,7 +365,7 @@ def clip(returnDir,outputName, inputFile, clipFile):
     except:
         return "The clip has failed. Sorry!"
     
-def batchClip(returnDirs,outputNames,inputFiles,clipFiles):
+def batchClip(returnDirs,outputNames,inputFiles,clipFiles, workers = 1, report = False):
     '''
     Parameters
     ----------
@@ -290,11 +381,17 @@ def batchClip(returnDirs,outputNames,inputFiles,clipFiles):
     clipFiles : This should be a list of strings representing a series of file paths.
         This should be a list of strings representing file paths that points to valid shape files that
         you wish to use as your clip features for the clip.
+    workers : This should be an integer, optional
+        This should be an integer representing how many clips run at the same time, each in its own process.
+        The default is 1.
+    report : This should be a boolean, optional
+        This should be True to get back the report of every clip instead of just S or F. The default is False.
     
     
     Returns
     -------
-    A list of strings where each entry in the list represents whether the buffer at that index failed or succeeded
+    A list of strings where each entry in the list represents whether the clip at that index failed or succeeded,
+    or a list of dictionaries holding the report of every clip when report is True (see batch.runJobs)
             
     Description
     -----------
@@ -304,24 +401,25 @@ def batchClip(returnDirs,outputNames,inputFiles,clipFiles):
     index 0 in the inputFiles list will have a clip ran on using the clipfeature at index 0 in 
     clipFiles. This will return a list of status's
     where S represents a successful clip and F represents a failed clip. Ultimately the logic of this function is to call
-    the clip function on each list entry.
+    the clip function on each list entry. The clips are run by batch.runJobs, which spreads them over workers
+    processes and times every one of them, so a clip that fails only fails its own entry. Every report holds
+    the status, clip's message, the error, the elapsed seconds and how many features went in and came out.
+    The entries that share a clipFile are planned into one group by batch.planGroups and run one after another
+    in the same process, so polygons prepared for the first clip are used again by the rest (see clipPolygons).
+    Their reads are not shared since the inputs of a group are usually different files.
     '''
     # Check to make sure the input lists are all of same size. If they aren't return an error message
     if(len(returnDirs)!=len(outputNames) or len(inputFiles)!=len(outputNames) or len(inputFiles)!=len(clipFiles)):
         return "Please input lists of all the same size!"
     else:
-        # If they are the same size create an empty return list
-        returnList = []
-        # Loop through the lists
-        for index in range(len(returnDirs)):
-            # Store in x the return message from running a clip at each index
-            x = clip(returnDirs[index],outputNames[index],inputFiles[index],clipFiles[index])
-            # If the return message was a success append a S, otherwise a F
-            if(x == "The clip was successful!"):
-                returnList.append("S")
-            else:
-                returnList.append("F")
-        # Return the list of return messages
-        return returnList
+        # Make a clip job for every index of the lists
+        jobs = [(clip,(returnDirs[index],outputNames[index],inputFiles[index],clipFiles[index]),
+                 inputFiles[index],os.path.join(returnDirs[index],outputNames[index]),"The clip was successful!")
+                for index in range(len(returnDirs))]
+        # Group the clips by the same clipFile so its polygons are prepared once for all of them
+        groups = batch.planGroups([os.path.normcase(os.path.abspath(clipFile)) for clipFile in clipFiles],workers)
+        # Run the clips and return their reports, or a S for every success and a F for every failure
+        reports = batch.runJobs(jobs,workers,groups,False)
+        return reports if report else batch.statusList(reports)
     
     
@@ -0,0 +1,264 @@
+"""
+Author: Caleb Cordsen
+Date: 10/17/2026
+
+Description: This file contains the dissolve engine that merges buffer pieces together without arcpy! It
+groups the pieces that can touch each other, merges every group with one union (cascading only the groups too
+big to merge in memory at once) and can spread the work over several processes.
+Like geometry.py it only needs NumPy so it can be used and benchmarked on machines without ArcGIS Pro.
+"""
+# Import necessary things
+import concurrent.futures
+import numpy as np
+import geometry
+
+def pieceBoxes(pieces):
+    '''
+    Parameters
+    ----------
+    pieces : This should be a list of lists of numpy arrays.
+        This should be a list of pieces where every piece is a list of (n, 2) rings.
+
+    Returns
+    -------
+    numpy array
+        A (N, 4) array holding the bounding box (xmin, ymin, xmax, ymax) of every piece.
+    '''
+    boxes = np.empty((len(pieces),4))
+    for index, piece in enumerate(pieces):
+        points = np.concatenate(piece)
+        boxes[index,:2] = points.min(axis=0)
+        boxes[index,2:] = points.max(axis=0)
+    return boxes
+
+def mortonOrder(boxes):
+    '''
+    Parameters
+    ----------
+    boxes : This should be a numpy array.
+        This should be a (N, 4) array of bounding boxes.
+
+    Returns
+    -------
+    numpy array
+        The order that sorts the boxes along a Z shaped (Morton) curve through their centers.
+
+    Description
+    -----------
+    The mortonOrder function puts boxes that are close to each other next to each other in the order. The box
+    centers are snapped to a 65536 by 65536 grid and the bits of the two grid numbers are interleaved so
+    sorting the interleaved numbers walks the grid in nested Z shapes.
+    '''
+    if(len(boxes)==0):
+        return np.zeros(0,dtype=np.int64)
+    centers = (boxes[:,:2]+boxes[:,2:])/2
+    low = centers.min(axis=0)
+    span = np.maximum(centers.max(axis=0)-low,1e-300)
+    cells = np.minimum((centers-low)/span*65536,65535).astype(np.uint64)
+    codes = np.zeros(len(boxes),dtype=np.uint64)
+    for bit in range(16):
+        codes |= ((cells[:,0]>>np.uint64(bit))&np.uint64(1))<<np.uint64(2*bit)
+        codes |= ((cells[:,1]>>np.uint64(bit))&np.uint64(1))<<np.uint64(2*bit+1)
+    return np.argsort(codes,kind='stable')
+
+# How many vertices go into one merge at most. windingUnion takes about as long per vertex on any number of
+# vertices but needs about 1 KB of memory per vertex, so this caps one merge at about 1 GB
+LEAF_VERTICES = 1000000
+
+def cascadedUnion(pieces, tolerance = None, leafVertices = LEAF_VERTICES):
+    '''
+    Parameters
+    ----------
+    pieces : This should be a list of lists of numpy arrays.
+        This should be a list of pieces where every piece is a list of (n, 2) rings with outer rings running
+        clockwise and holes running counterclockwise.
+    tolerance : This should be a number, optional
+        This should be the snapping tolerance handed to geometry.windingUnion. The default of None lets every
+        merge work one out from its own extent.
+    leafVertices : This should be an integer, optional
+        This should be an integer representing about how many vertices are merged together at most. The
+        default is LEAF_VERTICES.
+
+    Returns
+    -------
+    list
+        A list of rings holding the union of all of the pieces.
+
+    Description
+    -----------
+    The cascadedUnion function splits the pieces into groups that cannot touch each other with pieceGroups
+    and merges every group with one windingUnion call. windingUnion takes about the same time per vertex no
+    matter how many vertices it is handed, so merging a group two halves at a time only adds work (every level
+    goes over the merged edges again), while splitting off the groups that cannot touch saves the time spent
+    sorting them together. Only a group with more than leafVertices vertices is cascaded, to keep the memory
+    of one merge bounded: its pieces are put in Morton order, runs of neighbouring pieces with about
+    leafVertices vertices are merged and the merged runs are then merged two at a time, level by level, until
+    one is left. A piece by itself is returned as it is so it should already be merged (like windingUnion's
+    output).
+    '''
+    pieces = [list(piece) for piece in pieces if len(piece)>0]
+    if(len(pieces)==0):
+        return []
+    if(len(pieces)==1):
+        return pieces[0]
+    boxes = pieceBoxes(pieces)
+    merged = []
+    for group in pieceGroups(pieces,boxes):
+        if(len(group)==1):
+            merged.extend(pieces[group[0]])
+            continue
+        # Cut the ordered pieces into runs of about leafVertices vertices and merge each run
+        level = []
+        run = []
+        runSize = 0
+        for index in group[mortonOrder(boxes[group])].tolist():
+            run.extend(pieces[index])
+            runSize += sum(len(ring) for ring in pieces[index])
+            if(runSize>=leafVertices):
+                level.append(geometry.windingUnion(run,tolerance))
+                run = []
+                runSize = 0
+        if(len(run)>0):
+            level.append(geometry.windingUnion(run,tolerance))
+        while(len(level)>1):
+            nextLevel = []
+            for index in range(0,len(level)-1,2):
+                nextLevel.append(geometry.windingUnion(level[index]+level[index+1],tolerance))
+            # An odd run out moves up to the next level on its own
+            if(len(level)%2==1):
+                nextLevel.append(level[-1])
+            level = nextLevel
+        merged.extend(level[0])
+    return merged
+
+def pieceGroups(pieces, boxes = None):
+    '''
+    Parameters
+    ----------
+    pieces : This should be a list of lists of numpy arrays.
+        This should be a list of pieces where every piece is a list of (n, 2) rings.
+    boxes : This should be a numpy array, optional
+        This should be the bounding boxes of the pieces if they are already known. The default of None works
+        them out with pieceBoxes.
+
+    Returns
+    -------
+    list
+        A list of integer numpy arrays, one per group, holding the indexes of the pieces in that group. Groups
+        are listed by their smallest piece index so the result does not change between runs.
+
+    Description
+    -----------
+    The pieceGroups function links every two pieces whose bounding boxes overlap or touch (found with
+    geometry.bboxPairs) and splits the pieces into the connected groups of those links. Pieces in different
+    groups cannot overlap so each group can be merged on its own and the merged groups just sit side by side.
+    '''
+    if(boxes is None):
+        boxes = pieceBoxes(pieces)
+    first, second = geometry.bboxPairs(boxes)
+    labels = geometry.connectedComponents(len(pieces),first,second)
+    order = np.argsort(labels,kind='stable')
+    breaks = np.flatnonzero(np.diff(labels[order]))+1
+    groups = np.split(order,breaks) if len(order)>0 else []
+    groups.sort(key=lambda group: group[0])
+    return groups
+
+def unionTask(task):
+    '''
+    Parameters
+    ----------
+    task : This should be a tuple.
+        This should be a (groups, tolerance) tuple where groups is a list of lists of pieces.
+
+    Returns
+    -------
+    list
+        A list holding the merged rings of every group in the task, in the same order.
+
+    Description
+    -----------
+    The unionTask function is what the worker processes run. It has to sit at the top of the file so it can
+    be handed to another process.
+    '''
+    groups, tolerance = task
+    return [cascadedUnion(group,tolerance) for group in groups]
+
+def dissolvePieces(pieces, workers = 1, tolerance = None):
+    '''
+    Parameters
+    ----------
+    pieces : This should be a list of lists of numpy arrays.
+        This should be a list of pieces where every piece is a list of (n, 2) rings with outer rings running
+        clockwise and holes running counterclockwise, like the buffer around one feature.
+    workers : This should be an integer, optional
+        This should be an integer representing how many processes to merge with. The default is 1 which does
+        all of the work in this process.
+    tolerance : This should be a number, optional
+        This should be the snapping tolerance handed to geometry.windingUnion. The default is None.
+
+    Returns
+    -------
+    list
+        A list of rings holding the union of all of the pieces. This matches what a dissolve with no fields
+        would give back as one multipart polygon.
+
+    Description
+    -----------
+    The dissolvePieces function splits the pieces into groups that cannot touch each other with pieceGroups.
+    Groups made of one piece are kept as they are. The rest are packed into tasks of about the same number of
+    vertices and merged with cascadedUnion. When more than one worker is asked for, a group that is bigger than
+    its share of the work is cut into Morton ordered runs that are merged in parallel and then cascaded
+    together here, so one large connected network can still use every core. The output order only depends on
+    the input so the result is the same for any number of workers.
+    '''
+    pieces = [list(piece) for piece in pieces if len(piece)>0]
+    if(len(pieces)==0):
+        return []
+    boxes = pieceBoxes(pieces)
+    groups = pieceGroups(pieces,boxes)
+    sizes = np.array([sum(len(ring) for ring in piece) for piece in pieces])
+    workers = max(int(workers),1)
+    share = sizes.sum()/workers
+    # Every entry of jobs is one list of pieces to be cascaded, and parts says which group each one belongs to
+    jobs = []
+    parts = []
+    results = [None]*len(groups)
+    for groupIndex, group in enumerate(groups):
+        if(len(group)==1):
+            results[groupIndex] = pieces[group[0]]
+            continue
+        group = group[mortonOrder(boxes[group])]
+        cuts = 1
+        if(workers>1):
+            cuts = int(min(max(np.ceil(sizes[group].sum()/share),1),workers,len(group)//2 or 1))
+        for run in np.array_split(group,cuts):
+            jobs.append([pieces[index] for index in run])
+            parts.append(groupIndex)
+    if(len(jobs)>0):
+        # Pack the jobs into tasks with about the same number of vertices, biggest jobs first
+        taskCount = min(len(jobs),workers*4) if workers>1 else 1
+        taskJobs = [[] for task in range(taskCount)]
+        taskSizes = np.zeros(taskCount)
+        jobSizes = [sum(len(ring) for piece in job for ring in piece) for job in jobs]
+        for jobIndex in np.argsort(jobSizes,kind='stable')[::-1].tolist():
+            smallest = int(np.argmin(taskSizes))
+            taskJobs[smallest].append(jobIndex)
+            taskSizes[smallest] += jobSizes[jobIndex]
+        tasks = [([jobs[jobIndex] for jobIndex in jobIndexes],tolerance) for jobIndexes in taskJobs if len(jobIndexes)>0]
+        taskJobs = [jobIndexes for jobIndexes in taskJobs if len(jobIndexes)>0]
+        if(workers>1 and len(tasks)>1):
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                taskResults = list(executor.map(unionTask,tasks))
+        else:
+            taskResults = [unionTask(task) for task in tasks]
+        jobResults = [None]*len(jobs)
+        for jobIndexes, merged in zip(taskJobs,taskResults):
+            for jobIndex, rings in zip(jobIndexes,merged):
+                jobResults[jobIndex] = rings
+        # Cascade the runs of every group that had to be cut up
+        runs = {}
+        for jobIndex, groupIndex in enumerate(parts):
+            runs.setdefault(groupIndex,[]).append(jobResults[jobIndex])
+        for groupIndex, merged in runs.items():
+            results[groupIndex] = merged[0] if len(merged)==1 else cascadedUnion(merged,tolerance)
+    return [ring for rings in results for ring in rings]
@@ -0,0 +1,1046 @@
+"""
+Author: Caleb Cordsen
+Date: 10/17/2026
+
+Description: This file contains the functions that read features in and write features out for the buffer
+and clip functions! Features are read and written in chunks and handed along with generators so a tool can
+work on one chunk while only that chunk is in memory. Geometry is written in bulk from columns (one array of
+coordinates plus arrays of where every part and feature starts) by a shapefile writer that only needs NumPy,
+so the writers also work without ArcPy.
+"""
+# Import necessary things
+import collections
+import contextlib
+import datetime
+import itertools
+import os
+import threading
+import numpy as np
+import geometry
+# ArcPy is only needed to read features and to write outputs that are not shapefiles
+try:
+    import arcpy
+except ImportError:
+    arcpy = None
+
+# How many features are read, worked on and written at a time
+DEFAULT_CHUNK_SIZE = 10000
+
+# How many datasets describe remembers before it forgets the one used longest ago
+DESCRIBE_CACHE_SIZE = 1024
+# The cached (stamp, metadata) of every dataset by path, oldest first, and the lock that keeps threads from changing it at the same time
+describeCache = collections.OrderedDict()
+describeLock = threading.Lock()
+
+# The files that make up a shapefile
+SHAPEFILE_EXTENSIONS = ['.shp','.shx','.dbf','.prj','.cpg']
+
+def shapefileFiles(path):
+    '''
+    Parameters
+    ----------
+    path : This should be a string representing a file path.
+        This should be a string representing a file path that points to a .shp file.
+
+    Returns
+    -------
+    list
+        The paths of the files that make up the shapefile (see SHAPEFILE_EXTENSIONS) that exist, sorted by
+        extension.
+    '''
+    stem = os.path.splitext(path)[0]
+    files = [stem+extension for extension in SHAPEFILE_EXTENSIONS if os.path.isfile(stem+extension)]
+    return sorted(files,key=lambda file: os.path.splitext(file)[1].lower())
+
+def datasetStamp(inputFile):
+    '''
+    Parameters
+    ----------
+    inputFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to a dataset.
+
+    Returns
+    -------
+    tuple or None
+        A tuple that changes whenever the dataset does, or None when there is no way to tell if it changed.
+
+    Description
+    -----------
+    The datasetStamp function stamps a shapefile with the modification time and size of every one of its files
+    (see shapefileFiles), since a new .prj or .dbf changes the dataset as much as a new .shp does. A feature
+    class in a file geodatabase is stamped with the number, newest modification time and total size of the
+    files in the .gdb folder, which holds the tables the feature class is stored in. Anything else (like a
+    dataset in an enterprise geodatabase) gets None, which describe, shareReads and clip.clipPolygons take to
+    mean the dataset should not be cached at all.
+    '''
+    path = os.path.abspath(inputFile)
+    if(path.lower().endswith('.shp')):
+        files = shapefileFiles(path)
+        if(len(files)==0):
+            return None
+        stats = [os.stat(file) for file in files]
+        return tuple((os.path.splitext(file)[1].lower(),stat.st_mtime_ns,stat.st_size) for file, stat in zip(files,stats))
+    # Walk up to the geodatabase folder the feature class (or its feature dataset) is in
+    while(not path.lower().endswith('.gdb') and os.path.dirname(path)!=path):
+        path = os.path.dirname(path)
+    if(not path.lower().endswith('.gdb') or not os.path.isdir(path)):
+        return None
+    stats = [entry.stat() for entry in os.scandir(path) if entry.is_file()]
+    return (len(stats),max((stat.st_mtime_ns for stat in stats),default=0),sum(stat.st_size for stat in stats))
+
+def describe(inputFile):
+    '''
+    Parameters
+    ----------
+    inputFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to a valid shape file.
+
+    Returns
+    -------
+    dict
+        A dictionary holding the shapeType (upper case, like POLYGON), the spatialReference, the extent as an
+        (xmin, ymin, xmax, ymax) tuple, the featureCount of the dataset and its attribute fields as a list of
+        (name, type, length, precision, scale) tuples.
+
+    Description
+    -----------
+    The describe function is a cache in front of arcpy.Describe and GetCount. A single buffer or clip used to
+    describe the same input three times (for its shape type, its units and its coordinate system) and batch
+    runs did that again for every job. The answer is saved under the full path together with the dataset's
+    datasetStamp, so it is only looked up again once the dataset changes. Every entry point in
+    buffer.py and clip.py goes through here, so they all share one cache. At most DESCRIBE_CACHE_SIZE datasets
+    are remembered, and the lock makes it safe to use from several threads.
+    '''
+    key = os.path.normcase(os.path.abspath(inputFile))
+    stamp = datasetStamp(inputFile)
+    with describeLock:
+        # Only use the saved answer if the file has not changed since
+        if(stamp is not None and key in describeCache and describeCache[key][0]==stamp):
+            describeCache.move_to_end(key)
+            return describeCache[key][1]
+    description = arcpy.Describe(inputFile)
+    extent = description.extent
+    metadata = {'shapeType':description.shapeType.upper(),
+                'spatialReference':description.spatialReference,
+                'extent':(extent.XMin,extent.YMin,extent.XMax,extent.YMax),
+                'featureCount':int(arcpy.management.GetCount(inputFile)[0]),
+                'fields':[(field.name,field.type,field.length,field.precision,field.scale) for field in description.fields]}
+    if(stamp is None):
+        return metadata
+    with describeLock:
+        describeCache[key] = (stamp,metadata)
+        describeCache.move_to_end(key)
+        while(len(describeCache)>DESCRIBE_CACHE_SIZE):
+            describeCache.popitem(last=False)
+    return metadata
+
+# While shareReads is on, the chunks read from every input by (kind, path, stamp, fields, chunkSize) and the
+# decoded shapes of those chunks by (id of the chunk's shapes, decoder name). Both are None while it is off
+sharedChunks = None
+sharedDecoded = None
+# How many times an input was read from its file and how many times it was handed out again from sharedChunks
+readCounts = collections.Counter()
+
+@contextlib.contextmanager
+def shareReads():
+    '''
+    Yields
+    ------
+    None.
+
+    Description
+    -----------
+    The shareReads function is a context manager that keeps every input that is read all the way through
+    inside the with block in memory, so the next tool that reads the same input (with the same fields and
+    chunkSize) gets the chunks back from memory instead of opening another search cursor. Shapes decoded with
+    decodeShapes inside the block are kept too so they are only decoded once. batch.runGroup turns it on around
+    the buffers of one input. Everything kept is let go when the block ends. It belongs to one process and is
+    not meant to be used from several threads at the same time.
+    '''
+    global sharedChunks, sharedDecoded
+    sharedChunks, sharedDecoded = {}, {}
+    try:
+        yield
+    finally:
+        sharedChunks, sharedDecoded = None, None
+
+def replayChunks(key, chunks):
+    '''
+    Parameters
+    ----------
+    key : This should be a tuple.
+        This should be a tuple saying what is being read (see sharedChunks).
+    chunks : This should be a generator.
+        This should be the generator that reads the chunks from the file. It is not started when the chunks
+        are already in memory.
+
+    Yields
+    ------
+    object
+        The chunks, from memory when shareReads has them and from chunks otherwise.
+    '''
+    # A dataset without a stamp could change without the key changing, so it is never kept
+    if(sharedChunks is None or key[2] is None):
+        readCounts['file'] += 1
+        yield from chunks
+        return
+    if(key in sharedChunks):
+        readCounts['shared'] += 1
+        yield from sharedChunks[key]
+        return
+    readCounts['file'] += 1
+    kept = []
+    for chunk in chunks:
+        kept.append(chunk)
+        yield chunk
+    # Only an input that was read all the way through can be handed out again
+    if(sharedChunks is not None):
+        sharedChunks[key] = kept
+
+def decodeShapes(shapes, decoder):
+    '''
+    Parameters
+    ----------
+    shapes : This should be a list.
+        This should be the shapes of a chunk, as readFieldChunks gives them back.
+    decoder : This should be a function.
+        This should be the function that decodes the whole list of shapes, like geometry.multipointColumns.
+
+    Returns
+    -------
+    object
+        What decoder gives back for shapes. While shareReads is on it is only worked out the first time a chunk
+        is decoded with decoder, so the tools reading the same input share the decoded coordinates too. The
+        result should not be changed in place.
+    '''
+    if(sharedDecoded is None):
+        return decoder(shapes)
+    key = (id(shapes),decoder.__name__)
+    if(key not in sharedDecoded):
+        # The shapes are kept alongside so their id cannot be given to another list
+        sharedDecoded[key] = (shapes,decoder(shapes))
+    return sharedDecoded[key][1]
+
+def readKey(kind, inputFile, fields, chunkSize):
+    '''
+    Parameters
+    ----------
+    kind : This should be a string.
+        This should be rows or columns depending on which reader is reading.
+    inputFile, fields, chunkSize : These should be the reader's arguments.
+
+    Returns
+    -------
+    tuple
+        The key the chunks are kept under by shareReads. It holds the datasetStamp so an input that changes
+        is read again.
+    '''
+    return (kind,os.path.normcase(os.path.abspath(inputFile)),datasetStamp(inputFile),tuple(fields),chunkSize)
+
+def cursorChunks(inputFile, fields, chunkSize = DEFAULT_CHUNK_SIZE):
+    '''
+    Parameters
+    ----------
+    inputFile, fields, chunkSize : These should be the same as for readChunks.
+
+    Yields
+    ------
+    list
+        Lists of up to chunkSize rows read straight from the file with an arcpy search cursor.
+    '''
+    with arcpy.da.SearchCursor(inputFile,fields) as SearchCursor:
+        while(True):
+            rows = list(itertools.islice(SearchCursor,chunkSize))
+            if(len(rows)==0):
+                break
+            yield rows
+
+def readChunks(inputFile, fields, chunkSize = DEFAULT_CHUNK_SIZE):
+    '''
+    Parameters
+    ----------
+    inputFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to a valid shape file.
+    fields : This should be a list of strings.
+        This should be a list of the fields or tokens (like SHAPE@WKB) to read for every feature.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing how many features to read at a time. The default is
+        DEFAULT_CHUNK_SIZE.
+
+    Yields
+    ------
+    list
+        Lists of up to chunkSize rows read with an arcpy search cursor.
+
+    Description
+    -----------
+    The readChunks function opens one search cursor on the inputFile and hands back its rows chunkSize at a
+    time with itertools.islice. The next chunk is only read once the one before it has been used. Inside
+    shareReads an input that was already read is handed back from memory instead.
+    '''
+    return replayChunks(readKey('rows',inputFile,fields,chunkSize),cursorChunks(inputFile,fields,chunkSize))
+
+def readPointChunks(inputFile, chunkSize = DEFAULT_CHUNK_SIZE):
+    '''
+    Parameters
+    ----------
+    inputFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to a valid point shape file.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing how many points to read at a time. The default is
+        DEFAULT_CHUNK_SIZE.
+
+    Yields
+    ------
+    numpy array
+        (n, 2) arrays holding the x and y coordinates of up to chunkSize points, with null shapes skipped.
+    '''
+    for rows in readChunks(inputFile,['SHAPE@XY'],chunkSize):
+        coords = [row[0] for row in rows if row[0]!=None]
+        if(len(coords)>0):
+            yield np.array(coords,dtype=np.float64)
+
+def pointCoords(shapes):
+    '''
+    Parameters
+    ----------
+    shapes : This should be a list of tuples.
+        This should be the (x, y) pairs of a chunk of points, as the SHAPE@XY token gives them back.
+
+    Returns
+    -------
+    numpy array
+        A (n, 2) array of the coordinates.
+    '''
+    return np.array(shapes,dtype=np.float64).reshape(-1,2)
+
+def readFieldChunks(inputFile, shapeToken, fields, chunkSize = DEFAULT_CHUNK_SIZE):
+    '''
+    Parameters
+    ----------
+    inputFile : This should be a string representing a file path.
+        This should be a string representing a file path that points to a valid shape file.
+    shapeToken : This should be a string.
+        This should be the token the shapes are read with, like SHAPE@XY or SHAPE@WKB.
+    fields : This should be a list of strings.
+        This should be a list of the attribute fields to read along with the shapes.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing how many features to read at a time. The default is
+        DEFAULT_CHUNK_SIZE.
+
+    Yields
+    ------
+    tuple
+        A (shapes, columns) tuple for every chunk where shapes is a list of the shapes that are not null and
+        columns is a dictionary holding a numpy array of every field's values for those same features.
+
+    Description
+    -----------
+    The readFieldChunks function reads the attributes in the same search cursor pass as the shapes (see
+    readChunks) so the values line up with the shapes they belong to without a second read or a join. The
+    values are turned into one numpy array per field so they can be used a whole chunk at a time. Inside
+    shareReads the finished (shapes, columns) chunks are what is kept, so the same list of shapes comes back
+    every time and can be decoded once with decodeShapes.
+    '''
+    def columnChunks():
+        for rows in cursorChunks(inputFile,[shapeToken]+list(fields),chunkSize):
+            rows = [row for row in rows if row[0]!=None]
+            columns = {}
+            for index, field in enumerate(fields):
+                columns[field] = np.array([row[index+1] for row in rows])
+            yield [row[0] for row in rows], columns
+    return replayChunks(readKey('columns',inputFile,[shapeToken]+list(fields),chunkSize),columnChunks())
+
+def selectAttributes(attributes, indexes):
+    '''
+    Parameters
+    ----------
+    attributes : This should be a dictionary or None.
+        This should map field names to arrays of values, one per feature.
+    indexes : This should be a numpy array.
+        This should be an integer or boolean array saying which features (and in what order) to keep.
+
+    Returns
+    -------
+    dict or None
+        The same fields holding only the chosen features, or None if attributes is None.
+    '''
+    if(attributes is None):
+        return None
+    return {name:np.asarray(values)[indexes] for name, values in attributes.items()}
+
+# The shapefile shape type numbers for the geometry types the tools write
+SHAPE_TYPES = {'POINT':1,'POLYLINE':3,'POLYGON':5,'MULTIPOINT':8}
+# The attribute field a shapefile gets when no other fields are given, like arcpy's CreateFeatureclass
+DEFAULT_FIELDS = [('Id','N',10,0)]
+
+def outputFields(inputFile = None, carryFields = None, extraFields = None):
+    '''
+    Parameters
+    ----------
+    inputFile : This should be a string representing a file path, optional
+        This should be a string representing a file path to the shape file the carried fields come from.
+    carryFields : This should be a list of strings, optional
+        This should be a list of the names of the inputFile's fields to copy to the output. The default is None.
+    extraFields : This should be a list of tuples, optional
+        This should be a list of (name, type, length, decimals) fields the tool adds itself, like the distance of
+        a multiple ring buffer. The default is None.
+
+    Returns
+    -------
+    list
+        The (name, type, length, decimals) fields of the output, ready for writeColumns.
+
+    Description
+    -----------
+    The outputFields function turns the inputFile's field descriptions (see describe) into the N (number) and
+    C (text) fields writeShapefile knows. Text, GUID and date fields become text fields (dates are written
+    like 2023-04-08 12:00:00), whole number fields become numbers with no decimals and the rest become numbers
+    with the field's scale (or 11 decimals when it has none, like a shapefile double). The default Id field is
+    kept unless a field of the same name is carried. Geometry, blob and raster fields cannot be carried and
+    raise a ValueError, as does a field the inputFile does not have.
+    '''
+    definitions = list(extraFields or [])
+    if(carryFields):
+        described = {field[0].lower():field for field in describe(inputFile)['fields']}
+        for name in carryFields:
+            if(name.lower() not in described):
+                raise ValueError("The field "+name+" is not in "+str(inputFile))
+            fieldName, fieldType, length, precision, scale = described[name.lower()]
+            if(fieldType in ('String','GUID','GlobalID')):
+                definitions.append((name,'C',max(1,min(int(length or 38),254)),0))
+            elif(fieldType=='Date'):
+                definitions.append((name,'C',19,0))
+            elif(fieldType in ('SmallInteger','Integer','OID','BigInteger')):
+                definitions.append((name,'N',max(int(precision or 0),10)+1,0))
+            elif(fieldType in ('Single','Double')):
+                definitions.append((name,'N',19,int(scale) if scale else 11))
+            else:
+                raise ValueError("The field "+name+" is a "+str(fieldType)+" field which cannot be carried over")
+    names = [definition[0].lower() for definition in definitions]
+    return [field for field in DEFAULT_FIELDS if field[0].lower() not in names]+definitions
+
+def ringsToColumns(features, close = True):
+    '''
+    Parameters
+    ----------
+    features : This should be a list of lists of numpy arrays.
+        This should be a list holding the parts (rings or lines) of every feature as (n, 2) arrays.
+    close : This should be a boolean, optional
+        This should be True to repeat the first point of every part at its end, like polygon rings need in a
+        shapefile. The default is True.
+
+    Returns
+    -------
+    tuple
+        A (coords, partOffsets, featureOffsets) tuple. coords is one (N, 2) array of every point, partOffsets
+        holds where every part starts in coords (with the total at the end) and featureOffsets holds where every
+        feature starts in the parts (with the total at the end).
+    '''
+    parts = [np.asarray(part,dtype=np.float64) for feature in features for part in feature]
+    if(close):
+        parts = [np.concatenate((part,part[:1])) for part in parts]
+    partSizes = np.array([len(part) for part in parts],dtype=np.int64)
+    featureSizes = np.array([len(feature) for feature in features],dtype=np.int64)
+    coords = np.concatenate(parts) if len(parts)>0 else np.zeros((0,2))
+    partOffsets = np.concatenate(([0],np.cumsum(partSizes)))
+    featureOffsets = np.concatenate(([0],np.cumsum(featureSizes)))
+    return coords, partOffsets, featureOffsets
+
+def columnsToFeatures(coords, partOffsets, featureOffsets):
+    '''
+    Parameters
+    ----------
+    coords, partOffsets, featureOffsets : These should be numpy arrays.
+        These should be the columns of a chunk (see ringsToColumns).
+
+    Returns
+    -------
+    list
+        A list holding the parts of every feature as (n, 2) arrays, undoing ringsToColumns. The parts are views
+        into coords so nothing is copied.
+    '''
+    coords = np.asarray(coords,dtype=np.float64).reshape(-1,2)
+    parts = np.split(coords,np.asarray(partOffsets)[1:-1]) if len(partOffsets)>1 else []
+    featureOffsets = np.asarray(featureOffsets).tolist()
+    return [parts[featureOffsets[index]:featureOffsets[index+1]] for index in range(len(featureOffsets)-1)]
+
+def wrapChunks(chunks):
+    '''
+    Parameters
+    ----------
+    chunks : This should be an iterable of tuples.
+        This should be an iterable of polygon column tuples in (longitude, latitude) degrees (see
+        writeShapefile), with closed rings.
+
+    Yields
+    ------
+    tuple
+        The same chunks with every longitude between -180 and 180. Features that cross the antimeridian, like
+        geodesic circles around points close to it, are cut along it with geometry.wrapRings into a part on
+        each side. Chunks that stay inside -180 to 180 are handed on as they are.
+    '''
+    for chunk in chunks:
+        coords = np.asarray(chunk[0],dtype=np.float64).reshape(-1,2)
+        if(len(coords)==0 or (coords[:,0].min()>=-180 and coords[:,0].max()<=180)):
+            yield chunk
+            continue
+        # The rings are opened up again since ringsToColumns closes them
+        features = [[part[:-1] for part in feature] for feature in columnsToFeatures(coords,chunk[1],chunk[2])]
+        outside = np.abs(coords[:,0])>180
+        pointStarts = np.asarray(chunk[1])[np.asarray(chunk[2])]
+        # Only the features with a point past the antimeridian are cut, the rest keep their rings
+        for index in np.flatnonzero(np.add.reduceat(outside,pointStarts[:-1])>0).tolist():
+            features[index] = geometry.wrapRings(features[index])
+        yield ringsToColumns(features)+tuple(chunk[3:])
+
+def blockToColumns(block, holes = None):
+    '''
+    Parameters
+    ----------
+    block : This should be a numpy array.
+        This should be a (N, K, 2) array holding N rings of K points each that do not repeat their first point,
+        like the circles from geometry.circleBlock.
+    holes : This should be a numpy array, optional
+        This should be a (N, J, 2) array holding one hole for each ring of block, turned the other way. The
+        default is None which gives polygons with no holes.
+
+    Returns
+    -------
+    tuple
+        A (coords, partOffsets, featureOffsets) tuple with one closed ring (and its closed hole) per feature,
+        made by slicing and reshaping rather than by looping.
+    '''
+    block = np.asarray(block,dtype=np.float64)
+    count, pointsPerRing = block.shape[0], block.shape[1]
+    closed = np.concatenate((block,block[:,:1]),axis=1)
+    if(holes is None):
+        return closed.reshape(-1,2), np.arange(count+1)*(pointsPerRing+1), np.arange(count+1)
+    holes = np.asarray(holes,dtype=np.float64)
+    pointsPerHole = holes.shape[1]
+    closed = np.concatenate((closed,holes,holes[:,:1]),axis=1)
+    partOffsets = np.zeros(2*count+1,dtype=np.int64)
+    partOffsets[1::2] = np.arange(count)*(pointsPerRing+pointsPerHole+2)+pointsPerRing+1
+    partOffsets[2::2] = np.arange(1,count+1)*(pointsPerRing+pointsPerHole+2)
+    return closed.reshape(-1,2), partOffsets, np.arange(count+1)*2
+
+def featurePointOffsets(shapeType, coords, partOffsets, featureOffsets):
+    '''
+    Parameters
+    ----------
+    shapeType : This should be a string.
+        This should be POINT, MULTIPOINT, POLYLINE or POLYGON.
+    coords, partOffsets, featureOffsets : These should be numpy arrays.
+        These should be the columns of a chunk (see ringsToColumns). POINT chunks have one feature per point
+        and leave both offsets as None, MULTIPOINT chunks leave partOffsets as None and their featureOffsets
+        point straight into coords.
+
+    Returns
+    -------
+    numpy array
+        An array holding where every feature starts in coords (with the total at the end).
+    '''
+    if(shapeType=='POINT'):
+        return np.arange(len(coords)+1)
+    if(shapeType=='MULTIPOINT'):
+        return np.asarray(featureOffsets)
+    return np.asarray(partOffsets)[np.asarray(featureOffsets)]
+
+def shapefileRecords(shapeType, coords, partOffsets, featureOffsets, firstRecord):
+    '''
+    Parameters
+    ----------
+    shapeType : This should be a string.
+        This should be POINT, MULTIPOINT, POLYLINE or POLYGON.
+    coords, partOffsets, featureOffsets : These should be numpy arrays.
+        These should be the columns of a chunk (see featurePointOffsets).
+    firstRecord : This should be an integer.
+        This should be the record number of the chunk's first feature (shapefile records count from 1).
+
+    Returns
+    -------
+    tuple
+        A (records, recordSizes) tuple holding the bytes of every record of the chunk one after another and
+        the size in bytes of every record.
+
+    Description
+    -----------
+    The shapefileRecords function packs a whole chunk of features into shapefile records at once. Every part
+    of a record (the fixed size header with its bounding box, the part start indexes and the points) is made
+    as a numpy array for all features together, viewed as bytes and scattered into one byte buffer at the
+    place each record's piece belongs, so there is no loop over features.
+    '''
+    coords = np.asarray(coords,dtype='<f8').reshape(-1,2)
+    pointStarts = featurePointOffsets(shapeType,coords,partOffsets,featureOffsets)
+    featureCount = len(pointStarts)-1
+    pointCounts = np.diff(pointStarts)
+    if(shapeType=='POINT'):
+        headerType = np.dtype([('number','>i4'),('length','>i4'),('type','<i4'),('xy','<f8',2)])
+        headers = np.empty(featureCount,dtype=headerType)
+        headers['xy'] = coords
+        partCounts = np.zeros(featureCount,dtype=np.int64)
+    else:
+        fields = [('number','>i4'),('length','>i4'),('type','<i4'),('box','<f8',4)]
+        if(shapeType!='MULTIPOINT'):
+            fields.append(('parts','<i4'))
+        fields.append(('points','<i4'))
+        headerType = np.dtype(fields)
+        headers = np.empty(featureCount,dtype=headerType)
+        headers['box'][:,0] = np.minimum.reduceat(coords[:,0],pointStarts[:-1])
+        headers['box'][:,1] = np.minimum.reduceat(coords[:,1],pointStarts[:-1])
+        headers['box'][:,2] = np.maximum.reduceat(coords[:,0],pointStarts[:-1])
+        headers['box'][:,3] = np.maximum.reduceat(coords[:,1],pointStarts[:-1])
+        headers['points'] = pointCounts
+        if(shapeType=='MULTIPOINT'):
+            partCounts = np.zeros(featureCount,dtype=np.int64)
+        else:
+            partCounts = np.diff(np.asarray(featureOffsets))
+            headers['parts'] = partCounts
+    headerSize = headerType.itemsize
+    pointBytes = 0 if shapeType=='POINT' else 16
+    recordSizes = headerSize+4*partCounts+pointBytes*pointCounts
+    headers['number'] = np.arange(firstRecord,firstRecord+featureCount)
+    # The record length leaves out the 8 byte record header and is counted in 16 bit words
+    headers['length'] = (recordSizes-8)//2
+    headers['type'] = SHAPE_TYPES[shapeType]
+    recordStarts = np.concatenate(([0],np.cumsum(recordSizes)))
+    records = np.zeros(int(recordStarts[-1]),dtype=np.uint8)
+    # Points fill every byte that is not a header or a part start, and they come in the same order as the
+    # records, so they can be dropped in with a mask instead of working out where every point goes
+    pointPlaces = np.ones(len(records),dtype=bool)
+    places = (recordStarts[:-1,np.newaxis]+np.arange(headerSize)).ravel()
+    records[places] = headers.view(np.uint8)
+    pointPlaces[places] = False
+    if(shapeType=='POLYLINE' or shapeType=='POLYGON'):
+        # Every part start is stored relative to its feature's first point
+        partOffsets = np.asarray(partOffsets)
+        partFeature = np.repeat(np.arange(featureCount),partCounts)
+        partIndex = np.arange(len(partFeature))-np.asarray(featureOffsets)[partFeature]
+        partStarts = (partOffsets[:-1]-pointStarts[partFeature]).astype('<i4')
+        places = ((recordStarts[partFeature]+headerSize+4*partIndex)[:,np.newaxis]+np.arange(4)).ravel()
+        records[places] = partStarts.view(np.uint8)
+        pointPlaces[places] = False
+    if(pointBytes>0):
+        records[pointPlaces] = np.ascontiguousarray(coords).view(np.uint8).ravel()
+    return records.tobytes(), recordSizes
+
+def dbfNames(fields):
+    '''
+    Parameters
+    ----------
+    fields : This should be a list of tuples.
+        This should be a list of (name, type, length, decimals) tuples.
+
+    Returns
+    -------
+    list
+        The name every field gets in the .dbf file, in the same order as the fields.
+
+    Description
+    -----------
+    A dBASE field name holds at most 10 characters. The dbfNames function cuts every name to that length and,
+    when that makes two names the same (ignoring case like ArcGIS does), gives the later one a numbered ending
+    instead, so population_2010 and population_2020 become population and populati_1.
+    '''
+    names = []
+    taken = set()
+    for field in fields:
+        name = field[0][:10]
+        number = 0
+        while(name.lower() in taken):
+            number += 1
+            ending = '_'+str(number)
+            name = field[0][:10-len(ending)]+ending
+        taken.add(name.lower())
+        names.append(name)
+    return names
+
+def numberText(values, length, decimals):
+    '''
+    Parameters
+    ----------
+    values : This should be a numpy array.
+        This should be an array of the numbers of one field.
+    length : This should be an integer.
+        This should be the width of the field.
+    decimals : This should be an integer.
+        This should be the number of decimals of the field.
+
+    Returns
+    -------
+    numpy array
+        An array of strings that are each at most length characters long.
+
+    Description
+    -----------
+    The numberText function writes the numbers with the field's decimals. A number that comes out too wide
+    for the field is written again with fewer decimals, and one that does not fit even with none (like 1e20
+    in a 19 wide field) is written in scientific notation, so digits are never cut off the end of a number.
+    '''
+    text = np.char.mod('%.'+str(decimals)+'f',values)
+    for fewer in range(decimals-1,-2,-1):
+        tooWide = np.char.str_len(text)>length
+        if(not tooWide.any()):
+            break
+        # Dropping the last decimal also drops the decimal point
+        if(fewer>=0):
+            text[tooWide] = np.char.mod('%.'+str(fewer)+'f',values[tooWide])
+        else:
+            # A sign, a digit, a decimal point and an exponent of up to e+308 take 8 characters
+            text[tooWide] = np.char.mod('%.'+str(max(length-8,0))+'e',values[tooWide])
+    return text
+
+def dbfRecords(fields, attributes, count):
+    '''
+    Parameters
+    ----------
+    fields : This should be a list of tuples.
+        This should be a list of (name, type, length, decimals) tuples where type is N (number) or C (text).
+    attributes : This should be a dictionary or None.
+        This should map field names to arrays of count values. Fields that are missing are filled with zeros
+        or blanks, and empty (None) values are left blank.
+    count : This should be an integer.
+        This should be the number of records to make.
+
+    Returns
+    -------
+    bytes
+        The dBASE records for the chunk, each starting with the blank not deleted flag.
+
+    Description
+    -----------
+    The dbfRecords function formats every field of the chunk at once with NumPy's string functions (numbers
+    right justified by numberText, text left justified) and lays the fixed width columns next to each other as
+    bytes. Text that is too long is cut on the last whole UTF-8 character that fits, never part way through
+    one.
+    '''
+    columns = [np.full((count,1),ord(' '),dtype=np.uint8)]
+    for name, fieldType, length, decimals in fields:
+        values = None if attributes is None else attributes.get(name)
+        if(fieldType=='C'):
+            if(values is None):
+                text = np.full(count,'')
+            else:
+                values = np.asarray(values,dtype=object)
+                text = np.where(values==None,'',values.astype(str))
+            text = np.char.ljust(text,length)
+        else:
+            values = np.zeros(count) if values is None else np.asarray(values,dtype=np.float64)
+            text = numberText(values,length,decimals)
+            # Empty (null) numbers are left blank
+            text = np.char.rjust(np.where(np.isnan(values),'',text),length)
+        encoded = np.char.encode(text,'utf-8')
+        width = max(encoded.dtype.itemsize,length+1)
+        column = np.frombuffer(encoded.astype('S'+str(width)).tobytes(),dtype=np.uint8).reshape(count,width).copy()
+        # A cut that lands on a continuation byte (10xxxxxx) would split a character, so it is moved back to
+        # the first byte of that character, which is at most 3 bytes earlier
+        cut = np.full(count,length)
+        rows = np.arange(count)
+        for step in range(3):
+            splits = (column[rows,cut]&0xC0)==0x80
+            cut -= splits
+        column[np.arange(width)>=cut[:,np.newaxis]] = ord(' ')
+        columns.append(column[:,:length])
+    return np.hstack(columns).tobytes()
+
+def dbfHeader(fields, count):
+    '''
+    Parameters
+    ----------
+    fields : This should be a list of tuples.
+        This should be a list of (name, type, length, decimals) tuples.
+    count : This should be an integer.
+        This should be the number of records in the file.
+
+    Returns
+    -------
+    bytes
+        The dBASE III header with one 32 byte descriptor per field (named by dbfNames) and the closing 0x0D.
+    '''
+    recordSize = 1+sum(field[2] for field in fields)
+    header = bytearray(32)
+    header[0] = 3
+    # The date of the last update as years since 1900, month and day
+    today = datetime.date.today()
+    header[1:4] = bytes([today.year-1900,today.month,today.day])
+    header[4:8] = np.array([count],dtype='<u4').tobytes()
+    header[8:10] = np.array([32+32*len(fields)+1],dtype='<u2').tobytes()
+    header[10:12] = np.array([recordSize],dtype='<u2').tobytes()
+    for name, (field, fieldType, length, decimals) in zip(dbfNames(fields),fields):
+        descriptor = bytearray(32)
+        descriptor[0:len(name)] = name.encode('ascii')
+        descriptor[11] = ord(fieldType)
+        descriptor[16] = length
+        descriptor[17] = decimals
+        header += descriptor
+    header += b'\x0d'
+    return bytes(header)
+
+def projectionText(spatialReference):
+    '''
+    Parameters
+    ----------
+    spatialReference : This should be an arcpy spatial reference, a string or None.
+        This should be the coordinate system to save in the .prj file.
+
+    Returns
+    -------
+    str or None
+        The well-known text of the coordinate system, or None when there is none.
+    '''
+    if(spatialReference is None):
+        return None
+    if(isinstance(spatialReference,str)):
+        return spatialReference
+    # arcpy adds the tolerances and resolution after the well-known text, separated by semicolons
+    text = spatialReference.exportToString().split(';')[0]
+    return text if len(text)>0 else None
+
+def writeShapefile(outputFile, shapeType, chunks, spatialReference = None, fields = None):
+    '''
+    Parameters
+    ----------
+    outputFile : This should be a string representing a file path.
+        This should be a string representing the path of the .shp file to write. Any existing file is replaced.
+    shapeType : This should be a string.
+        This should be POINT, MULTIPOINT, POLYLINE or POLYGON.
+    chunks : This should be an iterable of tuples.
+        This should be an iterable (usually a generator) that gives back (coords, partOffsets, featureOffsets)
+        or (coords, partOffsets, featureOffsets, attributes) tuples (see ringsToColumns and dbfRecords).
+        Polygon rings should be closed, with outer rings clockwise and holes counterclockwise.
+    spatialReference : This should be an arcpy spatial reference or a string, optional
+        This should be the coordinate system of the output, written to the .prj file. The default is None.
+    fields : This should be a list of tuples, optional
+        This should be a list of (name, type, length, decimals) attribute fields. The default of None gives the
+        single Id field that arcpy gives new shapefiles.
+
+    Returns
+    -------
+    int
+        The number of features that were written.
+
+    Description
+    -----------
+    The writeShapefile function writes the .shp, .shx and .dbf files of a shapefile straight from columns of
+    coordinates. Every chunk is turned into records all at once by shapefileRecords and dbfRecords and added
+    to the end of the files, so thousands of features are written per call and only one chunk is in memory.
+    The headers, which hold the file lengths, feature count and bounding box, are written again at the end
+    once those are known.
+    '''
+    if(fields is None):
+        fields = DEFAULT_FIELDS
+    base = os.path.splitext(outputFile)[0]
+    count = 0
+    fileWords = 50
+    box = np.array([np.inf,np.inf,-np.inf,-np.inf])
+    with open(base+'.shp','wb') as shp, open(base+'.shx','wb') as shx, open(base+'.dbf','wb') as dbf:
+        # Leave room for the headers, they are written once everything else is
+        shp.write(bytes(100))
+        shx.write(bytes(100))
+        dbf.write(dbfHeader(fields,0))
+        for chunk in chunks:
+            coords, partOffsets, featureOffsets = chunk[0], chunk[1], chunk[2]
+            attributes = chunk[3] if len(chunk)>3 else None
+            coords = np.asarray(coords,dtype=np.float64).reshape(-1,2)
+            records, recordSizes = shapefileRecords(shapeType,coords,partOffsets,featureOffsets,count+1)
+            if(len(recordSizes)==0):
+                continue
+            shp.write(records)
+            # The index holds the offset and content length of every record in 16 bit words
+            index = np.empty((len(recordSizes),2),dtype='>i4')
+            index[:,0] = fileWords+np.concatenate(([0],np.cumsum(recordSizes)[:-1]))//2
+            index[:,1] = (recordSizes-8)//2
+            shx.write(index.tobytes())
+            dbf.write(dbfRecords(fields,attributes,len(recordSizes)))
+            fileWords += int(recordSizes.sum())//2
+            count += len(recordSizes)
+            if(len(coords)>0):
+                box = np.concatenate((np.minimum(box[:2],coords.min(axis=0)),np.maximum(box[2:],coords.max(axis=0))))
+        dbf.write(b'\x1a')
+        if(count==0):
+            box = np.zeros(4)
+        for handle, words in ((shp,fileWords),(shx,50+4*count)):
+            header = np.zeros(1,dtype=[('code','>i4'),('unused','>i4',5),('length','>i4'),('version','<i4'),
+                                       ('type','<i4'),('box','<f8',4),('zm','<f8',4)])
+            header['code'] = 9994
+            header['length'] = words
+            header['version'] = 1000
+            header['type'] = SHAPE_TYPES[shapeType]
+            header['box'] = box
+            handle.seek(0)
+            handle.write(header.tobytes())
+        dbf.seek(0)
+        dbf.write(dbfHeader(fields,count))
+    projection = projectionText(spatialReference)
+    if(projection is not None):
+        with open(base+'.prj','w') as prj:
+            prj.write(projection)
+    with open(base+'.cpg','w') as cpg:
+        cpg.write('UTF-8')
+    return count
+
+def columnsToWKB(shapeType, coords, partOffsets, featureOffsets):
+    '''
+    Parameters
+    ----------
+    shapeType : This should be a string.
+        This should be MULTIPOINT, POLYLINE or POLYGON.
+    coords, partOffsets, featureOffsets : These should be numpy arrays.
+        These should be the columns of a chunk (see featurePointOffsets). Polygon rings should be closed.
+
+    Returns
+    -------
+    list
+        A list holding the well-known binary of every feature in the chunk.
+
+    Description
+    -----------
+    The columnsToWKB function packs a chunk into well-known binary the same way shapefileRecords packs it into
+    shapefile records: the feature headers and part headers of every feature are made as numpy arrays, viewed
+    as bytes and scattered into one buffer, and the points fill the bytes that are left, so there is no loop
+    over features. Well-known binary stores every polygon as its outer ring followed by its holes, so the
+    rings of each polygon feature are sorted to put its clockwise ring first. The few polygon features with
+    more than one outer ring need their holes matched up and are handed to geometry.ringsToWKB instead.
+    '''
+    coords = np.asarray(coords,dtype='<f8').reshape(-1,2)
+    featureOffsets = np.asarray(featureOffsets,dtype=np.int64)
+    headerType = np.dtype([('order','u1'),('type','<u4'),('count','<u4')])
+    if(shapeType=='MULTIPOINT'):
+        # Every point of a multipoint is a whole point geometry of its own
+        pointCounts = np.diff(featureOffsets)
+        body = np.empty(len(coords),dtype=[('order','u1'),('type','<u4'),('xy','<f8',2)])
+        body['order'] = 1
+        body['type'] = 1
+        body['xy'] = coords
+        headers = np.empty(len(pointCounts),dtype=headerType)
+        headers['order'] = 1
+        headers['type'] = 4
+        headers['count'] = pointCounts
+        recordSizes = headerType.itemsize+body.dtype.itemsize*pointCounts
+        recordStarts = np.concatenate(([0],np.cumsum(recordSizes)))
+        records = np.zeros(int(recordStarts[-1]),dtype=np.uint8)
+        bodyPlaces = np.ones(len(records),dtype=bool)
+        places = (recordStarts[:-1,np.newaxis]+np.arange(headerType.itemsize)).ravel()
+        records[places] = headers.view(np.uint8)
+        bodyPlaces[places] = False
+        records[bodyPlaces] = body.view(np.uint8)
+        return [records[recordStarts[k]:recordStarts[k+1]].tobytes() for k in range(len(pointCounts))]
+    partOffsets = np.asarray(partOffsets,dtype=np.int64)
+    partSizes = np.diff(partOffsets)
+    partCounts = np.diff(featureOffsets)
+    partFeature = np.repeat(np.arange(len(partCounts)),partCounts)
+    if(shapeType=='POLYGON'):
+        # The signed area of every closed ring, with each ring moved to its first point to keep the error small
+        owners, positions = geometry.expandRanges(partOffsets[:-1],partSizes)
+        local = coords-coords[partOffsets[:-1]][owners]
+        cross = np.zeros(len(coords))
+        cross[:-1] = local[:-1,0]*local[1:,1]-local[1:,0]*local[:-1,1]
+        # The last point of every ring pairs with the next ring's first point, which must not count
+        cross[partOffsets[1:]-1] = 0
+        areas = np.add.reduceat(cross,partOffsets[:-1]) if len(partSizes)>0 else np.zeros(0)
+        outer = areas<0
+        outerCounts = np.bincount(partFeature[outer],minlength=len(partCounts))
+        order = np.lexsort((~outer,partFeature))
+        owners, positions = geometry.expandRanges(partOffsets[:-1][order],partSizes[order])
+        coords = coords[positions]
+        partSizes = partSizes[order]
+        partOffsets = np.concatenate(([0],np.cumsum(partSizes)))
+        partType = np.dtype([('count','<u4')])
+        featureType = 3
+    else:
+        partType = headerType
+        featureType = 5
+    headers = np.empty(len(partCounts),dtype=headerType)
+    headers['order'] = 1
+    headers['type'] = featureType
+    headers['count'] = partCounts
+    partHeaders = np.empty(len(partSizes),dtype=partType)
+    partHeaders['count'] = partSizes
+    if(shapeType=='POLYLINE'):
+        partHeaders['order'] = 1
+        partHeaders['type'] = 2
+    pointStarts = partOffsets[featureOffsets]
+    recordSizes = headerType.itemsize+partType.itemsize*partCounts+16*np.diff(pointStarts)
+    recordStarts = np.concatenate(([0],np.cumsum(recordSizes)))
+    records = np.zeros(int(recordStarts[-1]),dtype=np.uint8)
+    pointPlaces = np.ones(len(records),dtype=bool)
+    places = (recordStarts[:-1,np.newaxis]+np.arange(headerType.itemsize)).ravel()
+    records[places] = headers.view(np.uint8)
+    pointPlaces[places] = False
+    # Every part header comes after the feature header, the earlier part headers and their points
+    partIndex = np.arange(len(partFeature))-featureOffsets[partFeature]
+    partStarts = recordStarts[partFeature]+headerType.itemsize+partType.itemsize*partIndex+16*(partOffsets[:-1]-pointStarts[partFeature])
+    places = (partStarts[:,np.newaxis]+np.arange(partType.itemsize)).ravel()
+    records[places] = partHeaders.view(np.uint8)
+    pointPlaces[places] = False
+    records[pointPlaces] = np.ascontiguousarray(coords).view(np.uint8).ravel()
+    wkbs = [records[recordStarts[k]:recordStarts[k+1]].tobytes() for k in range(len(partCounts))]
+    if(shapeType=='POLYGON'):
+        for feature in np.flatnonzero(outerCounts>1).tolist():
+            rings = [coords[partOffsets[part]:partOffsets[part+1]-1] for part in range(featureOffsets[feature],featureOffsets[feature+1])]
+            wkbs[feature] = geometry.ringsToWKB(rings)
+    return wkbs
+
+def writeColumns(outputFile, shapeType, chunks, spatialReference = None, fields = None):
+    '''
+    Parameters
+    ----------
+    outputFile : This should be a string representing a file path.
+        This should be a string representing the path of the feature class to write.
+    shapeType : This should be a string.
+        This should be POINT, MULTIPOINT, POLYLINE or POLYGON.
+    chunks : This should be an iterable of tuples.
+        This should be an iterable of column tuples (see writeShapefile).
+    spatialReference : This should be an arcpy spatial reference or a string, optional
+        This should be the coordinate system of the output. The default is None.
+    fields : This should be a list of tuples, optional
+        This should be a list of (name, type, length, decimals) attribute fields. The default is None.
+
+    Returns
+    -------
+    int
+        The number of features that were written.
+
+    Description
+    -----------
+    The writeColumns function is the bulk writer the buffer and clip functions use. Shapefiles are written by
+    writeShapefile whether or not ArcPy is around since that skips building a geometry object per feature.
+    Other outputs (like feature classes in a geodatabase) need ArcPy: the feature class is made with
+    CreateFeatureclass, its fields are added with their full names and every chunk is written through one
+    insert cursor, with the points given as SHAPE@XY pairs and other shapes as well-known binary built from the
+    columns by columnsToWKB. Nothing goes through a shapefile on the way, so these outputs have none of its
+    limits on file size, field names or text.
+    '''
+    if(arcpy is None or outputFile.lower().endswith('.shp')):
+        return writeShapefile(outputFile,shapeType,chunks,spatialReference,fields)
+    # The Id field only exists because a shapefile needs at least one field, a feature class does not
+    fields = [field for field in (fields or []) if field not in DEFAULT_FIELDS]
+    arcpy.management.CreateFeatureclass(os.path.dirname(outputFile),os.path.basename(outputFile),shapeType,
+                                        spatial_reference=spatialReference)
+    for name, fieldType, length, decimals in fields:
+        if(fieldType=='C'):
+            arcpy.management.AddField(outputFile,name,'TEXT',field_length=length)
+        else:
+            # Whole numbers that do not fit in a long are kept as doubles
+            arcpy.management.AddField(outputFile,name,'LONG' if decimals==0 and length<=11 else 'DOUBLE')
+    names = [field[0] for field in fields]
+    count = 0
+    with arcpy.da.InsertCursor(outputFile,['SHAPE@XY' if shapeType=='POINT' else 'SHAPE@WKB']+names) as iCursor:
+        for chunk in chunks:
+            coords = np.asarray(chunk[0],dtype=np.float64).reshape(-1,2)
+            attributes = chunk[3] if len(chunk)>3 else None
+            shapes = [tuple(xy) for xy in coords.tolist()] if shapeType=='POINT' else columnsToWKB(shapeType,coords,chunk[1],chunk[2])
+            columns = []
+            for name, fieldType, length, decimals in fields:
+                if(attributes is None or attributes.get(name) is None):
+                    columns.append([None]*len(shapes))
+                elif(fieldType=='C'):
+                    columns.append(np.asarray(attributes[name],dtype=object).tolist())
+                else:
+                    # Empty (NaN) numbers are written as nulls
+                    values = np.asarray(attributes[name],dtype=np.float64)
+                    columns.append(np.where(np.isnan(values),None,values if decimals>0 else np.round(values)).tolist())
+            for row in zip(shapes,*columns):
+                iCursor.insertRow(row)
+            count += len(shapes)
+    return count
@@ -0,0 +1,2386 @@
+"""
+Author: Caleb Cordsen
+Date: 10/17/2026
+
+Description: This file contains the NumPy geometry functions that help make the buffer and clip functions work!
+None of the functions in this file use ArcPy. They work on plain NumPy coordinate arrays so that
+they can be ran and tested on machines without an ArcPy environment.
+"""
+# Import necessary things
+import functools
+import numpy as np
+
+@functools.lru_cache(maxsize=64)
+def unitCircle(pointsForBuff):
+    '''
+    Parameters
+    ----------
+    pointsForBuff : This should be an integer.
+        This should be an integer representing how many points you want the circle to be composed of.
+
+    Returns
+    -------
+    numpy array
+        A read only (pointsForBuff, 2) array where each row is the (cos, sin) pair of one of the
+        angles that evenly divide up a circle.
+
+    Description
+    -----------
+    The unitCircle function builds the (x,y) points of a unit circle (a circle of radius 1 and center
+    point (0,0)) using np.linspace from 0 to 2 pi with endpoint=False, exactly like the original buffer loop did
+    with degrees. The table is cached per pointsForBuff so that it is only ever computed once no matter how
+    many circles are built from it. The array is marked read only since every caller shares it.
+    '''
+    # Get angles equal width apart from one another from 0 to 2 pi
+    angles = np.linspace(0,2*np.pi,pointsForBuff,endpoint=False)
+    # Stack cos for x and sin for y into one (pointsForBuff, 2) table
+    table = np.column_stack((np.cos(angles),np.sin(angles)))
+    # Make sure no caller can change the cached table
+    table.flags.writeable = False
+    return table
+
+def circleBlock(centers, radius, pointsForBuff = 87):
+    '''
+    Parameters
+    ----------
+    centers : This should be a numpy array.
+        This should be a (N, 2) array of the (x,y) center points of the circles.
+    radius : This should be a number or a numpy array.
+        This should be a number representing the radius of every circle or a (N,) array holding
+        one radius per center.
+    pointsForBuff : This should be an integer, optional
+        This should be an integer representing how many points each circle is composed of. The default
+        value is 87 since this is around the number of points Arc uses to make their buffers.
+
+    Returns
+    -------
+    numpy array
+        A (N, pointsForBuff, 2) array holding the (x,y) points of every circle.
+
+    Description
+    -----------
+    The circleBlock function applies the same unit circle transformation described in the
+    buffer.PointsBuffer docstring, but to every center at once. The cached unit circle table is multiplied
+    by the radius and added to the centers using NumPy broadcasting, so no Python loop runs per circle
+    or per vertex.
+    '''
+    # Make sure the centers are a (N, 2) float array
+    centers = np.asarray(centers,dtype=np.float64).reshape(-1,2)
+    # Turn the radius into a (N, 1, 1) or scalar shape that broadcasts against (N, K, 2)
+    radius = np.asarray(radius,dtype=np.float64)
+    if(radius.ndim>0):
+        radius = radius.reshape(-1,1,1)
+    # Scale the unit circle by the radius and move it to every center point
+    return centers[:,np.newaxis,:] + radius*unitCircle(pointsForBuff)[np.newaxis,:,:]
+
+# The WGS84 ellipsoid, used by the geodesic buffers
+SEMI_MAJOR_AXIS = 6378137.0
+FLATTENING = 1/298.257223563
+
+def geodesicCircleBlock(centers, radius, pointsForBuff = 87, semiMajorAxis = SEMI_MAJOR_AXIS, flattening = FLATTENING):
+    '''
+    Parameters
+    ----------
+    centers : This should be a numpy array.
+        This should be a (N, 2) array of (longitude, latitude) center points in degrees.
+    radius : This should be a number or a numpy array.
+        This should be a number representing the radius of every circle in meters or a (N,) array holding one
+        radius per center.
+    pointsForBuff : This should be an integer, optional
+        This should be an integer representing how many points each circle is composed of. The default is 87.
+    semiMajorAxis : This should be a number, optional
+        This should be the equatorial radius of the ellipsoid in meters. The default is the WGS84 one.
+    flattening : This should be a number, optional
+        This should be the flattening of the ellipsoid. The default is the WGS84 one.
+
+    Returns
+    -------
+    numpy array
+        A (N, pointsForBuff, 2) array holding the (longitude, latitude) points of every circle in degrees,
+        going around the same way as circleBlock's circles.
+
+    Description
+    -----------
+    The geodesicCircleBlock function finds the points that are exactly radius meters away from every center
+    along the surface of the ellipsoid, which is what a buffer on a layer in latitude and longitude should be.
+    It uses Vincenty's direct formula on whole (N, pointsForBuff) arrays: every center is paired with every
+    bearing at once and the iteration for the angular distance runs on all of them together until every one
+    has settled (it usually takes three or four rounds). The bearings come from the cached unit circle table,
+    since the sine and cosine of a bearing measured clockwise from north are just the cosine and sine of the
+    matching angle measured counterclockwise from east. Longitudes are not wrapped back into -180 to 180 here
+    so every circle stays one ring in the block; the buffers cut the circles that cross the antimeridian along
+    it with featureio.wrapChunks before they are written. Circles that hold a pole are not supported.
+    '''
+    centers = np.asarray(centers,dtype=np.float64).reshape(-1,2)
+    radius = np.asarray(radius,dtype=np.float64)
+    if(radius.ndim>0):
+        radius = radius.reshape(-1,1)
+    table = unitCircle(pointsForBuff)
+    sinBearing = table[np.newaxis,:,0]
+    cosBearing = table[np.newaxis,:,1]
+    semiMinorAxis = (1-flattening)*semiMajorAxis
+    # Reduced latitude of every center
+    tanU1 = (1-flattening)*np.tan(np.radians(centers[:,1]))[:,np.newaxis]
+    cosU1 = 1/np.sqrt(1+tanU1**2)
+    sinU1 = tanU1*cosU1
+    sigma1 = np.arctan2(tanU1,cosBearing)
+    sinAlpha = cosU1*sinBearing
+    cosSqAlpha = 1-sinAlpha**2
+    uSq = cosSqAlpha*(semiMajorAxis**2-semiMinorAxis**2)/semiMinorAxis**2
+    A = 1+uSq/16384*(4096+uSq*(-768+uSq*(320-175*uSq)))
+    B = uSq/1024*(256+uSq*(-128+uSq*(74-47*uSq)))
+    baseSigma = np.broadcast_to(radius/(semiMinorAxis*A),sigma1.shape)
+    sigma = baseSigma
+    for iteration in range(100):
+        cos2SigmaM = np.cos(2*sigma1+sigma)
+        sinSigma = np.sin(sigma)
+        cosSigma = np.cos(sigma)
+        deltaSigma = B*sinSigma*(cos2SigmaM+B/4*(cosSigma*(-1+2*cos2SigmaM**2)
+                                                  -B/6*cos2SigmaM*(-3+4*sinSigma**2)*(-3+4*cos2SigmaM**2)))
+        newSigma = baseSigma+deltaSigma
+        settled = np.all(np.abs(newSigma-sigma)<1e-12)
+        sigma = newSigma
+        if(settled):
+            break
+    cos2SigmaM = np.cos(2*sigma1+sigma)
+    sinSigma = np.sin(sigma)
+    cosSigma = np.cos(sigma)
+    x = sinU1*sinSigma-cosU1*cosSigma*cosBearing
+    latitudes = np.arctan2(sinU1*cosSigma+cosU1*sinSigma*cosBearing,(1-flattening)*np.sqrt(sinAlpha**2+x**2))
+    lambdas = np.arctan2(sinSigma*sinBearing,cosU1*cosSigma-sinU1*sinSigma*cosBearing)
+    C = flattening/16*cosSqAlpha*(4+flattening*(4-3*cosSqAlpha))
+    L = lambdas-(1-C)*flattening*sinAlpha*(sigma+C*sinSigma*(cos2SigmaM+C*cosSigma*(-1+2*cos2SigmaM**2)))
+    longitudes = centers[:,0][:,np.newaxis]+np.degrees(L)
+    return np.stack((longitudes,np.degrees(latitudes)),axis=-1)
+
+def metersPerDegree(latitudes, semiMajorAxis = SEMI_MAJOR_AXIS, flattening = FLATTENING):
+    '''
+    Parameters
+    ----------
+    latitudes : This should be a number or a numpy array.
+        This should be the latitude(s) in degrees to measure at.
+    semiMajorAxis : This should be a number, optional
+        This should be the equatorial radius of the ellipsoid in meters. The default is the WGS84 one.
+    flattening : This should be a number, optional
+        This should be the flattening of the ellipsoid. The default is the WGS84 one.
+
+    Returns
+    -------
+    tuple
+        A (metersPerDegreeLongitude, metersPerDegreeLatitude) tuple for the latitude(s).
+
+    Description
+    -----------
+    The metersPerDegree function uses the two radii of curvature of the ellipsoid (along the meridian and
+    across it) to say how many meters one degree of longitude and one degree of latitude cover at a latitude.
+    '''
+    eccentricitySq = flattening*(2-flattening)
+    phi = np.radians(latitudes)
+    denominator = 1-eccentricitySq*np.sin(phi)**2
+    meridian = semiMajorAxis*(1-eccentricitySq)/denominator**1.5
+    normal = semiMajorAxis/np.sqrt(denominator)
+    return np.radians(1)*normal*np.cos(phi), np.radians(1)*meridian
+
+def localMetricFrame(rings, semiMajorAxis = SEMI_MAJOR_AXIS, flattening = FLATTENING):
+    '''
+    Parameters
+    ----------
+    rings : This should be a list of numpy arrays.
+        This should be a list of (n, 2) arrays of (longitude, latitude) points in degrees, like the parts of one
+        feature.
+    semiMajorAxis : This should be a number, optional
+        This should be the equatorial radius of the ellipsoid in meters. The default is the WGS84 one.
+    flattening : This should be a number, optional
+        This should be the flattening of the ellipsoid. The default is the WGS84 one.
+
+    Returns
+    -------
+    tuple
+        A (toMeters, toDegrees) tuple of functions. toMeters turns an array of (longitude, latitude) points
+        into (x, y) meters from the middle of the rings and toDegrees turns them back.
+
+    Description
+    -----------
+    The localMetricFrame function lets the planar line and polygon buffers work on a layer in latitude and
+    longitude. It uses an azimuthal equidistant projection around the middle of the feature, which keeps every
+    distance from the middle true and stretches distances across that direction by only c/sin(c) at an
+    angular distance c from the middle (half a percent 10 degrees away). Simply scaling degrees by
+    metersPerDegree at the middle latitude was off by as much as 15% at the ends of a feature reaching over
+    20 degrees of latitude, since a degree of longitude shrinks with the cosine of the latitude. The projection
+    is worked out on a sphere and then stretched by metersPerDegree at the middle so that it also matches the
+    ellipsoid there. Longitudes are measured from the middle and wrapped, so a feature that crosses the
+    antimeridian stays in one piece. Straight edges in the frame are not straight in degrees, so long edges
+    should be cut up with densifyParts before they are turned back.
+    '''
+    points = np.concatenate(rings)
+    middle = (points.min(axis=0)+points.max(axis=0))/2
+    # Meters per radian across and along the meridian at the middle
+    scale = np.degrees(np.array(metersPerDegree(middle[1],semiMajorAxis,flattening)))
+    scale[0] /= np.cos(np.radians(middle[1]))
+    sinMiddle, cosMiddle = np.sin(np.radians(middle[1])), np.cos(np.radians(middle[1]))
+    def toMeters(points):
+        points = np.asarray(points,dtype=np.float64).reshape(-1,2)
+        longitudes = np.radians((points[:,0]-middle[0]+180)%360-180)
+        latitudes = np.radians(points[:,1])
+        cosC = np.clip(sinMiddle*np.sin(latitudes)+cosMiddle*np.cos(latitudes)*np.cos(longitudes),-1,1)
+        c = np.arccos(cosC)
+        # c/sin(c) goes to 1 at the middle
+        with np.errstate(divide='ignore',invalid='ignore'):
+            k = np.where(c>1e-12,c/np.sin(c),1.0)
+        x = k*np.cos(latitudes)*np.sin(longitudes)
+        y = k*(cosMiddle*np.sin(latitudes)-sinMiddle*np.cos(latitudes)*np.cos(longitudes))
+        return np.column_stack((x,y))*scale
+    def toDegrees(points):
+        points = np.asarray(points,dtype=np.float64).reshape(-1,2)/scale
+        c = np.hypot(points[:,0],points[:,1])
+        sinC, cosC = np.sin(c), np.cos(c)
+        with np.errstate(divide='ignore',invalid='ignore'):
+            ratio = np.where(c>1e-12,points[:,1]*sinC/c,0.0)
+        latitudes = np.arcsin(np.clip(cosC*sinMiddle+ratio*cosMiddle,-1,1))
+        longitudes = np.arctan2(points[:,0]*sinC,c*cosMiddle*cosC-points[:,1]*sinMiddle*sinC)
+        return np.column_stack((middle[0]+np.degrees(longitudes),np.degrees(latitudes)))
+    return toMeters, toDegrees
+
+def densifyParts(parts, maxLength, closed = True):
+    '''
+    Parameters
+    ----------
+    parts : This should be a list of numpy arrays.
+        This should be a list of (n, 2) rings or line parts.
+    maxLength : This should be a number.
+        This should be the longest an edge can be after it has been cut up.
+    closed : This should be a boolean, optional
+        This should be True for rings, whose last point joins back up with the first, and False for lines.
+        The default is True.
+
+    Returns
+    -------
+    list
+        The parts with evenly spaced points added along every edge longer than maxLength.
+    '''
+    densified = []
+    for part in parts:
+        part = np.asarray(part,dtype=np.float64).reshape(-1,2)
+        ends = np.roll(part,-1,axis=0) if closed else part[1:]
+        starts = part if closed else part[:-1]
+        pieces = np.maximum(np.ceil(np.hypot(*(ends-starts).T)/maxLength),1).astype(np.int64)
+        if(len(starts)==0 or pieces.max()==1):
+            densified.append(part)
+            continue
+        # Every edge gives its start plus pieces-1 points along it, and lines keep their last point
+        edges, steps = expandRanges(np.zeros(len(pieces),dtype=np.int64),pieces)
+        along = (steps/pieces[edges])[:,np.newaxis]
+        points = starts[edges]+along*(ends[edges]-starts[edges])
+        densified.append(points if closed else np.vstack((points,part[-1:])))
+    return densified
+
+def wrapRings(rings, tolerance = None):
+    '''
+    Parameters
+    ----------
+    rings : This should be a list of numpy arrays.
+        This should be the rings of an area in (longitude, latitude) degrees, outer rings clockwise and holes
+        counterclockwise, whose longitudes may run past -180 or 180.
+    tolerance : This should be a number, optional
+        This should be the snapping tolerance handed to clipRingsToBox. The default is None.
+
+    Returns
+    -------
+    list
+        The rings with every longitude between -180 and 180. An area that crossed the antimeridian is cut along
+        it into a piece on each side.
+    '''
+    rings = [np.asarray(ring,dtype=np.float64) for ring in rings]
+    if(len(rings)==0):
+        return rings
+    points = np.concatenate(rings)
+    low, high = points.min(axis=0), points.max(axis=0)
+    if(low[0]>=-180 and high[0]<=180):
+        return rings
+    box = (-180.0,low[1],180.0,high[1])
+    wrapped = []
+    # Every copy of the area shifted by a whole turn that reaches into -180 to 180 gives the piece on that side
+    for turn in range(int(np.floor((low[0]+180)/360)),int(np.ceil((high[0]-180)/360))+1):
+        shift = np.array([360.0*turn,0.0])
+        wrapped += clipRingsToBox([ring-shift for ring in rings],box,tolerance)
+    return wrapped
+
+# The floor and ceiling on how many points a buffer circle can be made of when the number of points
+# is picked from a maximum deviation
+MIN_ARC_POINTS = 8
+MAX_ARC_POINTS = 1024
+
+def segmentCount(radius, maxDeviation, minPoints = MIN_ARC_POINTS, maxPoints = MAX_ARC_POINTS):
+    '''
+    Parameters
+    ----------
+    radius : This should be a number or a numpy array.
+        This should be a number (or an array of numbers) representing the radius of the circle(s).
+    maxDeviation : This should be a number.
+        This should be a number in the same unit as radius representing the largest distance you
+        will allow between the true circle and the straight edges (chords) that make up the buffer circle.
+    minPoints : This should be an integer, optional
+        This should be an integer representing the fewest points a circle can be made of. The default is 8.
+    maxPoints : This should be an integer, optional
+        This should be an integer representing the most points a circle can be made of. The default is 1024.
+
+    Returns
+    -------
+    int or numpy array
+        The number of points each circle should be made of, as an int for a single radius or an
+        integer array for an array of radii.
+
+    Description
+    -----------
+    The segmentCount function picks how many points a circle needs so that none of its chords stray
+    more than maxDeviation away from the true circle. The gap between a chord and the arc it cuts off is
+    called the sagitta and for a circle of radius r split into n chords it is r*(1-cos(pi/n)). Solving
+    r*(1-cos(pi/n)) <= maxDeviation for n gives n >= pi/arccos(1-maxDeviation/r), which is rounded up and
+    then clamped between minPoints and maxPoints. A radius that is not bigger than maxDeviation gets minPoints.
+    '''
+    # Work on arrays so a single radius and many radii go through the same code
+    radii = np.asarray(radius,dtype=np.float64)
+    # Keep the ratio inside arccos's domain; radii smaller than maxDeviation end up at minPoints anyway
+    ratio = np.clip(1-maxDeviation/np.maximum(radii,np.finfo(np.float64).tiny),-1,1)
+    # Solve the sagitta formula for n. Guard the division since arccos(1) is 0 for a zero deviation
+    with np.errstate(divide='ignore'):
+        counts = np.ceil(np.pi/np.arccos(ratio))
+    counts = np.clip(np.nan_to_num(counts,posinf=maxPoints),minPoints,maxPoints).astype(np.int64)
+    # Give back a plain int when a single radius was inputted
+    if(counts.ndim==0):
+        return int(counts)
+    return counts
+
+def ringArea(ring):
+    '''
+    Parameters
+    ----------
+    ring : This should be a numpy array.
+        This should be a (n, 2) array of the (x,y) points of a ring. The ring should not repeat its
+        first point at the end.
+
+    Returns
+    -------
+    float
+        The signed area of the ring. It is negative for clockwise rings and positive for counterclockwise rings.
+
+    Description
+    -----------
+    The ringArea function uses the shoelace formula. The points are moved so the first point is at (0,0)
+    before the cross products are summed to keep the floating point error small on projected coordinates.
+    '''
+    ring = np.asarray(ring,dtype=np.float64)
+    if(len(ring)<3):
+        return 0.0
+    # Move the ring to the origin and sum the cross products of every edge
+    local = ring-ring[0]
+    nextPoints = np.roll(local,-1,axis=0)
+    return 0.5*float(np.sum(local[:,0]*nextPoints[:,1]-nextPoints[:,0]*local[:,1]))
+
+def expandRanges(starts, counts):
+    '''
+    Parameters
+    ----------
+    starts : This should be a numpy integer array.
+        This should be an array holding the first index of every range.
+    counts : This should be a numpy integer array.
+        This should be an array the same length as starts holding how long every range is.
+
+    Returns
+    -------
+    tuple of numpy arrays
+        A tuple (owners, positions) where owners says which range every expanded entry came from and
+        positions holds the indices starts[k], starts[k]+1, ..., starts[k]+counts[k]-1 for every range k.
+
+    Description
+    -----------
+    The expandRanges function turns many (start, count) ranges into one flat array of indices without a
+    Python loop. It is used whenever a variable number of things (candidate pairs, arc points, edges)
+    has to be generated for every entry of an array.
+    '''
+    counts = np.asarray(counts,dtype=np.int64)
+    starts = np.asarray(starts,dtype=np.int64)
+    total = int(counts.sum())
+    owners = np.repeat(np.arange(len(counts)),counts)
+    # Position inside each range is the running index minus where the range begins in the flat array
+    firstSlot = np.cumsum(counts)-counts
+    positions = np.arange(total,dtype=np.int64)-np.repeat(firstSlot,counts)+np.repeat(starts,counts)
+    return owners, positions
+
+def sweepPairs(boxesA, boxesB = None, chunkSize = 1<<22):
+    '''
+    Parameters
+    ----------
+    boxesA : This should be a numpy array.
+        This should be a (n, 4) array of bounding boxes as (minX, minY, maxX, maxY).
+    boxesB : This should be a numpy array, optional
+        This should be a (m, 4) array of bounding boxes. If it is None the boxes in boxesA are
+        compared against each other instead. The default is None.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing roughly how many candidate pairs are checked at once.
+
+    Returns
+    -------
+    tuple of numpy arrays
+        A tuple (indexA, indexB) of the pairs of boxes that overlap (touching counts as overlapping).
+        When boxesB is None every pair is only reported once with indexA < indexB.
+
+    Description
+    -----------
+    The sweepPairs function is a sort and sweep over the x axis. Boxes are sorted by their minX so that every
+    box whose minX falls inside another box's x range can be found with np.searchsorted. Those candidate pairs
+    are expanded with expandRanges and filtered down by their y ranges. Two boxes overlap in x exactly when
+    one of them starts inside the other, so for two different sets of boxes the sweep is done once from
+    each side. Candidates are processed in chunks so that memory stays bounded on big inputs. It works well
+    when there are few boxes or a few very large boxes, and bboxPairs uses it for those.
+    '''
+    boxesA = np.asarray(boxesA,dtype=np.float64).reshape(-1,4)
+    selfJoin = boxesB is None
+    if(selfJoin):
+        boxesB = boxesA
+    boxesB = np.asarray(boxesB,dtype=np.float64).reshape(-1,4)
+    foundA = []
+    foundB = []
+    # Sort the B boxes by minX once
+    orderB = np.argsort(boxesB[:,0],kind='stable')
+    sortedMinB = boxesB[orderB,0]
+
+    def sweep(queryBoxes, otherBoxes, otherOrder, firstSlot, lastSlot, swapped):
+        # Expand every query's slot range in chunks and keep the pairs that also overlap in y
+        counts = np.maximum(lastSlot-firstSlot,0)
+        cumulative = np.cumsum(counts)
+        begin = 0
+        while(begin<len(counts)):
+            # Grow the chunk until it holds about chunkSize candidates
+            end = int(np.searchsorted(cumulative,(cumulative[begin]-counts[begin])+chunkSize,side='right'))
+            end = max(end,begin+1)
+            queries, slots = expandRanges(firstSlot[begin:end],counts[begin:end])
+            queries = queries+begin
+            others = otherOrder[slots]
+            keep = ((otherBoxes[others,1]<=queryBoxes[queries,3]) & (otherBoxes[others,3]>=queryBoxes[queries,1]) &
+                    (otherBoxes[others,2]>=queryBoxes[queries,0]))
+            if(swapped):
+                foundA.append(others[keep])
+                foundB.append(queries[keep])
+            else:
+                foundA.append(queries[keep])
+                foundB.append(others[keep])
+            begin = end
+
+    if(selfJoin):
+        # Within one set, box i pairs with every later box (in minX order) that starts before i ends
+        rank = np.empty(len(orderB),dtype=np.int64)
+        rank[orderB] = np.arange(len(orderB))
+        lastSlot = np.searchsorted(sortedMinB,boxesA[:,2],side='right')
+        sweep(boxesA,boxesB,orderB,rank+1,lastSlot,False)
+        a = np.concatenate(foundA) if foundA else np.zeros(0,dtype=np.int64)
+        b = np.concatenate(foundB) if foundB else np.zeros(0,dtype=np.int64)
+        return np.minimum(a,b), np.maximum(a,b)
+    # B boxes that start inside each A box
+    firstSlot = np.searchsorted(sortedMinB,boxesA[:,0],side='left')
+    lastSlot = np.searchsorted(sortedMinB,boxesA[:,2],side='right')
+    sweep(boxesA,boxesB,orderB,firstSlot,lastSlot,False)
+    # A boxes that start strictly inside each B box (the ties were already found above)
+    orderA = np.argsort(boxesA[:,0],kind='stable')
+    sortedMinA = boxesA[orderA,0]
+    firstSlot = np.searchsorted(sortedMinA,boxesB[:,0],side='right')
+    lastSlot = np.searchsorted(sortedMinA,boxesB[:,2],side='right')
+    # Reuse the sweep with the roles of the two sets swapped
+    sweep(boxesB,boxesA,orderA,firstSlot,lastSlot,True)
+    a = np.concatenate(foundA) if foundA else np.zeros(0,dtype=np.int64)
+    b = np.concatenate(foundB) if foundB else np.zeros(0,dtype=np.int64)
+    return a, b
+
+# Boxes that would be copied into more grid cells than this are paired with the sweep instead
+MAX_BOX_CELLS = 16
+
+def bboxPairs(boxesA, boxesB = None, chunkSize = 1<<22, cellSize = None, depth = 0):
+    '''
+    Parameters
+    ----------
+    boxesA : This should be a numpy array.
+        This should be a (n, 4) array of bounding boxes as (minX, minY, maxX, maxY).
+    boxesB : This should be a numpy array, optional
+        This should be a (m, 4) array of bounding boxes. If it is None the boxes in boxesA are
+        compared against each other instead. The default is None.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing roughly how many candidate pairs are checked at once.
+    cellSize : This should be a number, optional
+        This should be a number representing the width of the grid cells. The default is None which uses the
+        median size of the boxes.
+    depth : This should be an integer, optional
+        This should be an integer counting how many times the large boxes have been paired again. Callers
+        leave it at 0.
+
+    Returns
+    -------
+    tuple of numpy arrays
+        A tuple (indexA, indexB) of the pairs of boxes that overlap (touching counts as overlapping).
+        When boxesB is None every pair is only reported once with indexA < indexB.
+
+    Description
+    -----------
+    The bboxPairs function finds overlapping boxes with a uniform grid. The grid cells are about the size of a
+    typical box and every box is listed in each cell it covers, so only boxes sharing a cell are ever
+    compared. A pair of overlapping boxes can share several cells, so a pair is only kept in the cell that holds
+    the lower left corner of the area where the two boxes overlap. Boxes that would cover many cells (a few
+    very long edges for example) are paired again on a grid sized for them instead so they do not blow up the
+    grid, and after a few levels of that (or for small inputs) sweepPairs is used.
+    '''
+    boxesA = np.asarray(boxesA,dtype=np.float64).reshape(-1,4)
+    selfJoin = boxesB is None
+    boxesB = boxesA if selfJoin else np.asarray(boxesB,dtype=np.float64).reshape(-1,4)
+    empty = np.zeros(0,dtype=np.int64)
+    if(len(boxesA)==0 or len(boxesB)==0):
+        return empty, empty
+    allBoxes = boxesA if selfJoin else np.vstack((boxesA,boxesB))
+    # Pick a cell size around the size of a typical box
+    sizes = np.maximum(allBoxes[:,2]-allBoxes[:,0],allBoxes[:,3]-allBoxes[:,1])
+    cell = float(np.median(sizes)) if cellSize == None else float(cellSize)
+    extent = float(max(np.max(allBoxes[:,2])-np.min(allBoxes[:,0]),np.max(allBoxes[:,3])-np.min(allBoxes[:,1])))
+    cell = max(cell,extent/max(np.sqrt(len(allBoxes)),1.0),1e-300)
+    if(len(allBoxes)<64 or extent<=cell or cell>=extent/2 or depth>=4):
+        return sweepPairs(boxesA,None if selfJoin else boxesB,chunkSize)
+    originX = np.min(allBoxes[:,0])
+    originY = np.min(allBoxes[:,1])
+
+    def cellsOf(boxes):
+        # The range of grid cells every box covers
+        lowX = np.floor((boxes[:,0]-originX)/cell).astype(np.int64)
+        lowY = np.floor((boxes[:,1]-originY)/cell).astype(np.int64)
+        highX = np.floor((boxes[:,2]-originX)/cell).astype(np.int64)
+        highY = np.floor((boxes[:,3]-originY)/cell).astype(np.int64)
+        return lowX, lowY, highX-lowX+1, highY-lowY+1
+
+    gridHeight = int(np.floor((np.max(allBoxes[:,3])-originY)/cell))+2
+
+    def entries(boxes):
+        # List every small box once per grid cell it covers as (cell key, box) entries
+        lowX, lowY, spanX, spanY = cellsOf(boxes)
+        small = np.flatnonzero(spanX*spanY<=MAX_BOX_CELLS)
+        owners, slots = expandRanges(np.zeros(len(small),dtype=np.int64),spanX[small]*spanY[small])
+        boxIndex = small[owners]
+        cellX = lowX[boxIndex]+slots%spanX[boxIndex]
+        cellY = lowY[boxIndex]+slots//spanX[boxIndex]
+        return cellX*gridHeight+cellY, boxIndex, np.flatnonzero(spanX*spanY>MAX_BOX_CELLS)
+
+    keysA, entryA, largeA = entries(boxesA)
+    if(selfJoin):
+        keysB, entryB, largeB = keysA, entryA, largeA
+    else:
+        keysB, entryB, largeB = entries(boxesB)
+    foundA = []
+    foundB = []
+    # Sort the B entries by cell so each A entry can find the B entries sharing its cell
+    orderB = np.argsort(keysB,kind='stable')
+    sortedKeysB = keysB[orderB]
+    firstSlot = np.searchsorted(sortedKeysB,keysA,side='left')
+    lastSlot = np.searchsorted(sortedKeysB,keysA,side='right')
+    if(selfJoin):
+        # Only pair an entry with the entries after it in the same cell
+        rank = np.empty(len(orderB),dtype=np.int64)
+        rank[orderB] = np.arange(len(orderB))
+        firstSlot = rank+1
+    counts = np.maximum(lastSlot-firstSlot,0)
+    cumulative = np.cumsum(counts)
+    begin = 0
+    while(begin<len(counts)):
+        end = int(np.searchsorted(cumulative,(cumulative[begin]-counts[begin])+chunkSize,side='right'))
+        end = max(end,begin+1)
+        owners, slots = expandRanges(firstSlot[begin:end],counts[begin:end])
+        owners = owners+begin
+        a = entryA[owners]
+        b = entryB[orderB[slots]]
+        boxA = boxesA[a]
+        boxB = boxesB[b]
+        keep = ((boxA[:,0]<=boxB[:,2]) & (boxB[:,0]<=boxA[:,2]) & (boxA[:,1]<=boxB[:,3]) & (boxB[:,1]<=boxA[:,3]))
+        # Keep the pair only in the cell holding the lower left corner of the overlap
+        cornerX = np.floor((np.maximum(boxA[:,0],boxB[:,0])-originX)/cell).astype(np.int64)
+        cornerY = np.floor((np.maximum(boxA[:,1],boxB[:,1])-originY)/cell).astype(np.int64)
+        keep &= cornerX*gridHeight+cornerY==keysA[owners]
+        if(selfJoin):
+            keep &= a!=b
+        foundA.append(a[keep])
+        foundB.append(b[keep])
+        begin = end
+    # Large boxes are paired with everything again on a grid sized for the large boxes
+    def largeSize(large, boxes):
+        return float(np.median(np.maximum(boxes[large,2]-boxes[large,0],boxes[large,3]-boxes[large,1])))
+    if(len(largeA)>0):
+        pairA, pairB = bboxPairs(boxesA[largeA],boxesB,chunkSize,largeSize(largeA,boxesA),depth+1)
+        pairA = largeA[pairA]
+        keep = np.ones(len(pairA),dtype=bool)
+        if(selfJoin):
+            # Skip a box paired with itself, and pairs of two large boxes are found from both sides so keep one
+            keep = (pairA!=pairB) & ~(np.isin(pairB,largeA) & (pairA>pairB))
+        foundA.append(pairA[keep])
+        foundB.append(pairB[keep])
+    if(len(largeB)>0 and not selfJoin):
+        pairB, pairA = bboxPairs(boxesB[largeB],boxesA,chunkSize,largeSize(largeB,boxesB),depth+1)
+        pairB = largeB[pairB]
+        # Pairs where both boxes are large were already found above
+        keep = ~np.isin(pairA,largeA)
+        foundA.append(pairA[keep])
+        foundB.append(pairB[keep])
+    a = np.concatenate(foundA) if foundA else empty
+    b = np.concatenate(foundB) if foundB else empty
+    if(selfJoin):
+        return np.minimum(a,b), np.maximum(a,b)
+    return a, b
+
+
+# The (column, row) offsets of a grid cell and the eight cells around it
+NEIGHBOUR_CELLS = np.array([[dx,dy] for dx in (-1,0,1) for dy in (-1,0,1)],dtype=np.int64)
+
+def cellKeys(cells):
+    '''
+    Parameters
+    ----------
+    cells : This should be a numpy array.
+        This should be a (n, 2) array of integer (column, row) grid cells or of (x, y) coordinates.
+
+    Returns
+    -------
+    numpy array
+        A complex array holding x + yj for every row. NumPy sorts and searches complex numbers by their real part
+        and then their imaginary part, so rows can be looked up with np.searchsorted at full speed. Cell numbers
+        are exact up to 2**53.
+    '''
+    cells = np.asarray(cells,dtype=np.float64)
+    return cells[:,0]+1j*cells[:,1]
+
+def pointMatches(points, targets, tolerance, chunkSize = 1<<20):
+    '''
+    Parameters
+    ----------
+    points : This should be a numpy array.
+        This should be a (n, 2) array of the (x, y) points to look up.
+    targets : This should be a numpy array.
+        This should be a (m, 2) array of the (x, y) points to look them up in.
+    tolerance : This should be a number.
+        This should be a number representing how far apart two points can be and still be the same point. 0
+        only matches points with exactly the same coordinates.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing about how many points are looked up at a time. The default is
+        1<<20.
+
+    Returns
+    -------
+    numpy array
+        A boolean array saying for every point whether there is a target within tolerance of it.
+
+    Description
+    -----------
+    The pointMatches function snaps the targets to a grid of tolerance sized cells and sorts them by their cell
+    (with cellKeys), which works like a hashed set of cells that NumPy can search a whole array at once.
+    Any target within tolerance of a point is in the point's cell or one of the eight around it, so every
+    point looks those nine cells up with np.searchsorted and only the targets in them are measured. Sorting
+    the targets once and searching for every point is O((n + m) log m) rather than comparing every point with
+    every target. With a tolerance of 0 the coordinates themselves are sorted and looked up.
+    '''
+    points = np.asarray(points,dtype=np.float64).reshape(-1,2)
+    targets = np.asarray(targets,dtype=np.float64).reshape(-1,2)
+    targets = targets[np.isfinite(targets).all(axis=1)]
+    matched = np.zeros(len(points),dtype=bool)
+    valid = np.flatnonzero(np.isfinite(points).all(axis=1))
+    if(len(valid)==0 or len(targets)==0):
+        return matched
+    if(tolerance<=0):
+        sortedKeys = np.sort(cellKeys(targets))
+        keys = cellKeys(points[valid])
+        matched[valid] = np.searchsorted(sortedKeys,keys,'right')>np.searchsorted(sortedKeys,keys,'left')
+        return matched
+    # Work relative to the lower left corner of the data so the cell numbers stay small
+    origin = np.minimum(points[valid].min(axis=0),targets.min(axis=0))
+    targetCells = np.floor((targets-origin)/tolerance).astype(np.int64)
+    keys = cellKeys(targetCells)
+    order = np.argsort(keys,kind='stable')
+    sortedKeys = keys[order]
+    sortedTargets = targets[order]
+    step = max(int(chunkSize)//len(NEIGHBOUR_CELLS),1)
+    for start in range(0,len(valid),step):
+        indexes = valid[start:start+step]
+        chunk = points[indexes]
+        cells = np.floor((chunk-origin)/tolerance).astype(np.int64)
+        keys = cellKeys((cells[:,None,:]+NEIGHBOUR_CELLS[None,:,:]).reshape(-1,2))
+        left = np.searchsorted(sortedKeys,keys,'left')
+        right = np.searchsorted(sortedKeys,keys,'right')
+        owners, positions = expandRanges(left,right-left)
+        owners = owners//len(NEIGHBOUR_CELLS)
+        offset = chunk[owners]-sortedTargets[positions]
+        near = np.sum(offset*offset,axis=1)<=tolerance*tolerance
+        matched[indexes[owners[near]]] = True
+    return matched
+
+def segmentDistances(points, starts, ends):
+    '''
+    Parameters
+    ----------
+    points : This should be a numpy array.
+        This should be a (n, 2) array of (x, y) points.
+    starts : This should be a numpy array.
+        This should be a (n, 2) array of the first points of n segments.
+    ends : This should be a numpy array.
+        This should be a (n, 2) array of the last points of the segments.
+
+    Returns
+    -------
+    numpy array
+        The distance from every point to the segment in the same row. A point is measured to the closest point
+        of the segment, which is one of its ends when the point is past them, and a segment with both ends on
+        the same point is measured like a point.
+    '''
+    chord = ends-starts
+    chordSquared = np.sum(chord*chord,axis=1)
+    offset = points-starts
+    along = np.clip(np.sum(offset*chord,axis=1)/np.where(chordSquared>0,chordSquared,1.0),0.0,1.0)
+    return np.hypot(*(offset-along[:,None]*chord).T)
+
+def pointsOnSegments(points, starts, ends, tolerance, chunkSize = 1<<20):
+    '''
+    Parameters
+    ----------
+    points : This should be a numpy array.
+        This should be a (n, 2) array of the (x, y) points to test.
+    starts : This should be a numpy array.
+        This should be a (m, 2) array of the first points of the segments of the lines.
+    ends : This should be a numpy array.
+        This should be a (m, 2) array of the last points of the segments.
+    tolerance : This should be a number.
+        This should be a number representing how far from a segment a point can be and still be on it.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing about how many points are tested at a time. The default is
+        1<<20.
+
+    Returns
+    -------
+    numpy array
+        A boolean array saying for every point whether it is within tolerance of any of the segments.
+
+    Description
+    -----------
+    The pointsOnSegments function pairs every point with the segments whose bounding boxes, grown by the
+    tolerance, hold it using bboxPairs (the same grid index the dissolve groups with), so only the few
+    segments near a point are ever measured. The candidate pairs are then measured all at once with
+    segmentDistances. A point near several segments or lines still only comes back as True once.
+    '''
+    points = np.asarray(points,dtype=np.float64).reshape(-1,2)
+    starts = np.asarray(starts,dtype=np.float64).reshape(-1,2)
+    ends = np.asarray(ends,dtype=np.float64).reshape(-1,2)
+    matched = np.zeros(len(points),dtype=bool)
+    valid = np.flatnonzero(np.isfinite(points).all(axis=1))
+    if(len(valid)==0 or len(starts)==0):
+        return matched
+    segmentBoxes = np.hstack((np.minimum(starts,ends)-tolerance,np.maximum(starts,ends)+tolerance))
+    for start in range(0,len(valid),max(int(chunkSize),1)):
+        indexes = valid[start:start+chunkSize]
+        chunk = points[indexes]
+        pointIndex, segmentIndex = bboxPairs(np.hstack((chunk,chunk)),segmentBoxes)
+        near = segmentDistances(chunk[pointIndex],starts[segmentIndex],ends[segmentIndex])<=tolerance
+        matched[indexes[pointIndex[near]]] = True
+    return matched
+
+def segmentOverlaps(starts, ends, clipStarts, clipEnds, tolerance):
+    '''
+    Parameters
+    ----------
+    starts : This should be a numpy array.
+        This should be a (n, 2) array of the first points of the segments of the input lines.
+    ends : This should be a numpy array.
+        This should be a (n, 2) array of the last points of the segments of the input lines.
+    clipStarts : This should be a numpy array.
+        This should be a (m, 2) array of the first points of the segments of the clip lines.
+    clipEnds : This should be a numpy array.
+        This should be a (m, 2) array of the last points of the segments of the clip lines.
+    tolerance : This should be a number.
+        This should be a number representing how far apart two segments can be and still lie on each other.
+
+    Returns
+    -------
+    tuple of numpy arrays
+        A (segments, fromAlong, toAlong) tuple of the pieces of the input segments that lie on a clip segment,
+        sorted by segment and then along it. Every piece is the part of segment segments[k] from fromAlong[k]
+        to toAlong[k], measured as a fraction of the way from its start to its end, and pieces that touch or
+        overlap on the same segment are merged into one.
+
+    Description
+    -----------
+    The segmentOverlaps function pairs every input segment with the clip segments whose bounding boxes, grown
+    by the tolerance, touch its own using bboxPairs, so only nearby segments are ever compared. The ends of
+    every paired clip segment are projected onto the input segment to find the stretch of it they span, and
+    the stretch is kept when it is longer than the tolerance and both of its ends are within the tolerance
+    of the clip segment (so the whole stretch is, since both are straight). A stretch that ends within the
+    tolerance of an end of the segment is taken to reach it, so whole segments come back whole. Both checks
+    allow for rounding of a billionth of the segment's length, so exact overlaps are kept with a tolerance of 0
+    even when the clip line has vertices the input line does not. That keeps a segment that only
+    partly lies on a clip line, cut to the part that does, and drops lines that only cross or touch. The kept
+    stretches of every segment are then merged by sorting them and starting a new piece wherever a stretch
+    begins more than the tolerance (or rounding) past the furthest end of the ones before it.
+    '''
+    starts = np.asarray(starts,dtype=np.float64).reshape(-1,2)
+    ends = np.asarray(ends,dtype=np.float64).reshape(-1,2)
+    clipStarts = np.asarray(clipStarts,dtype=np.float64).reshape(-1,2)
+    clipEnds = np.asarray(clipEnds,dtype=np.float64).reshape(-1,2)
+    empty = (np.zeros(0,dtype=np.int64),np.zeros(0),np.zeros(0))
+    if(len(starts)==0 or len(clipStarts)==0):
+        return empty
+    boxes = np.hstack((np.minimum(starts,ends)-tolerance,np.maximum(starts,ends)+tolerance))
+    clipBoxes = np.hstack((np.minimum(clipStarts,clipEnds),np.maximum(clipStarts,clipEnds)))
+    segmentIndex, clipIndex = bboxPairs(boxes,clipBoxes)
+    # Project the ends of the clip segment onto the input segment and keep the stretch of it they span
+    chord = ends[segmentIndex]-starts[segmentIndex]
+    length = np.hypot(chord[:,0],chord[:,1])
+    lengthSquared = np.where(length>0,length*length,1.0)
+    alongA = np.sum((clipStarts[clipIndex]-starts[segmentIndex])*chord,axis=1)/lengthSquared
+    alongB = np.sum((clipEnds[clipIndex]-starts[segmentIndex])*chord,axis=1)/lengthSquared
+    fromAlong = np.clip(np.minimum(alongA,alongB),0.0,1.0)
+    toAlong = np.clip(np.maximum(alongA,alongB),0.0,1.0)
+    # Stretches that reach within the tolerance (or rounding) of an end of the segment run all the way to it
+    snap = np.maximum(tolerance,length*1e-9)
+    fromAlong = np.where(fromAlong*length<=snap,0.0,fromAlong)
+    toAlong = np.where((1.0-toAlong)*length<=snap,1.0,toAlong)
+    kept = (length>0) & ((toAlong-fromAlong)*length>tolerance)
+    for along in (fromAlong,toAlong):
+        point = starts[segmentIndex]+along[:,None]*chord
+        kept &= segmentDistances(point,clipStarts[clipIndex],clipEnds[clipIndex])<=snap
+    segmentIndex, fromAlong, toAlong, length, snap = segmentIndex[kept], fromAlong[kept], toAlong[kept], length[kept], snap[kept]
+    if(len(segmentIndex)==0):
+        return empty
+    # Merge the stretches of every segment that are less than the tolerance apart, offsetting every segment by 2
+    # so one running maximum covers them all
+    order = np.lexsort((fromAlong,segmentIndex))
+    segmentIndex, fromAlong, toAlong, length, snap = segmentIndex[order], fromAlong[order], toAlong[order], length[order], snap[order]
+    reach = np.maximum.accumulate(toAlong+2.0*segmentIndex)
+    gaps = (fromAlong[1:]+2.0*segmentIndex[1:]-reach[:-1])*length[1:]
+    pieceStarts = np.concatenate(([True],gaps>snap[1:]))
+    firsts = np.flatnonzero(pieceStarts)
+    return segmentIndex[firsts], fromAlong[firsts], np.maximum.reduceat(toAlong,firsts)
+
+def overlapLines(starts, ends, partIds, segments, fromAlong, toAlong):
+    '''
+    Parameters
+    ----------
+    starts : This should be a numpy array.
+        This should be a (n, 2) array of the first points of the segments of the input lines, in the order they
+        run along every part.
+    ends : This should be a numpy array.
+        This should be a (n, 2) array of the last points of the segments.
+    partIds : This should be a numpy array.
+        This should be an integer array saying which part every segment belongs to.
+    segments, fromAlong, toAlong : These should be numpy arrays.
+        These should be the pieces of the segments that are kept (see segmentOverlaps).
+
+    Returns
+    -------
+    tuple of numpy arrays
+        A (coords, partOffsets, pieceSegments) tuple of the lines the pieces make. coords holds the points of
+        every line one after another, partOffsets where every line starts in coords (with the total at the end)
+        and pieceSegments the segment every line starts on.
+
+    Description
+    -----------
+    The overlapLines function joins the pieces back into lines. A piece that runs to the end of its segment is
+    joined to a piece that starts at the beginning of the next segment of the same part, so a stretch of an
+    input line that lies on the clip lines comes back as one line with the input's own vertices instead of
+    one two point line per segment.
+    '''
+    segments = np.asarray(segments,dtype=np.int64)
+    if(len(segments)==0):
+        return np.zeros((0,2)), np.zeros(1,dtype=np.int64), segments
+    chord = ends[segments]-starts[segments]
+    pieceFrom = starts[segments]+fromAlong[:,None]*chord
+    pieceTo = np.where((toAlong==1.0)[:,None],ends[segments],starts[segments]+toAlong[:,None]*chord)
+    pieceFrom = np.where((fromAlong==0.0)[:,None],starts[segments],pieceFrom)
+    # A piece carries on the line of the piece before it when they meet at the vertex between their segments
+    joined = np.concatenate(([False],(segments[1:]==segments[:-1]+1) & (partIds[segments[1:]]==partIds[segments[:-1]])
+                             & (toAlong[:-1]==1.0) & (fromAlong[1:]==0.0)))
+    lineStarts = ~joined
+    # Every line is its first piece's start followed by the end of each of its pieces
+    endSlots = np.arange(len(segments))+np.cumsum(lineStarts)
+    coords = np.zeros((len(segments)+int(lineStarts.sum()),2))
+    coords[endSlots] = pieceTo
+    coords[endSlots[lineStarts]-1] = pieceFrom[lineStarts]
+    partOffsets = np.concatenate((endSlots[lineStarts]-1,[len(coords)]))
+    return coords, partOffsets, segments[lineStarts]
+
+def rayCrossings(pointsX, pointsY, startsX, startsY, endsX, endsY):
+    '''
+    Parameters
+    ----------
+    pointsX, pointsY : These should be numpy arrays.
+        These should be the x and y coordinates of the test points.
+    startsX, startsY, endsX, endsY : These should be numpy arrays.
+        These should be the x and y coordinates of the start and end of the edge that each test point is
+        paired with. All six arrays must be the same length (or broadcast together).
+
+    Returns
+    -------
+    numpy array
+        An integer array holding +1, -1 or 0 for every (point, edge) pair.
+
+    Description
+    -----------
+    The rayCrossings function is the building block of the winding number. It shoots a ray from each test point
+    straight to the left (towards smaller x) and checks whether the paired edge crosses it. An edge going
+    downwards across the ray adds +1 and an edge going upwards adds -1, so summing over all the edges of a
+    counterclockwise ring gives +1 for a point inside it and a clockwise ring gives -1. The y test is half open
+    so that a ray passing exactly through a vertex is only counted once. Edges that touch the test point
+    itself give a cross product of exactly zero and are never counted.
+    '''
+    # The cross product says which side of the edge the point is on
+    side = (endsX-startsX)*(pointsY-startsY)-(pointsX-startsX)*(endsY-startsY)
+    # Downward edges with the point on their left cross the leftward ray
+    down = (startsY>pointsY) & (endsY<=pointsY) & (side>0)
+    # Upward edges with the point on their right cross the leftward ray
+    up = (startsY<=pointsY) & (endsY>pointsY) & (side<0)
+    return down.astype(np.int64)-up.astype(np.int64)
+
+def countChunks(counts, chunkSize):
+    '''
+    Parameters
+    ----------
+    counts : This should be a numpy integer array.
+        This should be how many pairs every entry expands to (like the number of edges of every point's polygon).
+    chunkSize : This should be an integer.
+        This should be roughly how many pairs to handle at once.
+
+    Yields
+    ------
+    tuple
+        (begin, end) slices of the entries that expand to about chunkSize pairs together (an entry bigger than
+        chunkSize gets a slice of its own).
+    '''
+    cumulative = np.cumsum(counts)
+    begin = 0
+    while(begin<len(counts)):
+        end = int(np.searchsorted(cumulative,(cumulative[begin]-counts[begin])+chunkSize,side='right'))
+        end = max(end,begin+1)
+        yield begin, end
+        begin = end
+
+def polygonEdges(polygons):
+    '''
+    Parameters
+    ----------
+    polygons : This should be a list of lists of numpy arrays.
+        This should be a list of polygons where every polygon is a list of (n, 2) rings that do not repeat their
+        first point (like geometry.wkbParts gives back).
+
+    Returns
+    -------
+    tuple
+        A (starts, ends, offsets, boxes) tuple where starts and ends hold the first and last point of every
+        edge of every ring, the edges of polygon k are starts[offsets[k]:offsets[k+1]], and boxes holds the
+        (minX, minY, maxX, maxY) box of every polygon (NaN for a polygon without rings).
+    '''
+    starts = [np.zeros((0,2))]
+    ends = [np.zeros((0,2))]
+    counts = np.zeros(len(polygons),dtype=np.int64)
+    boxes = np.full((len(polygons),4),np.nan)
+    for index, rings in enumerate(polygons):
+        rings = [np.asarray(ring,dtype=np.float64).reshape(-1,2) for ring in rings if len(ring)>0]
+        if(len(rings)==0):
+            continue
+        for ring in rings:
+            starts.append(ring)
+            ends.append(np.roll(ring,-1,axis=0))
+        counts[index] = sum(len(ring) for ring in rings)
+        points = np.concatenate(rings)
+        boxes[index] = np.concatenate((points.min(axis=0),points.max(axis=0)))
+    return np.concatenate(starts), np.concatenate(ends), np.concatenate(([0],np.cumsum(counts))), boxes
+
+def pointsInPolygons(points, polygons, tolerance = 0.0, chunkSize = 1<<22):
+    '''
+    Parameters
+    ----------
+    points : This should be a numpy array.
+        This should be a (n, 2) array of the (x, y) points to test.
+    polygons : This should be a list of lists of numpy arrays.
+        This should be a list of polygons where every polygon is a list of rings, outer rings clockwise and
+        holes counterclockwise (like geometry.wkbParts gives back).
+    tolerance : This should be a number, optional
+        This should be a number representing how far outside a polygon a point can be and still count as on
+        its boundary. The default is 0 which only counts points exactly on the boundary.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing roughly how many (point, edge) pairs are checked at once.
+
+    Returns
+    -------
+    numpy array
+        A boolean array saying for every point whether it is inside or on the boundary of any of the polygons.
+
+    Description
+    -----------
+    The pointsInPolygons function first pairs every point with the polygons whose bounding boxes, grown by the
+    tolerance, hold it using bboxPairs, so a point is never tested against polygons far away from it. Every
+    (point, polygon) pair is then laid out against every edge of the polygon with expandRanges, and one call to
+    rayCrossings and one to segmentDistances test all of them at once. A point is inside a polygon when the
+    crossings of its edges add up to a winding number that is not 0 (so points in holes are left out) and is
+    on the boundary when one of the edges is within tolerance of it. The pairs are worked through in chunks of
+    about chunkSize (point, edge) pairs, and pairs whose point was already found inside an earlier polygon are
+    dropped before their chunk is tested, so every point comes back True at most once.
+    '''
+    points = np.asarray(points,dtype=np.float64).reshape(-1,2)
+    matched = np.zeros(len(points),dtype=bool)
+    valid = np.flatnonzero(np.isfinite(points).all(axis=1))
+    starts, ends, offsets, boxes = polygonEdges(polygons)
+    filled = np.flatnonzero(np.isfinite(boxes).all(axis=1))
+    if(len(valid)==0 or len(filled)==0):
+        return matched
+    grown = boxes[filled]+np.array([-tolerance,-tolerance,tolerance,tolerance])
+    pairPoints, pairPolygons = bboxPairs(np.hstack((points[valid],points[valid])),grown)
+    pairPoints, pairPolygons = valid[pairPoints], filled[pairPolygons]
+    # Work through the pairs in chunks that hold about chunkSize (point, edge) pairs
+    edgeCounts = offsets[pairPolygons+1]-offsets[pairPolygons]
+    for begin, end in countChunks(edgeCounts,chunkSize):
+        # Points already inside an earlier polygon do not need testing again
+        pending = np.arange(begin,end)[~matched[pairPoints[begin:end]]]
+        if(len(pending)==0):
+            continue
+        owners, edges = expandRanges(offsets[pairPolygons[pending]],edgeCounts[pending])
+        testPoints = points[pairPoints[pending]][owners]
+        crossings = rayCrossings(testPoints[:,0],testPoints[:,1],starts[edges,0],starts[edges,1],ends[edges,0],ends[edges,1])
+        winding = np.rint(np.bincount(owners,weights=crossings,minlength=len(pending))).astype(np.int64)
+        onBoundary = np.bincount(owners,weights=segmentDistances(testPoints,starts[edges],ends[edges])<=tolerance,minlength=len(pending))>0
+        matched[pairPoints[pending][(winding!=0) | onBoundary]] = True
+    return matched
+
+# The most cells the grid of a prepared polygon can have
+MAX_PREPARED_CELLS = 1<<22
+# How far the grid of a prepared polygon is shifted, in cells, so cell centers do not line up with round coordinates
+PREPARED_GRID_SHIFT = 0.2360679774997897
+
+def preparePolygons(polygons, tolerance = 0.0, cellsPerEdge = 1.0, maxCells = MAX_PREPARED_CELLS, chunkSize = 1<<22):
+    '''
+    Parameters
+    ----------
+    polygons : This should be a list of lists of numpy arrays.
+        This should be a list of polygons where every polygon is a list of rings, outer rings clockwise and
+        holes counterclockwise (like geometry.wkbParts gives back).
+    tolerance : This should be a number, optional
+        This should be a number representing how far outside the polygons a point can be and still count as on
+        their boundary. The default is 0.
+    cellsPerEdge : This should be a number, optional
+        This should be about how many grid cells to make per edge. The default is 1.
+    maxCells : This should be an integer, optional
+        This should be the most grid cells to make. The default is MAX_PREPARED_CELLS.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing roughly how many (point, edge) pairs are checked at once.
+
+    Returns
+    -------
+    dict
+        The prepared polygons for preparedContains, holding the grid (origin, cellSize, columns, rows), which
+        cells are boundary cells, the winding number at the center of every cell, the edges (starts, ends),
+        the edges of every boundary cell (cellOffsets and cellEdges, the edges of cell k being
+        cellEdges[cellOffsets[k]:cellOffsets[k+1]]) and the tolerance.
+
+    Description
+    -----------
+    The preparePolygons function does the work of a point in polygon test that does not depend on the points
+    once, so it can be shared by every point (and every clip) tested against the same polygons. It lays a
+    uniform grid over the polygons with about cellsPerEdge cells per edge and lists every edge in each cell its
+    bounding box (grown by the tolerance) covers. Those are the boundary cells. Every other cell is either all
+    inside or all outside, so only the winding number at its center is needed. The winding number at a cell
+    center only counts the edges crossing the leftward ray from it, which all sit in the same row of cells, so
+    the edges are also listed by row and every center is tested against its row's edges. Cells in a run of
+    non-boundary cells along a row all have the same winding number so only the first cell of every run (and
+    every boundary cell) is tested. The polygons are merged, so a point counts as inside when it is inside any
+    of them.
+    '''
+    starts, ends, offsets, boxes = polygonEdges(polygons)
+    low = np.minimum(starts,ends).min(axis=0)-tolerance if len(starts)>0 else np.zeros(2)
+    high = np.maximum(starts,ends).max(axis=0)+tolerance if len(starts)>0 else np.ones(2)
+    size = np.maximum(high-low,1e-12)
+    cells = int(min(max(len(starts)*cellsPerEdge,1),maxCells))
+    cellSize = float(max(np.sqrt(size[0]*size[1]/cells),size.max()/maxCells))
+    origin = low-cellSize*PREPARED_GRID_SHIFT
+    columns = int(np.floor((high[0]-origin[0])/cellSize))+1
+    rows = int(np.floor((high[1]-origin[1])/cellSize))+1
+    # The cells every edge's box covers, grown by the tolerance and a hair so an edge on a cell side is in both
+    grow = tolerance+cellSize*1e-9
+    lowCells = np.floor((np.minimum(starts,ends)-grow-origin)/cellSize).astype(np.int64)
+    highCells = np.floor((np.maximum(starts,ends)+grow-origin)/cellSize).astype(np.int64)
+    lowCells = np.clip(lowCells,0,[columns-1,rows-1])
+    highCells = np.clip(highCells,0,[columns-1,rows-1])
+    widths = highCells[:,0]-lowCells[:,0]+1
+    heights = highCells[:,1]-lowCells[:,1]+1
+    owners, slots = expandRanges(np.zeros(len(starts),dtype=np.int64),widths*heights)
+    cellIds = (lowCells[owners,1]+slots//widths[owners])*columns+lowCells[owners,0]+slots%widths[owners]
+    order = np.argsort(cellIds,kind='stable')
+    cellEdges = owners[order]
+    cellOffsets = np.concatenate(([0],np.cumsum(np.bincount(cellIds,minlength=rows*columns))))
+    boundary = np.diff(cellOffsets)>0
+    # The edges every row of cells holds
+    owners, slots = expandRanges(np.zeros(len(starts),dtype=np.int64),heights)
+    rowIds = lowCells[owners,1]+slots
+    order = np.argsort(rowIds,kind='stable')
+    rowEdges = owners[order]
+    rowOffsets = np.concatenate(([0],np.cumsum(np.bincount(rowIds,minlength=rows))))
+    # Every boundary cell and the first cell of every run of other cells along a row gets tested
+    grid = boundary.reshape(rows,columns)
+    runStarts = ~grid & np.hstack((np.ones((rows,1),dtype=bool),grid[:,:-1]))
+    tested = np.flatnonzero(grid.ravel() | runStarts.ravel())
+    centers = origin+(np.column_stack((tested%columns,tested//columns))+0.5)*cellSize
+    testedRows = tested//columns
+    rowCounts = rowOffsets[testedRows+1]-rowOffsets[testedRows]
+    testedWinding = np.zeros(len(tested),dtype=np.int64)
+    for begin, end in countChunks(rowCounts,chunkSize):
+        owners, slots = expandRanges(rowOffsets[testedRows[begin:end]],rowCounts[begin:end])
+        edges = rowEdges[slots]
+        point = centers[begin:end][owners]
+        crossings = rayCrossings(point[:,0],point[:,1],starts[edges,0],starts[edges,1],ends[edges,0],ends[edges,1])
+        testedWinding[begin:end] = np.rint(np.bincount(owners,weights=crossings,minlength=end-begin)).astype(np.int64)
+    # Hand the winding number of the first cell of every run to the rest of the run
+    winding = np.zeros(rows*columns,dtype=np.int64)
+    winding[tested] = testedWinding
+    runIds = np.cumsum(runStarts.ravel())
+    firstCells = np.flatnonzero(runStarts.ravel())
+    others = np.flatnonzero(~boundary)
+    if(len(others)>0):
+        winding[others] = winding[firstCells[runIds[others]-1]]
+    return {'origin':origin,'cellSize':cellSize,'columns':columns,'rows':rows,'boundary':boundary,'winding':winding,
+            'starts':starts,'ends':ends,'cellOffsets':cellOffsets,'cellEdges':cellEdges,'tolerance':float(tolerance)}
+
+def preparedContains(prepared, points, chunkSize = 1<<22):
+    '''
+    Parameters
+    ----------
+    prepared : This should be a dictionary.
+        This should be prepared polygons from preparePolygons.
+    points : This should be a numpy array.
+        This should be a (n, 2) array of the (x, y) points to test.
+    chunkSize : This should be an integer, optional
+        This should be an integer representing roughly how many (point, edge) pairs are checked at once.
+
+    Returns
+    -------
+    numpy array
+        A boolean array saying for every point whether it is inside or within the tolerance of the boundary of
+        any of the prepared polygons, the same as pointsInPolygons.
+
+    Description
+    -----------
+    The preparedContains function finds the grid cell of every point. Points outside the grid are outside, and
+    points in a cell that is not a boundary cell take the cell's state straight from its winding number, which
+    is one lookup per point no matter how many edges there are. A point p in a boundary cell only needs that
+    cell's edges: the winding number changes by the crossings of the path from the cell center c straight across
+    to q = (p.x, c.y) and then straight up or down to p, and that path never leaves the cell. The crossings of
+    the across part are the leftward rayCrossings of q minus those of c. The up or down part is the upward
+    rayCrossings of p minus those of q, found by handing rayCrossings the coordinates mirrored to (-y, -x) so
+    the ray from p is broken the same way as the leftward one when p sits exactly on an edge or level with a
+    vertex (mirroring flips the direction of the crossings so they are taken away). A point within the tolerance
+    of one of the cell's edges is on the boundary.
+    '''
+    points = np.asarray(points,dtype=np.float64).reshape(-1,2)
+    matched = np.zeros(len(points),dtype=bool)
+    origin, cellSize, columns, rows = prepared['origin'], prepared['cellSize'], prepared['columns'], prepared['rows']
+    starts, ends, cellOffsets, cellEdges = prepared['starts'], prepared['ends'], prepared['cellOffsets'], prepared['cellEdges']
+    with np.errstate(invalid='ignore'):
+        cells = np.floor((points-origin)/cellSize)
+    inside = np.isfinite(cells).all(axis=1) & (cells[:,0]>=0) & (cells[:,0]<columns) & (cells[:,1]>=0) & (cells[:,1]<rows)
+    indexes = np.flatnonzero(inside)
+    cellIds = (cells[indexes,1]*columns+cells[indexes,0]).astype(np.int64)
+    onBoundary = prepared['boundary'][cellIds]
+    matched[indexes[~onBoundary]] = prepared['winding'][cellIds[~onBoundary]]!=0
+    indexes, cellIds = indexes[onBoundary], cellIds[onBoundary]
+    edgeCounts = cellOffsets[cellIds+1]-cellOffsets[cellIds]
+    for begin, end in countChunks(edgeCounts,chunkSize):
+        owners, slots = expandRanges(cellOffsets[cellIds[begin:end]],edgeCounts[begin:end])
+        edges = cellEdges[slots]
+        point = points[indexes[begin:end]][owners]
+        center = origin+(np.column_stack((cellIds[begin:end]%columns,cellIds[begin:end]//columns))[owners]+0.5)*cellSize
+        sx, sy, ex, ey = starts[edges,0], starts[edges,1], ends[edges,0], ends[edges,1]
+        across = rayCrossings(point[:,0],center[:,1],sx,sy,ex,ey)-rayCrossings(center[:,0],center[:,1],sx,sy,ex,ey)
+        upDown = rayCrossings(-point[:,1],-point[:,0],-sy,-sx,-ey,-ex)-rayCrossings(-center[:,1],-point[:,0],-sy,-sx,-ey,-ex)
+        winding = prepared['winding'][cellIds[begin:end]]+np.rint(np.bincount(owners,weights=across-upDown,minlength=end-begin)).astype(np.int64)
+        near = np.bincount(owners,weights=segmentDistances(point,starts[edges],ends[edges])<=prepared['tolerance'],minlength=end-begin)>0
+        matched[indexes[begin:end]] = (winding!=0) | near
+    return matched
+
+def splitEdges(starts, ends, tolerance):
+    '''
+    Parameters
+    ----------
+    starts : This should be a numpy array.
+        This should be a (m, 2) array holding the start point of every edge.
+    ends : This should be a numpy array.
+        This should be a (m, 2) array holding the end point of every edge.
+    tolerance : This should be a number.
+        This should be a number representing the distance under which two points are treated as the same point.
+
+    Returns
+    -------
+    tuple of numpy arrays
+        A tuple (nodes, fromNode, toNode) where nodes is a (k, 2) array of unique points and every sub edge
+        runs from nodes[fromNode[i]] to nodes[toNode[i]]. Sub edges keep the direction of the edge they came from.
+
+    Description
+    -----------
+    The splitEdges function cuts every edge at every place another edge crosses or touches it, so that
+    afterwards edges only ever meet at their end points. Candidate pairs of edges come from bboxPairs. For pairs
+    that are not parallel the usual line intersection parameters t and u are solved and the intersection point
+    is used to split both edges. The same point object is handed to both edges (and snapped to an end point when
+    it lands within tolerance of one) so that the two halves agree on where the split is. Parallel edges
+    that lie on top of each other split each other at their end points instead. Finally every point
+    is snapped to a grid the size of the tolerance to find which points are the same node. Edges with no length,
+    like the ones between repeated vertices, are dropped first.
+    '''
+    starts = np.asarray(starts,dtype=np.float64).reshape(-1,2)
+    ends = np.asarray(ends,dtype=np.float64).reshape(-1,2)
+    # Edges with no length (from repeated vertices) cannot split anything and would only divide by zero
+    kept = np.any(starts!=ends,axis=1)
+    starts = starts[kept]
+    ends = ends[kept]
+    edgeCount = len(starts)
+    vectors = ends-starts
+    lengths = np.hypot(vectors[:,0],vectors[:,1])
+    # Grow the boxes by the tolerance so touching edges are paired up too
+    boxes = np.column_stack((np.minimum(starts,ends)-tolerance,np.maximum(starts,ends)+tolerance))
+    first, second = bboxPairs(boxes)
+    splitEdge = [np.arange(edgeCount),np.arange(edgeCount)]
+    splitParam = [np.zeros(edgeCount),np.ones(edgeCount)]
+    splitPoint = [starts,ends]
+    if(len(first)>0):
+        p = starts[first]
+        r = vectors[first]
+        q = starts[second]
+        s = vectors[second]
+        qp = q-p
+        denom = r[:,0]*s[:,1]-r[:,1]*s[:,0]
+        lengthR = lengths[first]
+        lengthS = lengths[second]
+        # Tolerances in parameter space for each edge of the pair
+        tolT = tolerance/lengthR
+        tolU = tolerance/lengthS
+        parallel = np.abs(denom)<=1e-12*lengthR*lengthS
+        # ---- Edges that cross at a single point
+        cross = ~parallel
+        with np.errstate(divide='ignore',invalid='ignore'):
+            t = (qp[:,0]*s[:,1]-qp[:,1]*s[:,0])/denom
+            u = (qp[:,0]*r[:,1]-qp[:,1]*r[:,0])/denom
+        cross &= (t>=-tolT) & (t<=1+tolT) & (u>=-tolU) & (u<=1+tolU)
+        t = t[cross]
+        u = u[cross]
+        crossFirst = first[cross]
+        crossSecond = second[cross]
+        point = p[cross]+t[:,np.newaxis]*r[cross]
+        # Snap the crossing to an end point when it is that close to one so both edges share it exactly
+        nearU0 = np.abs(u)<=tolU[cross]
+        nearU1 = np.abs(u-1)<=tolU[cross]
+        nearT0 = np.abs(t)<=tolT[cross]
+        nearT1 = np.abs(t-1)<=tolT[cross]
+        point[nearU0] = q[cross][nearU0]
+        point[nearU1] = q[cross][nearU1]+s[cross][nearU1]
+        point[nearT0] = p[cross][nearT0]
+        point[nearT1] = p[cross][nearT1]+r[cross][nearT1]
+        # Interior crossings split the edge, end point crossings do not need to
+        innerT = ~(nearT0 | nearT1)
+        innerU = ~(nearU0 | nearU1)
+        splitEdge += [crossFirst[innerT],crossSecond[innerU]]
+        splitParam += [t[innerT],u[innerU]]
+        splitPoint += [point[innerT],point[innerU]]
+        # ---- Parallel edges that lie on top of each other
+        offLine = np.abs(qp[:,0]*r[:,1]-qp[:,1]*r[:,0])/lengthR
+        overlap = parallel & (offLine<=tolerance)
+        for (edgeA, edgeB, pA, rA, pB, rB, tolA) in ((first,second,p,r,q,s,tolT),(second,first,q,s,p,r,tolU)):
+            # Project both end points of edge B onto edge A and split A where they land inside it
+            pA = pA[overlap]
+            rA = rA[overlap]
+            squared = np.sum(rA*rA,axis=1)
+            for endPoint in (pB[overlap],pB[overlap]+rB[overlap]):
+                param = np.sum((endPoint-pA)*rA,axis=1)/squared
+                inside = (param>tolA[overlap]) & (param<1-tolA[overlap])
+                splitEdge.append(edgeA[overlap][inside])
+                splitParam.append(param[inside])
+                splitPoint.append(endPoint[inside])
+    splitEdge = np.concatenate(splitEdge)
+    splitParam = np.concatenate(splitParam)
+    splitPoint = np.concatenate(splitPoint)
+    # Order the split points along every edge
+    order = np.lexsort((splitParam,splitEdge))
+    splitEdge = splitEdge[order]
+    splitPoint = splitPoint[order]
+    # Snap every point onto the tolerance grid to decide which points are the same node
+    keys = np.floor(splitPoint/tolerance+0.5).astype(np.int64)
+    keyOrder = np.lexsort((keys[:,1],keys[:,0]))
+    newKey = np.ones(len(keys),dtype=bool)
+    newKey[1:] = np.any(keys[keyOrder][1:]!=keys[keyOrder][:-1],axis=1)
+    nodeOfSorted = np.cumsum(newKey)-1
+    nodeId = np.empty(len(keys),dtype=np.int64)
+    nodeId[keyOrder] = nodeOfSorted
+    # Keep the first real point that landed on every node as the node's coordinates
+    nodes = splitPoint[keyOrder][newKey]
+    # Consecutive split points along the same edge make up the sub edges
+    sameEdge = splitEdge[1:]==splitEdge[:-1]
+    fromNode = nodeId[:-1][sameEdge]
+    toNode = nodeId[1:][sameEdge]
+    # Drop the sub edges that collapsed into a single node
+    keep = fromNode!=toNode
+    return nodes, fromNode[keep], toNode[keep]
+
+def windingUnion(rings, tolerance = None, fillRule = "nonzero"):
+    '''
+    Parameters
+    ----------
+    rings : This should be a list of numpy arrays.
+        This should be a list of (n, 2) arrays where each array is a ring that does not repeat its first point
+        at the end. Rings can cross themselves and each other.
+    tolerance : This should be a number, optional
+        This should be a number representing the distance under which two points are treated as the same
+        point. The default is None which uses a tiny fraction of the extent of the rings.
+    fillRule : This should be a string, optional
+        This should be "nonzero" to keep every place with a non zero winding number or "positive" to only keep
+        the places that are inside more clockwise rings than counterclockwise ones (see ringsDifference). The
+        default is "nonzero".
+
+    Returns
+    -------
+    list
+        A list of (n, 2) arrays that are the rings of the merged area. Outer rings run clockwise and holes
+        run counterclockwise, the same way ArcGIS stores polygons. Rings only touch at single points.
+
+    Description
+    -----------
+    The windingUnion function merges rings the way a dissolve does but without writing anything to disk. The
+    area it keeps is every place with a non zero winding number, so overlapping pieces merge together and an
+    ArcGIS style polygon (clockwise outer ring, counterclockwise hole) keeps its hole. It works in these steps:
+    1. Every edge of every ring is cut wherever it crosses another edge with splitEdges, which leaves a
+    planar graph. Edges that end up on top of each other are merged, keeping a count of how many times
+    (and in which direction) the edge was used.
+    2. The edges leaving every node are sorted by angle which lets each side of every edge be followed around
+    the face it borders. Faces are labelled with pointer jumping instead of a Python loop.
+    3. The outside face of every connected piece of the graph gets its winding number from a single point
+    test against the pieces whose bounding boxes hold it. Every other face gets its winding number by
+    walking across edges from a face that is already known, since crossing an edge changes the winding number
+    by that edge's count.
+    4. The edges with a filled face on one side and an empty face on the other are the boundary of the result.
+    They are chained into rings (turning as sharply as possible at nodes shared by several rings) and points in
+    the middle of straight runs are removed.
+    If there is only one ring and no edges cross, the ring is already simple and is handed back directly.
+    '''
+    rings = [np.asarray(ring,dtype=np.float64).reshape(-1,2) for ring in rings]
+    rings = [ring for ring in rings if len(ring)>=3]
+    if(len(rings)==0):
+        return []
+    coords = np.concatenate(rings)
+    # Work relative to the lower left corner of the data for better floating point precision
+    origin = coords.min(axis=0)
+    coords = coords-origin
+    extent = float(np.max(coords.max(axis=0)))
+    if(tolerance == None):
+        tolerance = max(extent,1.0)*1e-10
+    # Build the edges of every ring (each ring wraps back around to its first point)
+    sizes = np.array([len(ring) for ring in rings])
+    firstIndex = np.cumsum(sizes)-sizes
+    following = np.arange(len(coords))+1
+    following[firstIndex+sizes-1] = firstIndex
+    starts = coords
+    ends = coords[following]
+    nodes, fromNode, toNode = splitEdges(starts,ends,tolerance)
+    if(len(fromNode)==0):
+        return []
+    # Fast path: a single ring that nothing split is already a simple ring
+    if(len(rings)==1 and len(fromNode)==len(starts) and len(nodes)==len(starts)):
+        ring = rings[0]
+        if(fillRule=="positive" and ringArea(ring)>0):
+            return []
+        return [ring if ringArea(ring)<0 else ring[::-1]]
+
+    # ---- Step 1: merge edges that lie on top of each other, counting their direction
+    low = np.minimum(fromNode,toNode)
+    high = np.maximum(fromNode,toNode)
+    direction = np.where(fromNode<toNode,1,-1)
+    edgeKey = low*len(nodes)+high
+    uniqueKeys, inverse = np.unique(edgeKey,return_inverse=True)
+    count = np.rint(np.bincount(inverse,weights=direction)).astype(np.int64)
+    edgeFrom = uniqueKeys//len(nodes)
+    edgeTo = uniqueKeys%len(nodes)
+
+    # ---- Step 2: half edges and faces. Half edge 2e runs edgeFrom->edgeTo and 2e+1 runs back
+    halfCount = 2*len(uniqueKeys)
+    origin_ = np.empty(halfCount,dtype=np.int64)
+    origin_[0::2] = edgeFrom
+    origin_[1::2] = edgeTo
+    halfIds = np.arange(halfCount)
+    twin = halfIds^1
+    dest = origin_[twin]
+    halfCountOf = np.empty(halfCount,dtype=np.int64)
+    halfCountOf[0::2] = count
+    halfCountOf[1::2] = -count
+    vec = nodes[dest]-nodes[origin_]
+    angle = np.arctan2(vec[:,1],vec[:,0])
+    # Sort the half edges leaving every node counterclockwise
+    aroundNode = np.lexsort((angle,origin_))
+    sortedOrigin = origin_[aroundNode]
+    groupStart = np.ones(halfCount,dtype=bool)
+    groupStart[1:] = sortedOrigin[1:]!=sortedOrigin[:-1]
+    groupFirst = np.maximum.accumulate(np.where(groupStart,np.arange(halfCount),0))
+    groupEnd = np.ones(halfCount,dtype=bool)
+    groupEnd[:-1] = groupStart[1:]
+    groupLast = np.minimum.accumulate(np.where(groupEnd,np.arange(halfCount),halfCount)[::-1])[::-1]
+    # The clockwise neighbour of every half edge around its origin node
+    previousSlot = np.arange(halfCount)-1
+    previousSlot[groupStart] = groupLast[groupStart]
+    clockwise = np.empty(halfCount,dtype=np.int64)
+    clockwise[aroundNode] = aroundNode[previousSlot]
+    # Following the face on the left of a half edge means turning to the clockwise neighbour of its twin
+    nextHalf = clockwise[twin]
+    faceLabel = cycleLabels(nextHalf)
+    faceIds, face = np.unique(faceLabel,return_inverse=True)
+    faceCount = len(faceIds)
+    cross = nodes[origin_,0]*nodes[dest,1]-nodes[dest,0]*nodes[origin_,1]
+    faceArea = 0.5*np.bincount(face,weights=cross,minlength=faceCount)
+
+    # ---- Step 3: winding numbers. Start with the outside face of every connected piece
+    component = connectedComponents(len(nodes),edgeFrom,edgeTo)
+    componentIds, nodeComponent = np.unique(component,return_inverse=True)
+    componentCount = len(componentIds)
+    faceComponent = nodeComponent[origin_[np.unique(face,return_index=True)[1]]]
+    # The outside face of a piece is the one with the smallest (most negative) signed area
+    byArea = np.lexsort((faceArea,faceComponent))
+    isFirst = np.ones(faceCount,dtype=bool)
+    isFirst[1:] = faceComponent[byArea][1:]!=faceComponent[byArea][:-1]
+    outerFace = np.empty(componentCount,dtype=np.int64)
+    outerFace[faceComponent[byArea][isFirst]] = byArea[isFirst]
+    # Test the left most node of each piece against the pieces whose bounding boxes hold it
+    nodeOrder = np.lexsort((nodes[:,1],nodes[:,0],nodeComponent))
+    firstOfComponent = np.ones(len(nodes),dtype=bool)
+    firstOfComponent[1:] = nodeComponent[nodeOrder][1:]!=nodeComponent[nodeOrder][:-1]
+    testPoints = np.empty((componentCount,2))
+    testPoints[nodeComponent[nodeOrder][firstOfComponent]] = nodes[nodeOrder][firstOfComponent]
+    componentBoxes = np.empty((componentCount,4))
+    for column, reducer in ((0,np.minimum),(1,np.minimum)):
+        componentBoxes[:,column] = np.inf
+        reducer.at(componentBoxes[:,column],nodeComponent,nodes[:,column])
+    for column, reducer in ((2,np.maximum),(3,np.maximum)):
+        componentBoxes[:,column] = -np.inf
+        reducer.at(componentBoxes[:,column],nodeComponent,nodes[:,column-2])
+    outerWinding = np.zeros(componentCount,dtype=np.int64)
+    query, holder = bboxPairs(np.column_stack((testPoints,testPoints)),componentBoxes)
+    keep = query!=holder
+    query = query[keep]
+    holder = holder[keep]
+    if(len(query)>0):
+        # Expand every (piece, holding piece) pair into the edges of the holding piece
+        edgeComponent = nodeComponent[edgeFrom]
+        edgeOrder = np.argsort(edgeComponent,kind='stable')
+        edgesPer = np.bincount(edgeComponent,minlength=componentCount)
+        edgeFirst = np.cumsum(edgesPer)-edgesPer
+        owners, slots = expandRanges(edgeFirst[holder],edgesPer[holder])
+        edges = edgeOrder[slots]
+        pointOwner = query[owners]
+        crossings = rayCrossings(testPoints[pointOwner,0],testPoints[pointOwner,1],
+                                 nodes[edgeFrom[edges],0],nodes[edgeFrom[edges],1],
+                                 nodes[edgeTo[edges],0],nodes[edgeTo[edges],1])
+        outerWinding = np.rint(np.bincount(pointOwner,weights=crossings*count[edges],
+                                           minlength=componentCount)).astype(np.int64)
+    winding = np.zeros(faceCount,dtype=np.int64)
+    known = np.zeros(faceCount,dtype=bool)
+    winding[outerFace] = outerWinding
+    known[outerFace] = True
+    # Crossing half edge h from its right face to its left face changes the winding number by its count
+    leftFace = face
+    rightFace = face[twin]
+    while(not known.all()):
+        step = known[rightFace] & ~known[leftFace]
+        if(not step.any()):
+            break
+        winding[leftFace[step]] = winding[rightFace[step]]+halfCountOf[step]
+        known[leftFace[step]] = True
+
+    # ---- Step 4: keep half edges with the filled area on their right and the empty area on their left
+    # Clockwise rings wind -1 around the area inside them
+    filled = winding<0 if fillRule=="positive" else winding!=0
+    kept = np.flatnonzero(filled[rightFace] & ~filled[leftFace])
+    if(len(kept)==0):
+        return []
+    # At each node pair every kept half edge coming in with the next kept half edge going out when turning
+    # counterclockwise from the direction it came from (the sharpest right turn)
+    entries = np.concatenate((kept,twin[kept]))
+    isOut = np.concatenate((np.ones(len(kept),dtype=bool),np.zeros(len(kept),dtype=bool)))
+    entryOrder = np.lexsort((angle[entries],origin_[entries]))
+    entries = entries[entryOrder]
+    isOut = isOut[entryOrder]
+    entryNode = origin_[entries]
+    entryStart = np.ones(len(entries),dtype=bool)
+    entryStart[1:] = entryNode[1:]!=entryNode[:-1]
+    entryFirst = np.maximum.accumulate(np.where(entryStart,np.arange(len(entries)),0))
+    nextSlot = np.arange(len(entries))+1
+    wraps = np.ones(len(entries),dtype=bool)
+    wraps[:-1] = entryStart[1:]
+    nextSlot[wraps] = entryFirst[wraps]
+    nextKept = np.full(halfCount,-1,dtype=np.int64)
+    incoming = np.flatnonzero(~isOut)
+    matched = isOut[nextSlot[incoming]]
+    nextKept[twin[entries[incoming[matched]]]] = entries[nextSlot[incoming[matched]]]
+    if(not matched.all()):
+        # Rounding can leave a node where incoming and outgoing edges do not alternate, so pair those up by
+        # walking around the node to the next outgoing edge that has not been used yet
+        used = np.zeros(halfCount,dtype=bool)
+        used[nextKept[nextKept>=0]] = True
+        for slot in incoming[~matched]:
+            probe = nextSlot[slot]
+            while(probe!=slot):
+                if(isOut[probe] and not used[entries[probe]]):
+                    nextKept[twin[entries[slot]]] = entries[probe]
+                    used[entries[probe]] = True
+                    break
+                probe = nextSlot[probe]
+    # Drop any half edge whose chain could not be closed
+    keptMask = np.zeros(halfCount,dtype=bool)
+    keptMask[kept] = True
+    valid = keptMask & (nextKept>=0)
+    while(True):
+        broken = valid & ~valid[np.where(nextKept>=0,nextKept,0)]
+        if(not broken.any()):
+            break
+        valid &= ~broken
+    members = np.flatnonzero(valid)
+    if(len(members)==0):
+        return []
+    # Relabel the kept half edges 0..k-1 and order every cycle from its smallest member
+    local = np.full(halfCount,-1,dtype=np.int64)
+    local[members] = np.arange(len(members))
+    successor = local[nextKept[members]]
+    ringLabel = cycleLabels(successor)
+    position = cycleRanks(successor,ringLabel)
+    ringOrder = np.lexsort((position,ringLabel))
+    ringPoints = nodes[origin_[members[ringOrder]]]
+    labels = ringLabel[ringOrder]
+    breaks = np.flatnonzero(labels[1:]!=labels[:-1])+1
+    result = []
+    for ring in np.split(ringPoints,breaks):
+        ring = removeCollinear(ring,tolerance)
+        if(len(ring)>=3 and ringArea(ring)!=0):
+            result.append(ring+origin)
+    return result
+
+def ringsDifference(rings, holes, tolerance = None):
+    '''
+    Parameters
+    ----------
+    rings : This should be a list of numpy arrays.
+        This should be the rings of the area to keep, outer rings clockwise and holes counterclockwise (like
+        the output of windingUnion).
+    holes : This should be a list of numpy arrays.
+        This should be the rings of the area to take away, turned the same way.
+    tolerance : This should be a number, optional
+        This should be the snapping tolerance handed to windingUnion. The default is None.
+
+    Returns
+    -------
+    list
+        A list of rings holding the area of rings that is not in holes.
+
+    Description
+    -----------
+    The ringsDifference function turns every ring of the area to take away around, so inside it the winding
+    number goes up by one instead of down, and merges everything with windingUnion keeping only the places
+    that are still inside more clockwise rings than counterclockwise ones. Inside the first area but not the
+    second that is -1 (kept), inside both it is 0 and inside only the second it is +1 (both dropped).
+    '''
+    if(len(holes)==0):
+        return windingUnion(rings,tolerance)
+    return windingUnion(list(rings)+[np.asarray(hole)[::-1] for hole in holes],tolerance,"positive")
+
+def clipRingsToBox(rings, box, tolerance = None):
+    '''
+    Parameters
+    ----------
+    rings : This should be a list of numpy arrays.
+        This should be the rings of an area, outer rings clockwise and holes counterclockwise (like the output
+        of windingUnion).
+    box : This should be a tuple.
+        This should be the (xmin, ymin, xmax, ymax) box to keep.
+    tolerance : This should be a number, optional
+        This should be the snapping tolerance handed to windingUnion. The default is None.
+
+    Returns
+    -------
+    list
+        A list of rings holding the part of the area inside the box.
+
+    Description
+    -----------
+    The clipRingsToBox function takes away everything outside the box with ringsDifference. The area outside
+    the box is a clockwise ring a little bigger than both the rings and the box with the box as a
+    counterclockwise hole in it. Points of the result within rounding error of a side of the box are moved
+    exactly onto it. Rings that are already inside the box are handed back as they are.
+    '''
+    rings = [np.asarray(ring,dtype=np.float64) for ring in rings if len(ring)>=3]
+    if(len(rings)==0):
+        return []
+    points = np.concatenate(rings)
+    low, high = points.min(axis=0), points.max(axis=0)
+    if(low[0]>=box[0] and low[1]>=box[1] and high[0]<=box[2] and high[1]<=box[3]):
+        return rings
+    outerLow = np.minimum(low,box[:2])
+    outerHigh = np.maximum(high,box[2:])
+    margin = np.maximum(outerHigh-outerLow,1.0)
+    outerLow, outerHigh = outerLow-margin, outerHigh+margin
+    # Clockwise outer ring around everything and the counterclockwise box inside it
+    outside = np.array([[outerLow[0],outerLow[1]],[outerLow[0],outerHigh[1]],[outerHigh[0],outerHigh[1]],[outerHigh[0],outerLow[1]]])
+    inside = np.array([[box[0],box[1]],[box[2],box[1]],[box[2],box[3]],[box[0],box[3]]],dtype=np.float64)
+    clipped = ringsDifference(rings,[outside,inside],tolerance)
+    # Put the points that landed a rounding error off the box back on it so clipped neighbours line up exactly
+    snap = tolerance if tolerance is not None else float(np.max(outerHigh-outerLow))*1e-9
+    sides = np.array(box,dtype=np.float64).reshape(2,2)
+    for ring in clipped:
+        for side in sides:
+            near = np.abs(ring-side)<=snap
+            ring[near] = np.broadcast_to(side,ring.shape)[near]
+    return clipped
+
+def clipLinesToBoxes(coords, partOffsets, boxes):
+    '''
+    Parameters
+    ----------
+    coords : This should be a numpy array.
+        This should be a (N, 2) array of the points of every line part one after another.
+    partOffsets : This should be a numpy array.
+        This should be an array holding where every part starts in coords (with the total at the end).
+    boxes : This should be a numpy array.
+        This should be a (parts, 4) array holding the (xmin, ymin, xmax, ymax) box every part is cut to, or a
+        single (4,) box for all of them.
+
+    Returns
+    -------
+    tuple
+        A (coords, partOffsets, owners) tuple holding the pieces of the parts inside their boxes as columns and
+        the part every piece came from, in the order of the parts. A part that leaves its box and comes back
+        gives one piece per stretch inside it, and a part of a single point gives none.
+
+    Description
+    -----------
+    The clipLinesToBoxes function cuts every segment of every part at once with the Liang-Barsky test: each
+    side of the box limits how far along the segment (from 0 at its start to 1 at its end) the inside can
+    start or stop, and a segment is kept where the latest start is not after the earliest stop. Kept segments
+    that follow on from each other without being cut where they meet are joined back into one piece.
+    '''
+    coords = np.asarray(coords,dtype=np.float64).reshape(-1,2)
+    partOffsets = np.asarray(partOffsets,dtype=np.int64)
+    partSizes = np.diff(partOffsets)
+    # Every segment joins a point to the next one in the same part
+    segmentParts = np.repeat(np.arange(len(partSizes)),np.maximum(partSizes-1,0))
+    firsts = np.flatnonzero(np.isin(np.arange(len(coords)),partOffsets[1:]-1,invert=True))
+    starts, ends = coords[firsts], coords[firsts+1]
+    boxes = np.asarray(boxes,dtype=np.float64)
+    boxes = boxes[segmentParts] if boxes.ndim==2 else np.broadcast_to(boxes,(len(starts),4))
+    step = ends-starts
+    low = np.zeros(len(starts))
+    high = np.ones(len(starts))
+    outside = np.zeros(len(starts),dtype=bool)
+    with np.errstate(divide='ignore',invalid='ignore'):
+        for p, q in ((-step[:,0],starts[:,0]-boxes[:,0]),(step[:,0],boxes[:,2]-starts[:,0]),
+                     (-step[:,1],starts[:,1]-boxes[:,1]),(step[:,1],boxes[:,3]-starts[:,1])):
+            ratio = q/p
+            # A segment running along a side is either all inside it or all outside it
+            outside |= (p==0)&(q<0)
+            low = np.where(p<0,np.maximum(low,ratio),low)
+            high = np.where(p>0,np.minimum(high,ratio),high)
+    kept = np.flatnonzero(~outside&(low<=high))
+    low, high, keptParts = low[kept], high[kept], segmentParts[kept]
+    pieceStarts = starts[kept]+low[:,np.newaxis]*step[kept]
+    pieceEnds = starts[kept]+high[:,np.newaxis]*step[kept]
+    # A kept segment carries on the piece before it when it follows on from it in the same part uncut
+    joined = np.zeros(len(kept),dtype=bool)
+    joined[1:] = (kept[1:]==kept[:-1]+1)&(keptParts[1:]==keptParts[:-1])&(high[:-1]==1)&(low[1:]==0)
+    newPiece = ~joined
+    # Every piece gives its first start and then the end of every one of its segments
+    slots = np.cumsum(1+newPiece)-1
+    clipped = np.empty((len(kept)+int(newPiece.sum()),2))
+    clipped[slots] = pieceEnds
+    clipped[slots[newPiece]-1] = pieceStarts[newPiece]
+    pieceOffsets = np.concatenate((slots[newPiece]-1,[len(clipped)]))
+    return clipped, pieceOffsets, keptParts[newPiece]
+
+def ringPolygons(rings):
+    '''
+    Parameters
+    ----------
+    rings : This should be a list of numpy arrays.
+        This should be a list of rings, outer rings clockwise and holes counterclockwise (like the output of
+        windingUnion).
+
+    Returns
+    -------
+    list
+        A list holding the rings of every polygon, its outer ring followed by its holes, matched up with
+        assignHoles. Holes that are not inside any outer ring are left out like ringsToWKB leaves them out.
+    '''
+    rings = [np.asarray(ring,dtype=np.float64) for ring in rings if len(ring)>=3]
+    areas = np.array([ringArea(ring) for ring in rings])
+    owner = assignHoles(rings,areas)
+    polygons = {shell:[rings[shell]] for shell in np.flatnonzero(areas<0).tolist()}
+    for hole in np.flatnonzero((areas>0) & (owner>=0)).tolist():
+        polygons[int(owner[hole])].append(rings[hole])
+    return list(polygons.values())
+
+def cycleLabels(successor):
+    '''
+    Parameters
+    ----------
+    successor : This should be a numpy integer array.
+        This should be a permutation array where successor[i] is the element that comes after i in its cycle.
+
+    Returns
+    -------
+    numpy array
+        An array holding, for every element, the smallest element of the cycle it belongs to.
+
+    Description
+    -----------
+    The cycleLabels function uses pointer jumping. After k rounds every element knows the smallest element among
+    the next 2^k elements of its cycle, so it only takes about log2 of the longest cycle rounds of array
+    operations to label every cycle.
+    '''
+    labels = np.arange(len(successor))
+    jump = np.asarray(successor).copy()
+    while(True):
+        newLabels = np.minimum(labels,labels[jump])
+        jump = jump[jump]
+        if(np.array_equal(newLabels,labels)):
+            return labels
+        labels = newLabels
+
+def cycleRanks(successor, labels):
+    '''
+    Parameters
+    ----------
+    successor : This should be a numpy integer array.
+        This should be a permutation array where successor[i] is the element that comes after i in its cycle.
+    labels : This should be a numpy integer array.
+        This should be the array made by cycleLabels for the same successor array.
+
+    Returns
+    -------
+    numpy array
+        An array holding the position of every element in its cycle, counting from the labelling element at 0.
+
+    Description
+    -----------
+    The cycleRanks function cuts every cycle just before its labelling element and then ranks the resulting
+    lists with pointer jumping (every round each element adds on the distance of the element it points at).
+    '''
+    count = len(successor)
+    jump = np.asarray(successor).copy()
+    # Cut every cycle by making the element before the label point at itself
+    before = np.empty(count,dtype=np.int64)
+    before[jump] = np.arange(count)
+    isLabel = labels==np.arange(count)
+    tails = before[isLabel]
+    jump[tails] = tails
+    distance = (jump!=np.arange(count)).astype(np.int64)
+    while(True):
+        further = jump[jump]
+        if(np.array_equal(further,jump)):
+            break
+        distance = distance+distance[jump]
+        jump = further
+    # The labelling element is the furthest from the cut so flip the distance into a position
+    length = np.bincount(labels,minlength=count)[labels]
+    return length-1-distance
+
+def connectedComponents(nodeCount, fromNode, toNode):
+    '''
+    Parameters
+    ----------
+    nodeCount : This should be an integer.
+        This should be an integer representing how many nodes there are.
+    fromNode, toNode : These should be numpy integer arrays.
+        These should be the two nodes at either end of every edge.
+
+    Returns
+    -------
+    numpy array
+        An array holding, for every node, the smallest node of the connected piece it belongs to.
+
+    Description
+    -----------
+    The connectedComponents function hooks every node onto the smallest label seen across its edges and then
+    shortcuts the labels with pointer jumping, repeating until nothing changes.
+    '''
+    labels = np.arange(nodeCount)
+    while(True):
+        lowest = np.minimum(labels[fromNode],labels[toNode])
+        newLabels = labels.copy()
+        np.minimum.at(newLabels,labels[fromNode],lowest)
+        np.minimum.at(newLabels,labels[toNode],lowest)
+        # Pointer jump until every node points straight at its root
+        while(True):
+            jumped = newLabels[newLabels]
+            if(np.array_equal(jumped,newLabels)):
+                break
+            newLabels = jumped
+        if(np.array_equal(newLabels,labels)):
+            return labels
+        labels = newLabels
+
+def removeCollinear(ring, tolerance):
+    '''
+    Parameters
+    ----------
+    ring : This should be a numpy array.
+        This should be a (n, 2) array of the (x,y) points of a ring that does not repeat its first point.
+    tolerance : This should be a number.
+        This should be a number representing how far a point can be from the straight line between its
+        neighbours and still be removed.
+
+    Returns
+    -------
+    numpy array
+        The ring without points that sit in the middle of a straight run.
+
+    Description
+    -----------
+    The removeCollinear function drops every point that lies within tolerance of the segment joining the
+    point before it and the point after it (and is between them). Splitting edges leaves many of these
+    points behind. It repeats until no more points can be removed.
+    '''
+    while(len(ring)>3):
+        before = np.roll(ring,1,axis=0)
+        after = np.roll(ring,-1,axis=0)
+        chord = after-before
+        chordLength = np.hypot(chord[:,0],chord[:,1])
+        offset = ring-before
+        distance = np.abs(chord[:,0]*offset[:,1]-chord[:,1]*offset[:,0])
+        between = np.sum(offset*chord,axis=1)>0
+        between &= np.sum((after-ring)*chord,axis=1)>0
+        drop = (distance<=tolerance*chordLength) & between
+        if(not drop.any()):
+            break
+        # Never drop two neighbouring points in the same pass so the test stays valid
+        drop &= ~np.roll(drop,1)
+        ring = ring[~drop]
+    return ring
+
+def simplifyParts(parts, tolerance, closed = True):
+    '''
+    Parameters
+    ----------
+    parts : This should be a list of numpy arrays.
+        This should be a list of (n, 2) arrays, either rings that do not repeat their first point or the parts
+        of lines.
+    tolerance : This should be a number.
+        This should be a number representing how far the simplified parts may stray from the original ones.
+    closed : This should be a boolean, optional
+        This should be True when the parts are rings and False when they are lines. The default is True.
+
+    Returns
+    -------
+    tuple
+        A (parts, removed) tuple holding the simplified parts, in the same order, and how many points were
+        taken out. Rings left with fewer than three points are smaller than the tolerance and come back as
+        empty arrays (their points count as removed). Lines always keep their two end points.
+
+    Description
+    -----------
+    The simplifyParts function is the Douglas-Peucker simplification. Every part starts as one span between
+    its end points (a ring is split into two spans at its first point and the point furthest from it). The
+    point of a span that is furthest from the segment joining the ends of the span is kept and splits the span
+    in two whenever it is further than tolerance, and the spans that are within tolerance are finished. Rather
+    than walking every part on its own with recursion, each round handles every open span of every part at
+    once: the points inside the spans are laid out with expandRanges, their distances worked out in one go
+    and the furthest point of every span found with np.maximum.reduceat. The number of rounds is about the
+    log of the number of points kept per part. Like any Douglas-Peucker simplification it does not check that
+    the simplified parts stay clear of each other.
+    '''
+    parts = [np.asarray(part,dtype=np.float64).reshape(-1,2) for part in parts]
+    if(len(parts)==0):
+        return [], 0
+    sizes = np.array([len(part) for part in parts],dtype=np.int64)
+    # A ring is laid out with its first point repeated at the end so it can be split like a line
+    points = np.concatenate([np.concatenate([part,part[:1]]) if closed and len(part)>0 else part for part in parts])
+    lengths = sizes+1 if closed else sizes
+    firsts = np.cumsum(lengths)-lengths
+    lasts = firsts+lengths-1
+    keep = np.zeros(len(points),dtype=bool)
+    simple = lengths>=(4 if closed else 3)
+    keep[firsts[lengths>0]] = True
+    keep[lasts[lengths>0]] = True
+    keep[np.repeat(~simple,lengths)] = True
+    if(closed):
+        # Split every ring at the point furthest from its first point
+        owners, positions = expandRanges(firsts[simple],sizes[simple])
+        distance = np.hypot(*(points[positions]-points[firsts[simple]][owners]).T)
+        order = np.lexsort((-distance,owners))
+        furthest = positions[order[np.r_[0,np.flatnonzero(np.diff(owners[order]))+1]]] if len(order)>0 else np.zeros(0,dtype=np.int64)
+        keep[furthest] = True
+        starts = np.concatenate([firsts[simple],furthest])
+        ends = np.concatenate([furthest,lasts[simple]])
+    else:
+        starts, ends = firsts[simple], lasts[simple]
+    while(len(starts)>0):
+        counts = ends-starts-1
+        starts, ends, counts = starts[counts>0], ends[counts>0], counts[counts>0]
+        if(len(starts)==0):
+            break
+        owners, positions = expandRanges(starts+1,counts)
+        distance = segmentDistances(points[positions],points[starts][owners],points[ends][owners])
+        furthest = np.maximum.reduceat(distance,np.cumsum(counts)-counts)
+        split = furthest>tolerance
+        # The first point of every span that is as far as the span's furthest point
+        hits = np.flatnonzero((distance==furthest[owners]) & split[owners])
+        spans, first = np.unique(owners[hits],return_index=True)
+        middles = positions[hits[first]]
+        keep[middles] = True
+        starts = np.concatenate([starts[spans],middles])
+        ends = np.concatenate([middles,ends[spans]])
+    simplified = []
+    removed = 0
+    for part, first, length in zip(parts,firsts.tolist(),lengths.tolist()):
+        kept = points[first:first+length][keep[first:first+length]]
+        if(closed):
+            kept = kept[:-1]
+            if(len(kept)<3):
+                kept = kept[:0]
+        removed += len(part)-len(kept)
+        simplified.append(kept)
+    return simplified, removed
+
+def arcFan(centers, startAngles, spans, radius, pointsForBuff = 87):
+    '''
+    Parameters
+    ----------
+    centers : This should be a numpy array.
+        This should be a (n, 2) array of the center points of the arcs.
+    startAngles : This should be a numpy array.
+        This should be an array of n angles in radians where every arc starts.
+    spans : This should be a numpy array.
+        This should be an array of n angles in radians saying how far each arc turns clockwise.
+    radius : This should be a number or a numpy array.
+        This should be the radius of every arc or an array holding one radius per arc.
+    pointsForBuff : This should be an integer, optional
+        This should be an integer representing how many points a full circle is made of. The default is 87.
+
+    Returns
+    -------
+    tuple of numpy arrays
+        A tuple (points, counts) where points holds the arc points of every arc one after another and counts
+        says how many of those points belong to each arc.
+
+    Description
+    -----------
+    The arcFan function builds the inside points of many clockwise arcs at once. Rather than computing new
+    angles it picks the points of the cached unit circle table (see unitCircle) whose angles fall strictly
+    between the start and the end of each arc, so every arc uses exactly the same points a full buffer
+    circle of the same center would. The end points of the arcs are left out since the callers already have them.
+    '''
+    centers = np.asarray(centers,dtype=np.float64).reshape(-1,2)
+    startAngles = np.asarray(startAngles,dtype=np.float64)
+    spans = np.asarray(spans,dtype=np.float64)
+    step = 2*np.pi/pointsForBuff
+    # The highest table index strictly below the start angle and the lowest one strictly above the end angle
+    highIndex = np.ceil(startAngles/step-1e-9).astype(np.int64)-1
+    lowIndex = np.floor((startAngles-spans)/step+1e-9).astype(np.int64)+1
+    counts = np.maximum(highIndex-lowIndex+1,0)
+    # Walk down from the highest index of every arc (clockwise means decreasing angle)
+    owners, steps = expandRanges(np.zeros(len(counts),dtype=np.int64),counts)
+    tableIndex = (highIndex[owners]-steps)%pointsForBuff
+    radius = np.asarray(radius,dtype=np.float64)
+    if(radius.ndim>0):
+        radius = radius[owners]
+    points = centers[owners]+(radius*unitCircle(pointsForBuff)[tableIndex].T).T
+    return points, counts
+
+def offsetSide(points, radius, pointsForBuff = 87, closed = False):
+    '''
+    Parameters
+    ----------
+    points : This should be a numpy array.
+        This should be a (n, 2) array holding the points of a line with no repeated neighbouring points.
+    radius : This should be a number.
+        This should be a number representing the buffer distance.
+    pointsForBuff : This should be an integer, optional
+        This should be an integer representing how many points a full circle is made of. The default is 87.
+    closed : This should be a boolean, optional
+        This should be True when the points are a ring (without its first point repeated at the end), in which
+        case the last point joins back to the first one. The default is False.
+
+    Returns
+    -------
+    numpy array
+        The points of the left hand side of the buffer outline, from the start of the line to its end.
+
+    Description
+    -----------
+    The offsetSide function moves every segment of the line a distance of radius to its left, the same
+    way lineBuffer builds its rectangles with the perpendicular vector <-dy,dx>. Between two moved segments
+    a join is needed. When the line turns right the left side is the outside of the bend and the two moved
+    segments are joined with a round arc from arcFan. When the line turns left the left side is the inside
+    of the bend and the outline goes back through the line's own point instead (a pivot), which keeps every
+    piece of the outline turning the same way so that a non zero winding fill of the outline is exactly the buffer.
+    Straight joins need nothing and a line that doubles back on itself is treated as a right turn. For a
+    closed ring every point is a join, including the one where the ring closes.
+    '''
+    # A closed ring is walked back around to its first point
+    path = np.vstack((points,points[:1])) if closed else points
+    # Unit vectors along every segment and their left hand perpendiculars
+    vectors = np.diff(path,axis=0)
+    directions = vectors/np.hypot(vectors[:,0],vectors[:,1])[:,np.newaxis]
+    normals = np.column_stack((-directions[:,1],directions[:,0]))
+    segmentStarts = path[:-1]+radius*normals
+    segmentEnds = path[1:]+radius*normals
+    # Every join sits at the end of a segment and leads into the following segment
+    segmentCount = len(directions)
+    joinCount = segmentCount if closed else segmentCount-1
+    following = (np.arange(joinCount)+1)%segmentCount
+    joinPoints = path[1:joinCount+1]
+    # Decide what kind of join every one needs
+    previous = directions[:joinCount]
+    upcoming = directions[following]
+    turn = previous[:,0]*upcoming[:,1]-previous[:,1]*upcoming[:,0]
+    straight = previous[:,0]*upcoming[:,0]+previous[:,1]*upcoming[:,1]
+    flat = np.abs(turn)<=1e-12
+    pivot = (turn>0) & ~flat
+    arc = ((turn<0) & ~flat) | (flat & (straight<0))
+    # Round joins turn clockwise from the previous segment's normal to the next segment's normal
+    normalAngles = np.arctan2(normals[:,1],normals[:,0])
+    arcAt = np.flatnonzero(arc)
+    spans = np.mod(normalAngles[arcAt]-normalAngles[following[arcAt]],2*np.pi)
+    arcPoints, arcCounts = arcFan(joinPoints[arcAt],normalAngles[arcAt],spans,radius,pointsForBuff)
+    # Every segment gives its two moved points followed by whatever its end join needs
+    extra = np.zeros(segmentCount,dtype=np.int64)
+    extra[:joinCount][pivot] = 1
+    extra[arcAt] = arcCounts
+    perSegment = 2+extra
+    firstSlot = np.cumsum(perSegment)-perSegment
+    outline = np.empty((int(perSegment.sum()),2))
+    outline[firstSlot] = segmentStarts
+    outline[firstSlot+1] = segmentEnds
+    pivotAt = np.flatnonzero(pivot)
+    outline[firstSlot[pivotAt]+2] = joinPoints[pivotAt]
+    owners, slots = expandRanges(firstSlot[arcAt]+2,arcCounts)
+    outline[slots] = arcPoints
+    return outline
+
+def strokeLine(line, radius, pointsForBuff = 87):
+    '''
+    Parameters
+    ----------
+    line : This should be a numpy array.
+        This should be a (n, 2) array holding the points of one part of a polyline.
+    radius : This should be a number.
+        This should be a number representing the buffer distance.
+    pointsForBuff : This should be an integer, optional
+        This should be an integer representing how many points a full circle is made of. The default is 87.
+
+    Returns
+    -------
+    numpy array
+        A single ring whose non zero winding area is the buffer of the line. The ring may cross itself, which
+        windingUnion resolves.
+
+    Description
+    -----------
+    The strokeLine function walks a line once to build the outline of its buffer: the left side of the line
+    from start to end (see offsetSide), a round cap around the last point, the left side of the reversed line
+    (which is the right side of the original line) and a round cap around the first point. Repeated points are
+    dropped first and a line that is a single point is buffered as a plain circle.
+    '''
+    line = np.asarray(line,dtype=np.float64).reshape(-1,2)
+    # Drop repeated neighbouring points since they have no direction
+    if(len(line)>1):
+        keep = np.ones(len(line),dtype=bool)
+        keep[1:] = np.any(line[1:]!=line[:-1],axis=1)
+        line = line[keep]
+    if(len(line)==1):
+        return circleBlock(line,radius,pointsForBuff)[0]
+    forward = offsetSide(line,radius,pointsForBuff)
+    backward = offsetSide(line[::-1],radius,pointsForBuff)
+    # The caps turn clockwise half a circle from the left side normal to the right side normal
+    endVector = line[-1]-line[-2]
+    startVector = line[0]-line[1]
+    capAngles = np.array([np.arctan2(endVector[0],-endVector[1]),np.arctan2(startVector[0],-startVector[1])])
+    caps, capCounts = arcFan(np.array([line[-1],line[0]]),capAngles,np.array([np.pi,np.pi]),radius,pointsForBuff)
+    return np.concatenate((forward,caps[:capCounts[0]],backward,caps[capCounts[0]:]))
+
+def wkbParts(wkb):
+    '''
+    Parameters
+    ----------
+    wkb : This should be a bytes like object.
+        This should be the well-known binary of a geometry, for example what a search cursor gives back for the
+        SHAPE@WKB token.
+
+    Returns
+    -------
+    list
+        A list of (n, 2) numpy arrays. Points and multipoints give one (1, 2) array per point, lines give one array
+        per part and polygons give one array per ring. Polygon rings do not repeat their first point and are turned
+        so outer rings run clockwise and holes run counterclockwise like ArcGIS stores them.
+
+    Description
+    -----------
+    The wkbParts function reads well-known binary with struct for the small headers and np.frombuffer for the
+    coordinates, so no Python object is made per vertex. Z and M values (in either the ISO or the extended
+    flag style) are skipped over and only x and y are kept.
+    '''
+    wkb = memoryview(wkb).cast('B')
+    parts = []
+
+    def readGeometry(offset):
+        # Byte order then geometry type, which may carry Z/M flags
+        endian = '<' if wkb[offset]==1 else '>'
+        geoType = int(np.frombuffer(wkb,dtype=endian+'u4',count=1,offset=offset+1)[0])
+        offset += 5
+        dims = 2
+        if(geoType & 0x80000000):
+            dims += 1
+        if(geoType & 0x40000000):
+            dims += 1
+        if(geoType & 0x20000000):
+            # Skip an embedded SRID
+            offset += 4
+        geoType &= 0x0FFFFFFF
+        if(geoType>=1000):
+            dims = 2+(geoType//1000 in (1,2))+2*(geoType//1000==3)
+            geoType %= 1000
+        def readCount(at):
+            return int(np.frombuffer(wkb,dtype=endian+'u4',count=1,offset=at)[0])
+        def readPoints(at, count):
+            values = np.frombuffer(wkb,dtype=endian+'f8',count=count*dims,offset=at)
+            return values.reshape(count,dims)[:,:2].astype(np.float64), at+8*count*dims
+        if(geoType==1):
+            point, offset = readPoints(offset,1)
+            if(not np.isnan(point).any()):
+                parts.append(point)
+        elif(geoType==2):
+            line, offset = readPoints(offset+4,readCount(offset))
+            parts.append(line)
+        elif(geoType==3):
+            ringCount = readCount(offset)
+            offset += 4
+            for ringIndex in range(ringCount):
+                ring, offset = readPoints(offset+4,readCount(offset))
+                # Drop the repeated closing point and turn the ring the ArcGIS way
+                if(len(ring)>1 and np.array_equal(ring[0],ring[-1])):
+                    ring = ring[:-1]
+                area = ringArea(ring)
+                if((ringIndex==0 and area>0) or (ringIndex>0 and area<0)):
+                    ring = ring[::-1]
+                parts.append(ring)
+        elif(geoType in (4,5,6,7)):
+            memberCount = readCount(offset)
+            offset += 4
+            for member in range(memberCount):
+                offset = readGeometry(offset)
+        else:
+            raise ValueError("Unsupported WKB geometry type "+str(geoType))
+        return offset
+
+    readGeometry(0)
+    return parts
+
+def multipointColumns(wkbs):
+    '''
+    Parameters
+    ----------
+    wkbs : This should be a list of bytes like objects.
+        This should be the well-known binary of a chunk of multipoints (or points), for example what a search
+        cursor gives back for the SHAPE@WKB token.
+
+    Returns
+    -------
+    tuple of numpy arrays
+        A (coords, featureOffsets) tuple where coords is a (n, 2) array holding every point of every
+        multipoint and the points of multipoint k are coords[featureOffsets[k]:featureOffsets[k+1]].
+
+    Description
+    -----------
+    The multipointColumns function flattens a whole chunk of multipoints at once instead of calling wkbParts
+    on each one. A two dimensional little endian multipoint is a 9 byte header followed by one 21 byte point
+    record (byte order, type and x and y) per point, so once the well-known binary of the chunk is joined
+    into one byte array the byte where every point's x and y start can be worked out with expandRanges and
+    all of the coordinates gathered in one go. The headers are checked first and a chunk holding anything
+    else (big endian, Z or M values or single points) is read with wkbParts one multipoint at a time
+    instead. Empty points are dropped like wkbParts drops them.
+    '''
+    lengths = np.array([len(wkb) for wkb in wkbs],dtype=np.int64)
+    data = np.frombuffer(b''.join(bytes(wkb) for wkb in wkbs),dtype=np.uint8)
+    starts = np.cumsum(lengths)-lengths
+    counts = (lengths-9)//21
+    simple = bool(np.all(lengths>=9)) and bool(np.all(counts*21+9==lengths))
+    if(simple and len(wkbs)>0):
+        # Every header should be little endian, type 4 and hold the number of point records that fit
+        header = data[starts[:,np.newaxis]+np.arange(9)]
+        types = np.ascontiguousarray(header[:,1:5]).view('<u4').ravel()
+        stored = np.ascontiguousarray(header[:,5:9]).view('<u4').ravel()
+        simple = bool(np.all(header[:,0]==1)) and bool(np.all(types==4)) and bool(np.all(stored==counts))
+    if(simple):
+        owners, records = expandRanges(starts+9,counts)
+        records = starts[owners]+9+21*(records-np.repeat(starts+9,counts))
+        # Every point record should be a little endian two dimensional point too
+        recordHeaders = data[records[:,np.newaxis]+np.arange(5)]
+        simple = bool(np.all(recordHeaders[:,0]==1)) and bool(np.all(np.ascontiguousarray(recordHeaders[:,1:]).view('<u4').ravel()==1))
+    if(not simple):
+        parts = [wkbParts(wkb) for wkb in wkbs]
+        coords = np.concatenate([point for points in parts for point in points]+[np.zeros((0,2))])
+        return coords, np.concatenate(([0],np.cumsum([len(points) for points in parts]))).astype(np.int64)
+    coords = np.ascontiguousarray(data[records[:,np.newaxis]+5+np.arange(16)]).view('<f8').reshape(-1,2).astype(np.float64)
+    # Drop empty points and count how many points every multipoint kept
+    keep = ~np.isnan(coords).any(axis=1)
+    kept = np.bincount(owners[keep],minlength=len(wkbs))
+    return coords[keep], np.concatenate(([0],np.cumsum(kept))).astype(np.int64)
+
+def assignHoles(rings, areas):
+    '''
+    Parameters
+    ----------
+    rings : This should be a list of numpy arrays.
+        This should be a list of (n, 2) rings that do not repeat their first point, with outer rings running
+        clockwise and holes running counterclockwise.
+    areas : This should be a numpy array.
+        This should be the signed area (see ringArea) of every ring.
+
+    Returns
+    -------
+    numpy array
+        An array holding, for every ring, the index of the outer ring it belongs to. Outer rings hold their own
+        index and holes that are not inside any outer ring hold -1.
+
+    Description
+    -----------
+    The assignHoles function matches each hole to the smallest outer ring that holds a point just beside the
+    hole's first edge (on the filled side, so holes that touch their outer ring at a point still land in the
+    right one). Candidate outer rings come from bboxPairs and the winding number test is done on every
+    (hole, candidate edge) pair at once with rayCrossings.
+    '''
+    owner = np.where(areas<0,np.arange(len(rings)),-1)
+    shells = np.flatnonzero(areas<0)
+    holes = np.flatnonzero(areas>0)
+    if(len(shells)==0 or len(holes)==0):
+        return owner
+    # A point just to the right of each hole's first edge sits in the filled area around it
+    firstPoints = np.array([rings[hole][0] for hole in holes])
+    secondPoints = np.array([rings[hole][1] for hole in holes])
+    edges = secondPoints-firstPoints
+    probes = (firstPoints+secondPoints)/2+np.column_stack((edges[:,1],-edges[:,0]))*1e-6
+    # Only test the outer rings whose bounding boxes hold the probe
+    shellBoxes = np.array([np.concatenate((rings[shell].min(axis=0),rings[shell].max(axis=0))) for shell in shells])
+    probeIndex, shellIndex = bboxPairs(np.column_stack((probes,probes)),shellBoxes)
+    if(len(probeIndex)==0):
+        return owner
+    # Lay out the edges of every outer ring one after another
+    shellSizes = np.array([len(rings[shell]) for shell in shells])
+    shellFirst = np.cumsum(shellSizes)-shellSizes
+    shellPoints = np.concatenate([rings[shell] for shell in shells])
+    following = np.arange(len(shellPoints))+1
+    following[shellFirst+shellSizes-1] = shellFirst
+    pairIndex, edgeIndex = expandRanges(shellFirst[shellIndex],shellSizes[shellIndex])
+    crossings = rayCrossings(probes[probeIndex[pairIndex],0],probes[probeIndex[pairIndex],1],
+                             shellPoints[edgeIndex,0],shellPoints[edgeIndex,1],
+                             shellPoints[following[edgeIndex],0],shellPoints[following[edgeIndex],1])
+    inside = np.bincount(pairIndex,weights=crossings,minlength=len(probeIndex))!=0
+    probeIndex = probeIndex[inside]
+    shellIndex = shellIndex[inside]
+    # Of the outer rings holding a hole, the smallest one is the one closest to zero area
+    order = np.lexsort((-areas[shells[shellIndex]],probeIndex))
+    first = np.ones(len(order),dtype=bool)
+    first[1:] = probeIndex[order][1:]!=probeIndex[order][:-1]
+    owner[holes[probeIndex[order][first]]] = shells[shellIndex[order][first]]
+    return owner
+
+def ringsToWKB(rings):
+    '''
+    Parameters
+    ----------
+    rings : This should be a list of numpy arrays.
+        This should be a list of (n, 2) rings that do not repeat their first point, with outer rings running
+        clockwise and holes running counterclockwise (like the output of windingUnion).
+
+    Returns
+    -------
+    bytes
+        The well-known binary of a multipolygon made from the rings.
+
+    Description
+    -----------
+    The ringsToWKB function has to group the holes with the outer rings they belong to since well-known binary
+    stores each polygon as an outer ring followed by its holes. That grouping is done by assignHoles. Every ring
+    is then closed and packed with its point count.
+    '''
+    rings = [np.asarray(ring,dtype=np.float64) for ring in rings if len(ring)>=3]
+    areas = np.array([ringArea(ring) for ring in rings])
+    owner = assignHoles(rings,areas)
+    shells = np.flatnonzero(areas<0)
+    members = {shell:[] for shell in shells.tolist()}
+    for hole in np.flatnonzero((areas>0) & (owner>=0)).tolist():
+        members[int(owner[hole])].append(hole)
+    chunks = [np.array([1],dtype='u1').tobytes(),np.array([6,len(shells)],dtype='<u4').tobytes()]
+    for shell in shells.tolist():
+        polygonRings = [rings[shell]]+[rings[hole] for hole in members[shell]]
+        chunks.append(np.array([1],dtype='u1').tobytes())
+        chunks.append(np.array([3,len(polygonRings)],dtype='<u4').tobytes())
+        for ring in polygonRings:
+            closed = np.concatenate((ring,ring[:1]))
+            chunks.append(np.array([len(closed)],dtype='<u4').tobytes())
+            chunks.append(closed.astype('<f8').tobytes())
+    return b''.join(chunks)
+
+def strokeRing(ring, radius, pointsForBuff = 87):
+    '''
+    Parameters
+    ----------
+    ring : This should be a numpy array.
+        This should be a (n, 2) array holding the points of a polygon ring that does not repeat its first point.
+    radius : This should be a number.
+        This should be a number representing the buffer distance.
+    pointsForBuff : This should be an integer, optional
+        This should be an integer representing how many points a full circle is made of. The default is 87.
+
+    Returns
+    -------
+    list
+        A list of two rings whose non zero winding area together is the band within radius of the ring's boundary.
+
+    Description
+    -----------
+    The strokeRing function is strokeLine for a ring. A ring has no ends so there are no caps. Instead the left
+    side of the ring (see offsetSide with closed=True) makes one loop and the left side of the reversed ring
+    (the right side of the original) makes a second loop. Repeated points, including a repeated closing point,
+    are dropped first and a ring that collapses to a single point is buffered as a circle.
+    '''
+    ring = np.asarray(ring,dtype=np.float64).reshape(-1,2)
+    # Drop repeated neighbouring points, wrapping around from the last point to the first
+    keep = np.any(ring!=np.roll(ring,1,axis=0),axis=1)
+    if(not keep.any()):
+        return [circleBlock(ring[:1],radius,pointsForBuff)[0]]
+    ring = ring[keep]
+    if(len(ring)<3):
+        return [strokeLine(np.vstack((ring,ring[:1])),radius,pointsForBuff)]
+    return [offsetSide(ring,radius,pointsForBuff,True),offsetSide(ring[::-1],radius,pointsForBuff,True)]
+
+def bufferPolygonRings(rings, radius, pointsForBuff = 87, tolerance = None):
+    '''
+    Parameters
+    ----------
+    rings : This should be a list of numpy arrays.
+        This should be the rings of one polygon, outer rings clockwise and holes counterclockwise, like
+        wkbParts gives back.
+    radius : This should be a number.
+        This should be a number representing the buffer distance.
+    pointsForBuff : This should be an integer, optional
+        This should be an integer representing how many points a full circle is made of. The default is 87.
+    tolerance : This should be a number, optional
+        This should be the tolerance handed to windingUnion. The default is None.
+
+    Returns
+    -------
+    list
+        The rings of the buffered polygon, outer rings clockwise and holes counterclockwise.
+
+    Description
+    -----------
+    The bufferPolygonRings function grows a polygon outwards in one pass over its rings. The buffer of a polygon
+    is the polygon itself together with the band within radius of its boundary. The polygon's own rings have a
+    winding number of -1 inside the polygon and 0 in its holes, and every loop from strokeRing is built from
+    pieces that all wind the same way, so handing all of them to windingUnion at once gives the buffered
+    polygon directly. Holes narrower than the buffer close up and holes wider than it shrink by the buffer size.
+    '''
+    outlines = []
+    for ring in rings:
+        outlines.append(ring)
+        outlines.extend(strokeRing(ring,radius,pointsForBuff))
+    return windingUnion(outlines,tolerance)
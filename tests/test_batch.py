@@ -0,0 +1,48 @@
+"""
+Author: Caleb Cordsen
+Date: 10/17/2026
+
+Description: This file contains tests of the batch runner in batch.py! The jobs are plain functions so they run
+on machines without ArcPy.
+"""
+# Import necessary things
+import os
+import sys
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import batch
+
+def healthyJob(index):
+    '''
+    Parameters
+    ----------
+    index : This should be an integer.
+        This should be the index of the job.
+
+    Returns
+    -------
+    str
+        A success message holding the index.
+    '''
+    return "The job was successful! "+str(index)
+
+def crashingJob(index):
+    '''
+    Parameters
+    ----------
+    index : This should be an integer.
+        This should be the index of the job.
+
+    Returns
+    -------
+    None.
+        It never returns, it kills its worker process the way an ArcPy crash would.
+    '''
+    os._exit(1)
+
+def test_runJobsOnlyFailsTheJobWhoseWorkerDied():
+    jobs = [(crashingJob if index==0 else healthyJob,(index,),"in"+str(index),"out"+str(index),"The job was successful!") for index in range(12)]
+    reports = batch.runJobs(jobs,workers=2)
+    assert reports[0]['status']=="F"
+    assert "BrokenProcessPool" in reports[0]['error']
+    assert batch.statusList(reports)[1:]==["S"]*11
+    assert [report['message'] for report in reports[1:]]==["The job was successful! "+str(index) for index in range(1,12)]
@@ -0,0 +1,121 @@
+"""
+Author: Caleb Cordsen
+Date: 10/17/2026
+
+Description: This file contains tests of the shapefile writer in featureio.py! They only need NumPy and pytest,
+so they run on machines without ArcPy.
+"""
+# Import necessary things
+import os
+import sys
+import numpy as np
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import featureio
+import geometry
+
+def test_dbfNamesAreUnique():
+    fields = [('population_2010','N',19,11),('population_2020','N',19,11),('Id','N',10,0),('ID','N',10,0)]
+    assert featureio.dbfNames(fields)==['population','populati_1','Id','ID_1']
+
+def test_dbfRecordsNeverCutDigitsOrCharacters():
+    fields = [('value','N',19,11),('text','C',5,0)]
+    attributes = {'value':np.array([1e20,-1e200,123456789.5]),'text':['héllo','aaaaé','日本語']}
+    records = featureio.dbfRecords(fields,attributes,3)
+    rows = [records[k*25:(k+1)*25] for k in range(3)]
+    assert [float(row[1:20]) for row in rows]==[1e20,-1e200,123456789.5]
+    # Every text value still decodes, having lost only whole characters
+    assert [row[20:].decode('utf-8') for row in rows]==['héll','aaaa ','日  ']
+
+def square(x, y, size, clockwise):
+    '''
+    Parameters
+    ----------
+    x, y : These should be numbers.
+        These should be the lower left corner of the square.
+    size : This should be a number.
+        This should be the length of the square's sides.
+    clockwise : This should be a boolean.
+        This should be True for an outer ring and False for a hole.
+
+    Returns
+    -------
+    numpy array
+        A (4, 2) ring that does not repeat its first point.
+    '''
+    ring = np.array([[x,y],[x,y+size],[x+size,y+size],[x+size,y]],dtype=np.float64)
+    return ring if clockwise else ring[::-1]
+
+def test_columnsToWKBKeepsEveryRing():
+    # A hole given before its outer ring, a plain square and two squares that each have a hole
+    features = [[square(2,2,1,False),square(0,0,5,True)],[square(0,0,1,True)],
+                [square(0,0,5,True),square(10,0,5,True),square(11,1,1,False),square(1,1,1,False)]]
+    wkbs = featureio.columnsToWKB('POLYGON',*featureio.ringsToColumns(features))
+    for feature, wkb in zip(features,wkbs):
+        parts = geometry.wkbParts(wkb)
+        assert sorted(geometry.ringArea(ring) for ring in parts)==sorted(geometry.ringArea(ring) for ring in feature)
+    # The outer ring comes first so the hole is read as a hole of it
+    assert geometry.ringArea(geometry.wkbParts(wkbs[0])[0])==-25
+    lines = [[np.array([[0.0,0.0],[1.0,1.0]]),np.array([[2.0,2.0],[3.0,3.0],[4.0,5.0]])],[np.array([[9.0,9.0],[8.0,8.0]])]]
+    wkbs = featureio.columnsToWKB('POLYLINE',*featureio.ringsToColumns(lines,close=False))
+    assert [[part.tolist() for part in geometry.wkbParts(wkb)] for wkb in wkbs]==[[part.tolist() for part in line] for line in lines]
+    wkbs = featureio.columnsToWKB('MULTIPOINT',np.array([[1.0,2.0],[3.0,4.0],[5.0,6.0]]),None,np.array([0,2,3]))
+    assert [len(geometry.wkbParts(wkb)) for wkb in wkbs]==[2,1]
+
+def test_writeShapefileRoundTrip(tmp_path):
+    features = [[square(0,0,10,True),square(2,2,2,False),square(6,6,2,False)],[square(20,0,1,True)],
+                [square(30,0,3,True),square(40,0,3,True)]]
+    fields = [('Id','N',10,0),('count','N',11,0),('share','N',19,11),('name','C',8,0)]
+    attributes = {'Id':np.arange(3),'count':np.array([7,np.nan,-12]),'share':np.array([0.25,1e20,-3.5]),
+                  'name':['one',None,'thirty']}
+    coords, partOffsets, featureOffsets = featureio.ringsToColumns(features)
+    outputFile = str(tmp_path/'output.shp')
+    assert featureio.writeShapefile(outputFile,'POLYGON',[(coords,partOffsets,featureOffsets,attributes)],None,fields)==3
+    shp = (tmp_path/'output.shp').read_bytes()
+    shx = (tmp_path/'output.shx').read_bytes()
+    dbf = (tmp_path/'output.dbf').read_bytes()
+    # Both headers hold the file length in 16 bit words, the shape type and the bounding box
+    for data in (shp,shx):
+        assert np.frombuffer(data,'>i4',1,0)[0]==9994
+        assert np.frombuffer(data,'>i4',1,24)[0]*2==len(data)
+        assert np.frombuffer(data,'<i4',2,28).tolist()==[1000,5]
+        assert np.frombuffer(data,'<f8',4,36).tolist()==[0,0,43,10]
+    # Every index entry points at its record, whose header gives the same length
+    index = np.frombuffer(shx,'>i4',offset=100).reshape(-1,2)
+    assert len(index)==3
+    for number, (offset, length) in enumerate(index.tolist()):
+        assert np.frombuffer(shp,'>i4',2,offset*2).tolist()==[number+1,length]
+        assert offset*2+8+length*2==(index[number+1,0]*2 if number<2 else len(shp))
+        shapeType, = np.frombuffer(shp,'<i4',1,offset*2+8)
+        parts, points = np.frombuffer(shp,'<i4',2,offset*2+44)
+        starts = np.frombuffer(shp,'<i4',parts,offset*2+52)
+        xy = np.frombuffer(shp,'<f8',2*points,offset*2+52+4*parts).reshape(-1,2)
+        assert shapeType==5
+        rings = np.split(xy,starts[1:])
+        assert [ring.tolist() for ring in rings]==[np.vstack((ring,ring[:1])).tolist() for ring in features[number]]
+    # The dbf header gives the record count, the header size, the record size and every field's descriptor
+    count, = np.frombuffer(dbf,'<u4',1,4)
+    headerSize, recordSize = np.frombuffer(dbf,'<u2',2,8)
+    assert (count,headerSize,recordSize)==(3,32+32*4+1,1+10+11+19+8)
+    for number, (name, fieldType, length, decimals) in enumerate(fields):
+        descriptor = dbf[32+32*number:64+32*number]
+        assert descriptor[:11].rstrip(b'\x00').decode('ascii')==name
+        assert (chr(descriptor[11]),descriptor[16],descriptor[17])==(fieldType,length,decimals)
+    assert dbf[headerSize-1]==0x0D and dbf[-1]==0x1A
+    assert len(dbf)==headerSize+3*recordSize+1
+    rows = [dbf[headerSize+k*recordSize:headerSize+(k+1)*recordSize].decode('utf-8') for k in range(3)]
+    values = [(row[0],row[1:11].strip(),row[11:22].strip(),float(row[22:41]),row[41:].rstrip()) for row in rows]
+    assert values==[(' ','0','7',0.25,'one'),(' ','1','',1e20,''),(' ','2','-12',-3.5,'thirty')]
+
+def test_datasetStampSeesEverySidecarFile(tmp_path):
+    for extension in ('.shp','.shx','.dbf','.prj'):
+        (tmp_path/('input'+extension)).write_text('x')
+    stamp = featureio.datasetStamp(str(tmp_path/'input.shp'))
+    (tmp_path/'input.prj').write_text('a new coordinate system')
+    assert featureio.datasetStamp(str(tmp_path/'input.shp'))!=stamp
+    # Feature classes are stamped by the files of their geodatabase, and other datasets are not stamped
+    (tmp_path/'data.gdb').mkdir()
+    (tmp_path/'data.gdb'/'a00000009.gdbtable').write_text('x')
+    stamp = featureio.datasetStamp(str(tmp_path/'data.gdb'/'roads'))
+    (tmp_path/'data.gdb'/'a00000009.gdbtable').write_text('an edited table')
+    assert featureio.datasetStamp(str(tmp_path/'data.gdb'/'roads'))!=stamp
+    assert featureio.datasetStamp(str(tmp_path/'server.sde'/'roads')) is None
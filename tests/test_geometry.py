@@ -0,0 +1,251 @@
+"""
+Author: Caleb Cordsen
+Date: 10/17/2026
+
+Description: This file contains tests of the NumPy geometry functions in geometry.py! They only need NumPy and
+pytest, so they run on machines without ArcPy.
+"""
+# Import necessary things
+import os
+import sys
+import numpy as np
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import geometry
+
+def overlapLength(line, clipLine, tolerance):
+    '''
+    Parameters
+    ----------
+    line : This should be a numpy array.
+        This should be a (n, 2) array of the points of the input line.
+    clipLine : This should be a numpy array.
+        This should be a (m, 2) array of the points of the clip line.
+    tolerance : This should be a number.
+        This should be the tolerance handed to geometry.segmentOverlaps.
+
+    Returns
+    -------
+    tuple
+        A (length, count) tuple of the total length of the lines kept and how many lines were kept.
+    '''
+    starts, ends = line[:-1], line[1:]
+    segments, fromAlong, toAlong = geometry.segmentOverlaps(starts,ends,clipLine[:-1],clipLine[1:],tolerance)
+    coords, partOffsets, pieceSegments = geometry.overlapLines(starts,ends,np.zeros(len(starts),dtype=np.int64),segments,fromAlong,toAlong)
+    length = sum(np.hypot(*np.diff(coords[partOffsets[k]:partOffsets[k+1]],axis=0).T).sum() for k in range(len(partOffsets)-1))
+    return length, len(partOffsets)-1
+
+def test_segmentOverlapsKeepsExactOverlapsAtZeroTolerance():
+    # A straight line under clip segments 0.1 long, none of whose inner vertices the line shares
+    line = np.array([[0.0,0.0],[10.0,0.0]])
+    clipLine = np.column_stack((np.arange(101)*0.1,np.zeros(101)))
+    length, count = overlapLength(line,clipLine,0.0)
+    assert count==1
+    assert np.isclose(length,10.0)
+    # The same path split at different vertices, with the clip line holding extra points along it
+    rng = np.random.default_rng(5)
+    points = np.cumsum(rng.uniform(-1,1,(40,2)),axis=0)
+    along = np.sort(rng.uniform(0,39,60))
+    index = along.astype(np.int64)
+    extra = points[index]+(along-index)[:,None]*(points[index+1]-points[index])
+    order = np.argsort(np.concatenate((np.arange(40.0),along)))
+    clipLine = np.vstack((points,extra))[order]
+    length, count = overlapLength(points,clipLine,0.0)
+    assert count==1
+    assert np.isclose(length,np.hypot(*np.diff(points,axis=0).T).sum())
+
+def test_segmentOverlapsDropsCrossingLines():
+    line = np.array([[0.0,-1.0],[0.0,1.0]])
+    clipLine = np.array([[-1.0,0.0],[1.0,0.0]])
+    assert overlapLength(line,clipLine,0.0)==(0,0)
+
+def insideRings(points, rings):
+    '''
+    Parameters
+    ----------
+    points : This should be a numpy array.
+        This should be a (n, 2) array of the points to test.
+    rings : This should be a list of numpy arrays.
+        This should be a list of (m, 2) rings that do not repeat their first point.
+
+    Returns
+    -------
+    numpy array
+        A boolean array that is True for the points inside an odd number of the rings, which for rings that
+        only touch at single points is the area they hold.
+    '''
+    inside = np.zeros(len(points),dtype=bool)
+    for ring in rings:
+        a = ring[:,None,:]
+        b = np.roll(ring,-1,axis=0)[:,None,:]
+        p = points[None,:,:]
+        straddles = (a[...,1]>p[...,1])!=(b[...,1]>p[...,1])
+        with np.errstate(divide='ignore',invalid='ignore'):
+            crossX = a[...,0]+(p[...,1]-a[...,1])*(b[...,0]-a[...,0])/(b[...,1]-a[...,1])
+        inside ^= (np.count_nonzero(straddles&(p[...,0]<crossX),axis=0)%2)==1
+    return inside
+
+def distanceToLines(points, lines):
+    '''
+    Parameters
+    ----------
+    points : This should be a numpy array.
+        This should be a (n, 2) array of the points to measure from.
+    lines : This should be a list of numpy arrays.
+        This should be a list of (m, 2) arrays of line points. Rings have to repeat their first point to be
+        measured all the way around.
+
+    Returns
+    -------
+    numpy array
+        The distance from every point to the nearest of the lines.
+    '''
+    best = np.full(len(points),np.inf)
+    for line in lines:
+        a = line[:-1][:,None,:]
+        d = (line[1:]-line[:-1])[:,None,:]
+        lengths = np.maximum((d**2).sum(axis=2),1e-300)
+        t = np.clip(((points[None,:,:]-a)*d).sum(axis=2)/lengths,0,1)
+        gap = points[None,:,:]-a-t[...,None]*d
+        best = np.minimum(best,np.sqrt((gap**2).sum(axis=2)).min(axis=0))
+    return best
+
+def closed(rings):
+    '''
+    Parameters
+    ----------
+    rings : This should be a list of numpy arrays.
+        This should be a list of (m, 2) rings that do not repeat their first point.
+
+    Returns
+    -------
+    list
+        The same rings with their first point repeated at the end.
+    '''
+    return [np.vstack((ring,ring[:1])) for ring in rings]
+
+def samplePoints(low, high, count, seed):
+    '''
+    Parameters
+    ----------
+    low : This should be a number.
+        This should be the smallest x and y to sample.
+    high : This should be a number.
+        This should be the largest x and y to sample.
+    count : This should be an integer.
+        This should be how many points to sample.
+    seed : This should be an integer.
+        This should be the seed of the random generator so the points are the same every run.
+
+    Returns
+    -------
+    numpy array
+        A (count, 2) array of points spread evenly over the square.
+    '''
+    return np.random.default_rng(seed).uniform(low,high,(count,2))
+
+def assertMatches(inside, expected, distance, margin):
+    '''
+    Parameters
+    ----------
+    inside : This should be a numpy array.
+        This should be a boolean array saying which points the function under test put inside.
+    expected : This should be a numpy array.
+        This should be a boolean array saying which points are really inside.
+    distance : This should be a numpy array.
+        This should be how far every point is from the true boundary.
+    margin : This should be a number.
+        This should be how close to the boundary a point can be and still be skipped.
+    '''
+    # Points closer to the true boundary than the circle approximation and snapping can move it are skipped
+    clear = np.abs(distance)>margin
+    assert clear.sum()>len(inside)//2
+    assert np.array_equal(inside[clear],expected[clear])
+
+def test_windingUnionMatchesSampledPoints():
+    rng = np.random.default_rng(1)
+    rings = []
+    for x, y, r in rng.uniform((0,0,1),(10,10,3),(12,3)):
+        angles = np.linspace(0,2*np.pi,40,endpoint=False)
+        rings.append(np.column_stack((x+r*np.sin(angles),y+r*np.cos(angles))))
+    # A square ring with a repeated vertex, which used to warn about dividing by zero
+    rings.append(np.array([[12.0,0.0],[12.0,4.0],[12.0,4.0],[16.0,4.0],[16.0,0.0]]))
+    points = samplePoints(-4,18,4000,2)
+    with np.errstate(all='raise'):
+        union = geometry.windingUnion(rings)
+    expected = np.zeros(len(points),dtype=bool)
+    for ring in rings:
+        expected |= insideRings(points,[ring])
+    assertMatches(insideRings(points,union),expected,distanceToLines(points,closed(rings)),1e-6)
+
+def test_strokeLineMatchesDistanceToLine():
+    lines = [np.array([[2.0,-5.0],[-1.0,-5.0],[-5.0,-5.0],[-5.0,-2.0]]),
+             np.array([[0.0,0.0],[4.0,0.0],[4.0,0.0],[0.5,0.3],[3.0,3.0],[-2.0,1.0]])]
+    points = samplePoints(-9,8,4000,3)
+    for line in lines:
+        with np.errstate(all='raise'):
+            union = geometry.windingUnion([geometry.strokeLine(line,1.5)])
+        distance = distanceToLines(points,[line])
+        assertMatches(insideRings(points,union),distance<1.5,distance-1.5,1.5*0.01)
+
+def test_bufferPolygonRingsMatchesDistanceToPolygon():
+    # A clockwise square with a counterclockwise hole, one narrow enough to close and one that shrinks
+    for hole, radius in ((1.0,0.75),(6.0,1.0)):
+        low, high = 5-hole/2, 5+hole/2
+        rings = [np.array([[0.0,0.0],[0.0,10.0],[10.0,10.0],[10.0,0.0]]),
+                 np.array([[low,low],[high,low],[high,high],[low,high]])]
+        points = samplePoints(-3,13,4000,4)
+        with np.errstate(all='raise'):
+            union = geometry.bufferPolygonRings(rings,radius)
+        inside = insideRings(points,rings)
+        distance = np.where(inside,0.0,distanceToLines(points,closed(rings)))
+        assertMatches(insideRings(points,union),distance<radius,distance-radius,radius*0.01)
+
+def test_dissolvePiecesMatchesSampledPoints():
+    import dissolve
+    rng = np.random.default_rng(6)
+    centres = rng.uniform(0,30,(40,2))
+    angles = np.linspace(0,2*np.pi,30,endpoint=False)
+    pieces = [[np.column_stack((x+1.5*np.sin(angles),y+1.5*np.cos(angles)))] for x, y in centres]
+    points = samplePoints(-3,33,4000,7)
+    union = dissolve.dissolvePieces(pieces)
+    expected = np.zeros(len(points),dtype=bool)
+    for piece in pieces:
+        expected |= insideRings(points,piece)
+    distance = distanceToLines(points,[ring for piece in pieces for ring in closed(piece)])
+    assertMatches(insideRings(points,union),expected,distance,1e-6)
+
+def test_localMetricFrameKeepsWidthsAcrossLatitudes():
+    line = np.array([[0.0,30.0],[0.0,50.0]])
+    toMeters, toDegrees = geometry.localMetricFrame([line])
+    # A short step east at every latitude measures what metersPerDegree says it is, to within c/sin(c) of
+    # the 10 degrees to the middle
+    for latitude in (30.0,35.0,40.0,45.0,50.0):
+        metersEast = geometry.metersPerDegree(latitude)[0]*0.01
+        points = toMeters(np.array([[0.0,latitude],[0.01,latitude]]))
+        assert abs(np.hypot(*(points[1]-points[0]))/metersEast-1)<0.006
+    points = np.array([[-3.0,31.0],[2.5,49.0],[0.0,40.0],[179.0,40.0]])
+    assert np.allclose(toDegrees(toMeters(points)),points)
+
+def test_wrapRingsCutsAreasAtTheAntimeridian():
+    ring = np.array([[179.0,0.0],[179.0,1.0],[181.0,1.0],[181.0,0.0]])
+    wrapped = geometry.wrapRings([ring])
+    assert len(wrapped)==2
+    assert all(part[:,0].min()>=-180 and part[:,0].max()<=180 for part in wrapped)
+    assert np.isclose(sum(geometry.ringArea(part) for part in wrapped),geometry.ringArea(ring))
+    assert len(geometry.wrapRings([ring-[10.0,0.0]]))==1
+
+def test_densifyPartsKeepsEveryPoint():
+    line = np.array([[0.0,0.0],[1.0,0.0],[1.0,0.25]])
+    densified = geometry.densifyParts([line],0.1,False)[0]
+    assert len(densified)==14 and np.array_equal(densified[[0,10,13]],line)
+    assert np.max(np.hypot(*np.diff(densified,axis=0).T))<=0.1+1e-12
+
+def test_clipLinesToBoxesKeepsThePartsInside():
+    # A line leaving and coming back into its box, and one that never reaches its box
+    coords = np.array([[0.0,0.5],[2.0,0.5],[2.0,2.0],[0.5,2.0],[0.5,0.0],[5.0,5.0],[6.0,6.0]])
+    partOffsets = np.array([0,5,7])
+    boxes = np.array([[0.0,0.0,1.0,1.0],[0.0,0.0,1.0,1.0]])
+    clipped, pieceOffsets, owners = geometry.clipLinesToBoxes(coords,partOffsets,boxes)
+    pieces = [clipped[start:end] for start, end in zip(pieceOffsets[:-1],pieceOffsets[1:])]
+    assert owners.tolist()==[0,0]
+    assert np.allclose(pieces[0],[[0.0,0.5],[1.0,0.5]]) and np.allclose(pieces[1],[[0.5,1.0],[0.5,0.0]])